@@ -0,0 +1,151 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 00:00:00.000000
+
+Databases that were created by the old `create_all` startup already have
+these tables; mark them with `alembic stamp 0001` instead of upgrading.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('password_hash', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('curl_pattern', sa.String(), nullable=True),
+        sa.Column('porosity', sa.String(), nullable=True),
+        sa.Column('density', sa.String(), nullable=True),
+        sa.Column('thickness', sa.String(), nullable=True),
+        sa.Column('scalp_type', sa.String(), nullable=True),
+        sa.Column('location', sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_users_id', 'users', ['id'])
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+
+    op.create_table(
+        'products',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('brand', sa.String(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('type', sa.String(), nullable=False),
+        sa.Column('ingredients', postgresql.ARRAY(sa.String()), nullable=True),
+        sa.Column('notes', sa.String(), nullable=True),
+        sa.Column('usage_count', sa.Integer(), nullable=True),
+        sa.Column('success_rate', sa.Float(), nullable=True),
+        sa.Column('is_starred', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_products_id', 'products', ['id'])
+
+    op.create_table(
+        'routines',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('is_template', sa.Boolean(), nullable=True),
+        sa.Column('is_public', sa.Boolean(), nullable=True),
+        sa.Column('steps', sa.JSON(), nullable=False),
+        sa.Column('method_tags', sa.JSON(), nullable=True),
+        sa.Column('drying_method', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_routines_id', 'routines', ['id'])
+
+    op.create_table(
+        'routine_logs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('routine_id', sa.Integer(), nullable=True),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('time', sa.Time(), nullable=True),
+        sa.Column('products_used', sa.JSON(), nullable=True),
+        sa.Column('wash_day', sa.Boolean(), nullable=True),
+        sa.Column('styling_method', sa.String(), nullable=True),
+        sa.Column('drying_method', sa.String(), nullable=True),
+        sa.Column('time_spent', sa.Integer(), nullable=True),
+        sa.Column('notes', sa.String(), nullable=True),
+        sa.Column('photo_urls', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['routine_id'], ['routines.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_routine_logs_id', 'routine_logs', ['id'])
+
+    op.create_table(
+        'outcomes',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('routine_log_id', sa.Integer(), nullable=False),
+        sa.Column('frizz', sa.Integer(), nullable=False),
+        sa.Column('definition', sa.Integer(), nullable=False),
+        sa.Column('softness', sa.Integer(), nullable=False),
+        sa.Column('hold_hours', sa.Float(), nullable=True),
+        sa.Column('overall_score', sa.Float(), nullable=False),
+        sa.Column('notes', sa.String(), nullable=True),
+        sa.Column('rated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['routine_log_id'], ['routine_logs.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('routine_log_id'),
+    )
+    op.create_index('ix_outcomes_id', 'outcomes', ['id'])
+
+    op.create_table(
+        'weather_data',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('location', sa.String(), nullable=False),
+        sa.Column('humidity', sa.Float(), nullable=False),
+        sa.Column('dew_point', sa.Float(), nullable=False),
+        sa.Column('temperature', sa.Float(), nullable=False),
+        sa.Column('wind_speed', sa.Float(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_weather_data_id', 'weather_data', ['id'])
+    op.create_index('idx_user_date', 'weather_data', ['user_id', 'date'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_user_date', table_name='weather_data')
+    op.drop_index('ix_weather_data_id', table_name='weather_data')
+    op.drop_table('weather_data')
+    op.drop_index('ix_outcomes_id', table_name='outcomes')
+    op.drop_table('outcomes')
+    op.drop_index('ix_routine_logs_id', table_name='routine_logs')
+    op.drop_table('routine_logs')
+    op.drop_index('ix_routines_id', table_name='routines')
+    op.drop_table('routines')
+    op.drop_index('ix_products_id', table_name='products')
+    op.drop_table('products')
+    op.drop_index('ix_users_email', table_name='users')
+    op.drop_index('ix_users_id', table_name='users')
+    op.drop_table('users')
@@ -0,0 +1,59 @@
+"""add geocode_cache and weather_cache
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'geocode_cache',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('query', sa.String(), nullable=False),
+        sa.Column('name', sa.String(), nullable=True),
+        sa.Column('latitude', sa.Float(), nullable=True),
+        sa.Column('longitude', sa.Float(), nullable=True),
+        sa.Column('found', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('query'),
+    )
+    op.create_index('ix_geocode_cache_id', 'geocode_cache', ['id'])
+
+    op.create_table(
+        'weather_cache',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('location_key', sa.String(), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('humidity', sa.Float(), nullable=True),
+        sa.Column('dew_point', sa.Float(), nullable=True),
+        sa.Column('temperature', sa.Float(), nullable=True),
+        sa.Column('wind_speed', sa.Float(), nullable=True),
+        sa.Column('found', sa.Boolean(), nullable=False),
+        sa.Column('fetched_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('location_key', 'date', name='uq_weather_cache_location_date'),
+    )
+    op.create_index('ix_weather_cache_id', 'weather_cache', ['id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_weather_cache_id', table_name='weather_cache')
+    op.drop_table('weather_cache')
+    op.drop_index('ix_geocode_cache_id', table_name='geocode_cache')
+    op.drop_table('geocode_cache')
@@ -0,0 +1,210 @@
+"""canonical locations; weather stored once per (location, date)
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 00:00:00.000000
+
+Weather rows used to be copied per user and keyed by free-text location.
+This moves them onto a shared `locations` table: geocoded places are keyed
+by rounded coordinates, ungeocoded text by "q:<normalized text>". Duplicate
+(location, date) rows are collapsed (lowest id wins) and weather_cache is
+folded into weather_data.
+
+The downgrade is lossy: each shared row is copied back to every user whose
+profile points at its location, and geocoded rows also go back into
+weather_cache. Rows no current user's profile points at, negative entries and
+the original per-user duplicates are not restored.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _normalized(column: str) -> str:
+    """SQL twin of app.services.weather.normalize_location"""
+    spaced = f"regexp_replace(regexp_replace(lower(trim({column})), '\\s+', ' ', 'g'), '\\s*,\\s*', ',', 'g')"
+    # normalize_location drops empty parts: 'Austin,,TX' and ',Austin,' become 'austin,tx' and 'austin'
+    return f"btrim(regexp_replace({spaced}, ',+', ',', 'g'), ',')"
+
+
+def _coordinate_key(latitude: str, longitude: str) -> str:
+    """SQL twin of app.services.weather.location_key"""
+    return f"round({latitude}::numeric, 2)::text || ',' || round({longitude}::numeric, 2)::text"
+
+
+def _resolve(column: str) -> str:
+    """Location id for a free-text column: geocoded place first, text-only place otherwise"""
+    return (
+        f"COALESCE("
+        f"(SELECT g.location_id FROM geocode_cache g WHERE g.query = {_normalized(column)}), "
+        f"(SELECT l.id FROM locations l WHERE l.key = 'q:' || {_normalized(column)}))"
+    )
+
+
+def upgrade() -> None:
+    op.create_table(
+        'locations',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('key', sa.String(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('latitude', sa.Float(), nullable=True),
+        sa.Column('longitude', sa.Float(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('key'),
+    )
+    op.create_index('ix_locations_id', 'locations', ['id'])
+
+    # Geocoded places, one per rounded coordinate
+    op.execute(f"""
+        INSERT INTO locations (key, name, latitude, longitude)
+        SELECT DISTINCT ON (key) key, name, latitude, longitude
+        FROM (
+            SELECT {_coordinate_key('latitude', 'longitude')} AS key, name, latitude, longitude, id
+            FROM geocode_cache WHERE found
+        ) g
+        ORDER BY key, id
+    """)
+
+    op.add_column('geocode_cache', sa.Column('location_id', sa.Integer(), nullable=True))
+    op.create_foreign_key('geocode_cache_location_id_fkey', 'geocode_cache', 'locations', ['location_id'], ['id'])
+    op.execute(f"""
+        UPDATE geocode_cache g SET location_id = l.id
+        FROM locations l
+        WHERE g.found AND l.key = {_coordinate_key('g.latitude', 'g.longitude')}
+    """)
+    op.drop_column('geocode_cache', 'name')
+    op.drop_column('geocode_cache', 'latitude')
+    op.drop_column('geocode_cache', 'longitude')
+
+    # Text that was never geocoded becomes a text-only place, geocoded on first fetch
+    op.execute(f"""
+        INSERT INTO locations (key, name)
+        SELECT 'q:' || query, min(raw)
+        FROM (
+            SELECT {_normalized('location')} AS query, trim(location) AS raw FROM users WHERE location IS NOT NULL
+            UNION ALL
+            SELECT {_normalized('location')}, trim(location) FROM weather_data
+        ) t
+        WHERE query <> ''
+          AND NOT EXISTS (SELECT 1 FROM geocode_cache g WHERE g.query = t.query AND g.location_id IS NOT NULL)
+        GROUP BY query
+    """)
+
+    op.add_column('users', sa.Column('location_id', sa.Integer(), nullable=True))
+    op.create_foreign_key('users_location_id_fkey', 'users', 'locations', ['location_id'], ['id'])
+    op.execute(f"UPDATE users SET location_id = {_resolve('location')} WHERE location IS NOT NULL")
+
+    # Point weather rows at their location, then keep one row per (location, date)
+    op.add_column('weather_data', sa.Column('location_id', sa.Integer(), nullable=True))
+    op.execute(f"UPDATE weather_data SET location_id = {_resolve('location')}")
+    op.execute("DELETE FROM weather_data WHERE location_id IS NULL")
+    op.execute("""
+        DELETE FROM weather_data a USING weather_data b
+        WHERE a.location_id = b.location_id AND a.date = b.date AND a.id > b.id
+    """)
+
+    op.add_column('weather_data', sa.Column('found', sa.Boolean(), server_default=sa.true(), nullable=False))
+    op.alter_column('weather_data', 'found', server_default=None)
+    op.add_column('weather_data', sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True))
+    for column in ('humidity', 'dew_point', 'temperature'):
+        op.alter_column('weather_data', column, existing_type=sa.Float(), nullable=True)
+
+    # Successful upstream fetches from weather_cache; negative entries are simply refetched
+    op.execute("""
+        INSERT INTO weather_data (location_id, date, humidity, dew_point, temperature, wind_speed, found, created_at)
+        SELECT l.id, c.date, c.humidity, c.dew_point, c.temperature, c.wind_speed, true, c.fetched_at
+        FROM weather_cache c JOIN locations l ON l.key = c.location_key
+        WHERE c.found
+          AND NOT EXISTS (SELECT 1 FROM weather_data w WHERE w.location_id = l.id AND w.date = c.date)
+    """)
+
+    op.alter_column('weather_data', 'location_id', existing_type=sa.Integer(), nullable=False)
+    op.create_foreign_key('weather_data_location_id_fkey', 'weather_data', 'locations', ['location_id'], ['id'])
+    op.drop_index('idx_user_date', table_name='weather_data')
+    op.drop_column('weather_data', 'user_id')
+    op.drop_column('weather_data', 'location')
+    op.create_unique_constraint('uq_weather_location_date', 'weather_data', ['location_id', 'date'])
+
+    op.drop_index('ix_weather_cache_id', table_name='weather_cache')
+    op.drop_table('weather_cache')
+
+
+def downgrade() -> None:
+    op.create_table(
+        'weather_cache',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('location_key', sa.String(), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('humidity', sa.Float(), nullable=True),
+        sa.Column('dew_point', sa.Float(), nullable=True),
+        sa.Column('temperature', sa.Float(), nullable=True),
+        sa.Column('wind_speed', sa.Float(), nullable=True),
+        sa.Column('found', sa.Boolean(), nullable=False),
+        sa.Column('fetched_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('location_key', 'date', name='uq_weather_cache_location_date'),
+    )
+    op.create_index('ix_weather_cache_id', 'weather_cache', ['id'])
+    op.execute("""
+        INSERT INTO weather_cache (location_key, date, humidity, dew_point, temperature, wind_speed, found, fetched_at)
+        SELECT l.key, w.date, w.humidity, w.dew_point, w.temperature, w.wind_speed, true, w.created_at
+        FROM weather_data w JOIN locations l ON l.id = w.location_id
+        WHERE w.found AND l.latitude IS NOT NULL
+    """)
+
+    # One copy of each shared row per user at its location; the old columns were NOT NULL
+    op.execute("""
+        CREATE TEMPORARY TABLE per_user_weather ON COMMIT DROP AS
+        SELECT u.id AS user_id, w.date, COALESCE(u.location, l.name) AS location,
+               w.humidity, w.dew_point, w.temperature, w.wind_speed, w.created_at
+        FROM weather_data w
+        JOIN users u ON u.location_id = w.location_id
+        JOIN locations l ON l.id = w.location_id
+        WHERE w.found
+          AND w.humidity IS NOT NULL AND w.dew_point IS NOT NULL AND w.temperature IS NOT NULL
+    """)
+    op.drop_constraint('uq_weather_location_date', 'weather_data', type_='unique')
+    op.drop_constraint('weather_data_location_id_fkey', 'weather_data', type_='foreignkey')
+    op.execute("DELETE FROM weather_data")
+    op.drop_column('weather_data', 'expires_at')
+    op.drop_column('weather_data', 'found')
+    op.drop_column('weather_data', 'location_id')
+    op.add_column('weather_data', sa.Column('user_id', sa.Integer(), nullable=False))
+    op.add_column('weather_data', sa.Column('location', sa.String(), nullable=False))
+    op.create_foreign_key('weather_data_user_id_fkey', 'weather_data', 'users', ['user_id'], ['id'])
+    for column in ('humidity', 'dew_point', 'temperature'):
+        op.alter_column('weather_data', column, existing_type=sa.Float(), nullable=False)
+    op.execute("""
+        INSERT INTO weather_data (user_id, date, location, humidity, dew_point, temperature, wind_speed, created_at)
+        SELECT user_id, date, location, humidity, dew_point, temperature, wind_speed, created_at
+        FROM per_user_weather
+    """)
+    op.execute("DROP TABLE per_user_weather")
+    op.create_index('idx_user_date', 'weather_data', ['user_id', 'date'])
+
+    op.drop_constraint('users_location_id_fkey', 'users', type_='foreignkey')
+    op.drop_column('users', 'location_id')
+
+    op.add_column('geocode_cache', sa.Column('name', sa.String(), nullable=True))
+    op.add_column('geocode_cache', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('geocode_cache', sa.Column('longitude', sa.Float(), nullable=True))
+    op.execute("""
+        UPDATE geocode_cache g SET name = l.name, latitude = l.latitude, longitude = l.longitude
+        FROM locations l
+        WHERE l.id = g.location_id
+    """)
+    op.drop_constraint('geocode_cache_location_id_fkey', 'geocode_cache', type_='foreignkey')
+    op.drop_column('geocode_cache', 'location_id')
+
+    op.drop_index('ix_locations_id', table_name='locations')
+    op.drop_table('locations')
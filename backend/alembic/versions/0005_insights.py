@@ -0,0 +1,44 @@
+"""add insights table and users.insights_computed_at
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'insights',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('insight_type', sa.String(), nullable=False),
+        sa.Column('message', sa.String(), nullable=False),
+        sa.Column('confidence', sa.String(), nullable=False),
+        sa.Column('sample_size', sa.Integer(), nullable=False),
+        sa.Column('computed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_insights_id', 'insights', ['id'])
+    op.create_index('ix_insights_user_id', 'insights', ['user_id'])
+    # Null means "never computed"; the first dashboard read schedules a refresh
+    op.add_column('users', sa.Column('insights_computed_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'insights_computed_at')
+    op.drop_index('ix_insights_user_id', table_name='insights')
+    op.drop_index('ix_insights_id', table_name='insights')
+    op.drop_table('insights')
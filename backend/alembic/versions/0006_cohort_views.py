@@ -0,0 +1,109 @@
+"""cohort materialized views
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 00:00:00.000000
+
+Outcome and community-product performance aggregated over users with similar
+hair. grouping_set is the GROUPING() bitmask of the dimensions a row is not
+grouped by, so a NULL dimension is either ungrouped or a profile field the
+user left empty, never confused with free-text profile values. Each view has
+the unique index that REFRESH MATERIALIZED VIEW CONCURRENTLY requires.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OUTCOME_DIMENSIONS = ('u.curl_pattern', 'u.porosity', 'u.density', 'u.thickness')
+PRODUCT_DIMENSIONS = ('u.curl_pattern', 'u.porosity')
+
+
+def _grouping_set(dimensions) -> str:
+    # The first dimension is the most significant bit (see app.services.cohorts)
+    return f"GROUPING({', '.join(dimensions)}) AS grouping_set"
+
+
+def upgrade() -> None:
+    # When each materialized view was last refreshed, so workers can share one schedule
+    op.create_table(
+        'view_refreshes',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('refreshed_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+    )
+
+    op.execute(f"""
+        CREATE MATERIALIZED VIEW cohort_outcome_stats AS
+        SELECT {_grouping_set(OUTCOME_DIMENSIONS)},
+               {', '.join(OUTCOME_DIMENSIONS)},
+               count(DISTINCT u.id) AS user_count,
+               count(o.id) AS outcome_count,
+               avg(o.frizz) AS avg_frizz,
+               avg(o.definition) AS avg_definition,
+               avg(o.softness) AS avg_softness,
+               avg(o.overall_score) AS avg_overall
+        FROM users u
+        JOIN routine_logs l ON l.user_id = u.id
+        JOIN outcomes o ON o.routine_log_id = l.id
+        GROUP BY GROUPING SETS (
+            (u.curl_pattern, u.porosity),
+            (u.curl_pattern, u.density),
+            (u.curl_pattern, u.thickness),
+            (u.curl_pattern),
+            (u.porosity),
+            ()
+        )
+    """)
+    op.execute("""
+        CREATE UNIQUE INDEX ux_cohort_outcome_stats
+        ON cohort_outcome_stats (grouping_set, curl_pattern, porosity, density, thickness)
+    """)
+
+    # Only community products (user_id IS NULL); personal products stay private
+    op.execute(f"""
+        CREATE MATERIALIZED VIEW cohort_product_stats AS
+        SELECT {_grouping_set(PRODUCT_DIMENSIONS)},
+               {', '.join(PRODUCT_DIMENSIONS)},
+               used.product_id,
+               count(DISTINCT u.id) AS user_count,
+               count(*) AS use_count,
+               avg(o.overall_score) AS avg_overall
+        FROM users u
+        JOIN routine_logs l ON l.user_id = u.id
+        JOIN outcomes o ON o.routine_log_id = l.id
+        CROSS JOIN LATERAL (
+            SELECT DISTINCT ids.value::integer AS product_id
+            FROM json_each(
+                CASE WHEN json_typeof(l.products_used) = 'object' THEN l.products_used ELSE '{{}}'::json END
+            ) AS steps
+            CROSS JOIN LATERAL json_array_elements_text(
+                CASE WHEN json_typeof(steps.value) = 'array' THEN steps.value ELSE '[]'::json END
+            ) AS ids
+            WHERE ids.value ~ '^[0-9]{{1,9}}$'
+        ) used
+        JOIN products p ON p.id = used.product_id AND p.user_id IS NULL
+        GROUP BY GROUPING SETS (
+            (u.curl_pattern, u.porosity, used.product_id),
+            (u.curl_pattern, used.product_id),
+            (u.porosity, used.product_id),
+            (used.product_id)
+        )
+    """)
+    op.execute("""
+        CREATE UNIQUE INDEX ux_cohort_product_stats
+        ON cohort_product_stats (grouping_set, curl_pattern, porosity, product_id)
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS cohort_product_stats")
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS cohort_outcome_stats")
+    op.drop_table('view_refreshes')
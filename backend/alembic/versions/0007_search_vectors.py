@@ -0,0 +1,44 @@
+"""generated tsvector columns with GIN indexes for full-text search
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTORS = {
+    'routine_logs': "to_tsvector('english', coalesce(notes, ''))",
+    'outcomes': "to_tsvector('english', coalesce(notes, ''))",
+    'routines': "to_tsvector('english', coalesce(name, ''))",
+    'products': (
+        "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(brand, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(notes, '')), 'C')"
+    ),
+}
+
+
+def upgrade() -> None:
+    for table, expression in SEARCH_VECTORS.items():
+        op.add_column(table, sa.Column(
+            'search_vector', postgresql.TSVECTOR(), sa.Computed(expression, persisted=True)
+        ))
+        op.create_index(f'ix_{table}_search', table, ['search_vector'], postgresql_using='gin')
+
+
+def downgrade() -> None:
+    for table in SEARCH_VECTORS:
+        op.drop_index(f'ix_{table}_search', table_name=table)
+        op.drop_column(table, 'search_vector')
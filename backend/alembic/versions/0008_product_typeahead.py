@@ -0,0 +1,31 @@
+"""pg_trgm index for product typeahead; index products.user_id
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        "CREATE INDEX ix_products_brand_name_trgm ON products "
+        "USING gin ((brand || ' ' || name) gin_trgm_ops)"
+    )
+    op.create_index('ix_products_user_id', 'products', ['user_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_products_user_id', table_name='products')
+    op.drop_index('ix_products_brand_name_trgm', table_name='products')
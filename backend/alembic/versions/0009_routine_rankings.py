@@ -0,0 +1,42 @@
+"""routine_rankings table for the public routine feed
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'routine_rankings',
+        sa.Column('routine_id', sa.Integer(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('rating_count', sa.Integer(), nullable=False),
+        sa.Column('average_score', sa.Float(), nullable=True),
+        sa.Column('method_tags', postgresql.ARRAY(sa.String()), nullable=False),
+        sa.Column('drying_method', sa.String(), nullable=True),
+        sa.Column('computed_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['routine_id'], ['routines.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('routine_id'),
+    )
+    op.create_index('ix_routine_rankings_feed', 'routine_rankings', ['score', 'routine_id'])
+    op.create_index('ix_routine_rankings_method_tags', 'routine_rankings', ['method_tags'], postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_routine_rankings_method_tags', table_name='routine_rankings')
+    op.drop_index('ix_routine_rankings_feed', table_name='routine_rankings')
+    op.drop_table('routine_rankings')
@@ -0,0 +1,45 @@
+"""model_artifacts table for versioned trained models
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'model_artifacts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('artifact', sa.LargeBinary(), nullable=False),
+        sa.Column('metrics', sa.JSON(), nullable=True),
+        sa.Column('training_rows', sa.Integer(), nullable=False),
+        sa.Column('is_current', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name', 'version', name='uq_model_artifacts_name_version'),
+    )
+    op.create_index(op.f('ix_model_artifacts_id'), 'model_artifacts', ['id'], unique=False)
+    op.create_index(
+        'uq_model_artifacts_current', 'model_artifacts', ['name'],
+        unique=True, postgresql_where=sa.text('is_current')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_model_artifacts_current', table_name='model_artifacts')
+    op.drop_index(op.f('ix_model_artifacts_id'), table_name='model_artifacts')
+    op.drop_table('model_artifacts')
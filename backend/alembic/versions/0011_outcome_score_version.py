@@ -0,0 +1,28 @@
+"""outcomes.score_version for versioned scoring weights
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0011'
+down_revision: Union[str, None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing scores were all computed with the original 40/30/30 weights (version 1).
+    # A constant default is stored in the catalog, so this does not rewrite the table.
+    op.add_column('outcomes', sa.Column('score_version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('outcomes', 'score_version')
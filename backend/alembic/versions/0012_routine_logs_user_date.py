@@ -0,0 +1,25 @@
+"""(user_id, date) index on routine_logs for per-user date ranges
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0012'
+down_revision: Union[str, None] = '0011'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_routine_logs_user_date', 'routine_logs', ['user_id', 'date'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_routine_logs_user_date', table_name='routine_logs')
@@ -0,0 +1,44 @@
+"""tombstones table and updated_at columns for delta sync
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0013'
+down_revision: Union[str, None] = '0012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'tombstones',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('entity', sa.String(), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_tombstones_user_deleted_at', 'tombstones', ['user_id', 'deleted_at'])
+    # Null until a row is next edited; /sync falls back to rated_at / created_at
+    op.add_column('outcomes', sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('weather_data', sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
+    # /sync filters each user's routines by owner
+    op.create_index('ix_routines_user_id', 'routines', ['user_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_routines_user_id', table_name='routines')
+    op.drop_column('weather_data', 'updated_at')
+    op.drop_column('outcomes', 'updated_at')
+    op.drop_index('ix_tombstones_user_deleted_at', table_name='tombstones')
+    op.drop_table('tombstones')
@@ -0,0 +1,52 @@
+"""ON DELETE CASCADE on user-owned foreign keys and users.deletion_requested_at
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0014'
+down_revision: Union[str, None] = '0013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, column, referenced table); constraint names are the Postgres defaults
+# given to the unnamed constraints created in 0001 and 0005
+FOREIGN_KEYS = [
+    ('products', 'user_id', 'users'),
+    ('routines', 'user_id', 'users'),
+    ('routine_logs', 'user_id', 'users'),
+    ('routine_logs', 'routine_id', 'routines'),
+    ('outcomes', 'routine_log_id', 'routine_logs'),
+    ('insights', 'user_id', 'users'),
+]
+
+
+def _recreate_foreign_keys(ondelete) -> None:
+    for table, column, referenced in FOREIGN_KEYS:
+        name = f'{table}_{column}_fkey'
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(name, table, referenced, [column], ['id'], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    _recreate_foreign_keys('CASCADE')
+    # Cascaded deletes look children up by these columns; without indexes each one scans
+    op.create_index('ix_routine_logs_routine_id', 'routine_logs', ['routine_id'])
+    op.add_column('users', sa.Column('deletion_requested_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index('ix_users_deletion_requested_at', 'users', ['deletion_requested_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_deletion_requested_at', table_name='users')
+    op.drop_column('users', 'deletion_requested_at')
+    op.drop_index('ix_routine_logs_routine_id', table_name='routine_logs')
+    _recreate_foreign_keys(None)
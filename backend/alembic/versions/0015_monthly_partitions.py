@@ -0,0 +1,188 @@
+"""monthly range partitions for routine_logs and weather_data
+
+Revision ID: 0015
+Revises: 0014
+Create Date: 2026-10-19 00:00:00.000000
+
+Both tables are rebuilt as PARTITION BY RANGE (date) with one partition per
+month, from the oldest row (at most MAX_HISTORY_YEARS back) to MONTHS_AHEAD
+months from now, plus a default partition for anything outside that range.
+app.services.partitions keeps creating months ahead after this.
+
+A partitioned table's primary and unique keys must include the partition
+key, so both primary keys become (id, date). outcomes references a routine
+log by (routine_log_id, routine_log_date); ON UPDATE CASCADE keeps that
+right when a log's date moves it to another partition (Postgres 15+).
+
+The copy takes an exclusive lock on both tables for the length of the
+migration; run it in a maintenance window on large databases.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0015'
+down_revision: Union[str, None] = '0014'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+MAX_HISTORY_YEARS = 10
+
+ROUTINE_LOG_COLUMNS = (
+    "id, user_id, routine_id, date, time, products_used, wash_day, styling_method, "
+    "drying_method, time_spent, notes, photo_urls, created_at, updated_at"
+)
+WEATHER_COLUMNS = (
+    "id, location_id, date, humidity, dew_point, temperature, wind_speed, "
+    "found, expires_at, created_at, updated_at"
+)
+
+# Materialized views over routine_logs; they are bound to the table itself, not
+# its name, so they are recreated from their saved definitions after the swap
+DEPENDENT_VIEWS = ('cohort_outcome_stats', 'cohort_product_stats')
+
+
+def _save_views() -> None:
+    op.execute(f"""
+        CREATE TEMPORARY TABLE saved_views ON COMMIT DROP AS
+        SELECT c.relname AS name,
+               regexp_replace(pg_get_viewdef(c.oid), ';\\s*$', '') AS definition,
+               ARRAY(SELECT pg_get_indexdef(i.indexrelid) FROM pg_index i WHERE i.indrelid = c.oid) AS indexes
+        FROM pg_class c
+        WHERE c.relkind = 'm' AND c.relname IN ({', '.join(f"'{view}'" for view in DEPENDENT_VIEWS)})
+    """)
+    for view in reversed(DEPENDENT_VIEWS):
+        op.execute(f"DROP MATERIALIZED VIEW IF EXISTS {view}")
+
+
+def _restore_views() -> None:
+    op.execute("""
+        DO $$
+        DECLARE
+            saved record;
+            index_definition text;
+        BEGIN
+            FOR saved IN SELECT * FROM saved_views LOOP
+                EXECUTE format('CREATE MATERIALIZED VIEW %I AS %s', saved.name, saved.definition);
+                FOREACH index_definition IN ARRAY saved.indexes LOOP
+                    EXECUTE index_definition;
+                END LOOP;
+            END LOOP;
+        END $$
+    """)
+    op.execute("DROP TABLE saved_views")
+
+
+def _set_aside(table: str, unique_constraints: Sequence[str] = ()) -> str:
+    """Rename a table (and its index-backed constraints) out of the way of its replacement"""
+    old = f'{table}_old'
+    op.rename_table(table, old)
+    for name in (f'{table}_pkey', *unique_constraints):
+        op.execute(f"ALTER TABLE {old} RENAME CONSTRAINT {name} TO {name}_old")
+    return old
+
+
+def _replacement(table: str, old: str, partitioned: bool) -> None:
+    """Same columns, defaults and generated columns; the id sequence moves over"""
+    op.execute(f"""
+        CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS INCLUDING GENERATED)
+        {'PARTITION BY RANGE (date)' if partitioned else ''}
+    """)
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+
+
+def _create_partitions(table: str, source: str) -> None:
+    op.execute(f"""
+        DO $$
+        DECLARE
+            month date;
+        BEGIN
+            FOR month IN
+                SELECT generate_series(first_month::timestamp, last_month::timestamp, interval '1 month')::date
+                FROM (
+                    SELECT date_trunc('month', GREATEST(
+                               LEAST(min(date), current_date),
+                               (current_date - interval '{MAX_HISTORY_YEARS} years')::date
+                           ))::date AS first_month,
+                           (date_trunc('month', current_date) + interval '{MONTHS_AHEAD} months')::date AS last_month
+                    FROM {source}
+                ) bounds
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF {table} FOR VALUES FROM (%L) TO (%L)',
+                    '{table}_p' || to_char(month, 'YYYY_MM'), month, (month + interval '1 month')::date
+                );
+            END LOOP;
+        END $$
+    """)
+    op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+
+def _rebuild_routine_logs(partitioned: bool) -> None:
+    old = _set_aside('routine_logs')
+    _replacement('routine_logs', old, partitioned)
+    op.create_primary_key('routine_logs_pkey', 'routine_logs', ['id', 'date'] if partitioned else ['id'])
+    op.create_foreign_key(
+        'routine_logs_user_id_fkey', 'routine_logs', 'users', ['user_id'], ['id'], ondelete='CASCADE'
+    )
+    op.create_foreign_key(
+        'routine_logs_routine_id_fkey', 'routine_logs', 'routines', ['routine_id'], ['id'], ondelete='CASCADE'
+    )
+    if partitioned:
+        _create_partitions('routine_logs', old)
+    op.execute(f"INSERT INTO routine_logs ({ROUTINE_LOG_COLUMNS}) SELECT {ROUTINE_LOG_COLUMNS} FROM {old}")
+
+    if partitioned:
+        op.add_column('outcomes', sa.Column('routine_log_date', sa.Date(), nullable=True))
+        op.execute(f"UPDATE outcomes o SET routine_log_date = l.date FROM {old} l WHERE l.id = o.routine_log_id")
+        op.alter_column('outcomes', 'routine_log_date', existing_type=sa.Date(), nullable=False)
+        op.drop_constraint('outcomes_routine_log_id_fkey', 'outcomes', type_='foreignkey')
+        op.create_foreign_key(
+            'outcomes_routine_log_fkey', 'outcomes', 'routine_logs',
+            ['routine_log_id', 'routine_log_date'], ['id', 'date'], ondelete='CASCADE', onupdate='CASCADE'
+        )
+    else:
+        op.drop_constraint('outcomes_routine_log_fkey', 'outcomes', type_='foreignkey')
+        op.drop_column('outcomes', 'routine_log_date')
+        op.create_foreign_key(
+            'outcomes_routine_log_id_fkey', 'outcomes', 'routine_logs', ['routine_log_id'], ['id'], ondelete='CASCADE'
+        )
+
+    op.drop_table(old)
+    # Indexes on a partitioned table are created on every partition, present and future
+    op.create_index('ix_routine_logs_id', 'routine_logs', ['id'])
+    op.create_index('ix_routine_logs_user_date', 'routine_logs', ['user_id', 'date'])
+    op.create_index('ix_routine_logs_routine_id', 'routine_logs', ['routine_id'])
+    op.create_index('ix_routine_logs_search', 'routine_logs', ['search_vector'], postgresql_using='gin')
+
+
+def _rebuild_weather_data(partitioned: bool) -> None:
+    old = _set_aside('weather_data', ['uq_weather_location_date'])
+    _replacement('weather_data', old, partitioned)
+    op.create_primary_key('weather_data_pkey', 'weather_data', ['id', 'date'] if partitioned else ['id'])
+    op.create_unique_constraint('uq_weather_location_date', 'weather_data', ['location_id', 'date'])
+    op.create_foreign_key('weather_data_location_id_fkey', 'weather_data', 'locations', ['location_id'], ['id'])
+    if partitioned:
+        _create_partitions('weather_data', old)
+    op.execute(f"INSERT INTO weather_data ({WEATHER_COLUMNS}) SELECT {WEATHER_COLUMNS} FROM {old}")
+    op.drop_table(old)
+    op.create_index('ix_weather_data_id', 'weather_data', ['id'])
+
+
+def upgrade() -> None:
+    _save_views()
+    _rebuild_routine_logs(partitioned=True)
+    _rebuild_weather_data(partitioned=True)
+    _restore_views()
+
+
+def downgrade() -> None:
+    # Archived (dropped) partitions are not brought back
+    _save_views()
+    _rebuild_weather_data(partitioned=False)
+    _rebuild_routine_logs(partitioned=False)
+    _restore_views()
@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1 import auth, users, products, routines, routine_logs, outcomes, weather, dashboard
+from app.api.v1 import auth, users, products, routines, routine_logs, outcomes, weather, dashboard, cohorts, search, predictions, sync, batch, admin
 
 api_router = APIRouter()
 
@@ -11,3 +11,9 @@ api_router.include_router(routine_logs.router, prefix="/routine-logs", tags=["ro
 api_router.include_router(outcomes.router, prefix="/outcomes", tags=["outcomes"])
 api_router.include_router(weather.router, prefix="/weather", tags=["weather"])
 api_router.include_router(dashboard.router, prefix="/dashboard", tags=["dashboard"])
+api_router.include_router(cohorts.router, prefix="/cohorts", tags=["cohorts"])
+api_router.include_router(search.router, prefix="/search", tags=["search"])
+api_router.include_router(predictions.router, prefix="/predictions", tags=["predictions"])
+api_router.include_router(sync.router, prefix="/sync", tags=["sync"])
+api_router.include_router(batch.router, prefix="/batch", tags=["batch"])
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Depends, status
+from app.core.database import engine, replica_engine
+from app.core.dependencies import get_current_admin_user
+from app.core.pool_stats import describe_pool, pool_stats
+from app.models.user import User
+
+router = APIRouter()
+
+
+@router.get("/db-pool")
+async def get_db_pool_stats(current_user: User = Depends(get_current_admin_user)):
+    """Get live connection pool statistics for the worker serving this request, per engine"""
+    return {
+        "primary": describe_pool(engine.pool, pool_stats["primary"]),
+        "replica": (
+            describe_pool(replica_engine.pool, pool_stats["replica"]) if replica_engine is not None else None
+        ),
+    }
+
+
+@router.post("/db-pool/reset", status_code=status.HTTP_204_NO_CONTENT)
+async def reset_db_pool_stats(current_user: User = Depends(get_current_admin_user)):
+    """Reset this worker's accumulated checkout counters and histograms"""
+    for stats in pool_stats.values():
+        stats.reset()
+    return None
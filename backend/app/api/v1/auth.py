@@ -2,17 +2,44 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
+from typing import Optional
 from app.core.database import get_db
+from app.core.dependencies import get_current_user, oauth2_scheme
 from app.core.security import verify_password, get_password_hash, create_access_token, create_refresh_token, decode_token
 from app.core.config import settings
+from app.core.token_revocation import is_token_revoked, revoke_token, revoke_user_tokens
 from app.models.user import User
 from app.schemas.user import UserCreate, User as UserSchema, Token
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone
 
 
 class RefreshTokenRequest(BaseModel):
     refresh_token: str
 
+
+class LogoutRequest(BaseModel):
+    refresh_token: Optional[str] = None
+
+
+class ChangePasswordRequest(BaseModel):
+    current_password: str
+    new_password: str
+
+
+def issue_tokens(user: User) -> dict:
+    """Create a fresh access/refresh token pair for a user"""
+    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = create_access_token(
+        data={"sub": user.id}, expires_delta=access_token_expires
+    )
+    refresh_token = create_refresh_token(data={"sub": user.id})
+    
+    return {
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "token_type": "bearer"
+    }
+
 router = APIRouter()
 
 
@@ -52,24 +79,14 @@ async def login(
 ):
     """Login and get access token"""
     user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.password_hash):
+    if not user or user.deletion_requested_at or not verify_password(form_data.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user.id}, expires_delta=access_token_expires
-    )
-    refresh_token = create_refresh_token(data={"sub": user.id})
-    
-    return {
-        "access_token": access_token,
-        "refresh_token": refresh_token,
-        "token_type": "bearer"
-    }
+    return issue_tokens(user)
 
 
 @router.post("/refresh", response_model=Token)
@@ -110,14 +127,61 @@ async def refresh_token(request: RefreshTokenRequest, db: Session = Depends(get_
             detail="User not found"
         )
     
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user.id}, expires_delta=access_token_expires
-    )
-    new_refresh_token = create_refresh_token(data={"sub": user.id})
+    revoked_by_user = user.tokens_valid_after and payload.get("iat", 0) < user.tokens_valid_after.timestamp()
+    if revoked_by_user or is_token_revoked(payload, user.id):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token has been revoked"
+        )
     
-    return {
-        "access_token": access_token,
-        "refresh_token": new_refresh_token,
-        "token_type": "bearer"
-    }
+    return issue_tokens(user)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    request: Optional[LogoutRequest] = None,
+    token: str = Depends(oauth2_scheme)
+):
+    """Revoke the current access token (and the refresh token, if sent)"""
+    payload = decode_token(token)
+    if payload is None or payload.get("type") != "access":
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if payload.get("jti"):
+        revoke_token(payload["jti"], payload["exp"])
+    
+    if request and request.refresh_token:
+        refresh_payload = decode_token(request.refresh_token)
+        if (
+            refresh_payload
+            and refresh_payload.get("type") == "refresh"
+            and refresh_payload.get("sub") == payload.get("sub")
+            and refresh_payload.get("jti")
+        ):
+            revoke_token(refresh_payload["jti"], refresh_payload["exp"])
+    return None
+
+
+@router.post("/change-password", response_model=Token)
+async def change_password(
+    request: ChangePasswordRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Change password, revoke every previously issued token and return new ones"""
+    if not verify_password(request.current_password, current_user.password_hash):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Current password is incorrect"
+        )
+    
+    now = datetime.now(timezone.utc)
+    current_user.password_hash = get_password_hash(request.new_password)
+    current_user.tokens_valid_after = now
+    db.commit()
+    revoke_user_tokens(current_user.id, now)
+    
+    return issue_tokens(current_user)
@@ -0,0 +1,123 @@
+import asyncio
+import json
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import JSONResponse
+from app.core.config import settings
+from app.core.database import SessionLocal, engine, get_read_session
+from app.core.dependencies import load_token_user, oauth2_scheme, verify_access_token
+from app.core.rate_limit import get_rate_limiter
+from app.schemas.batch import BatchItem, BatchRequest, BatchResponse
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+API_PREFIX = "/api/v1"
+# Headers a sub-request inherits from the batch request
+FORWARDED_HEADERS = (b"authorization", b"accept", b"accept-language")
+
+
+async def _receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+def _exception_handler(app, exc: Exception):
+    for cls in type(exc).__mro__:
+        if cls in app.exception_handlers:
+            return app.exception_handlers[cls]
+    return None
+
+
+async def _dispatch(request: Request, item: BatchItem, user, db, read_db) -> dict:
+    """Run one GET through the API router in-process, sharing the batch's user and sessions"""
+    path, _, query = item.path.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": request.scope.get("asgi", {"version": "3.0"}),
+        "http_version": request.scope.get("http_version", "1.1"),
+        "method": "GET",
+        "scheme": request.scope.get("scheme", "http"),
+        "server": request.scope.get("server"),
+        "client": request.scope.get("client"),
+        "root_path": request.scope.get("root_path", ""),
+        "path": API_PREFIX + path,
+        "raw_path": (API_PREFIX + path).encode(),
+        "query_string": query.encode(),
+        "headers": [(k, v) for k, v in request.scope["headers"] if k in FORWARDED_HEADERS],
+        "app": request.app,
+        "batch_user": user,
+        "batch_session": db,
+        "batch_read_session": read_db,
+    }
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    # The router is called directly, past RateLimitMiddleware, so each sub-request is charged here
+    response = get_rate_limiter().check(request, "GET", scope["path"]) if settings.RATE_LIMIT_ENABLED else None
+    if response is None:
+        try:
+            await request.app.router(scope, _receive, send)
+        except Exception as exc:
+            handler = _exception_handler(request.app, exc)
+            if handler is None:
+                logger.exception("Batch sub-request GET %s failed", item.path)
+                response = JSONResponse({"detail": "Internal Server Error"}, status_code=500)
+            else:
+                response = await handler(Request(scope), exc)
+    if response is not None:
+        messages = []
+        await response(scope, _receive, send)
+
+    start = next(m for m in messages if m["type"] == "http.response.start")
+    body = b"".join(m.get("body", b"") for m in messages if m["type"] == "http.response.body")
+    headers = {k.decode("latin-1"): v.decode("latin-1") for k, v in start.get("headers", [])}
+    content_type = headers.pop("content-type", "")
+    headers.pop("content-length", None)
+    return {
+        "id": item.id or item.path,
+        "status": start["status"],
+        "headers": headers,
+        "body": json.loads(body) if body and content_type.startswith("application/json") else body.decode() or None,
+    }
+
+
+@router.post("", response_model=BatchResponse)
+async def batch(
+    batch_request: BatchRequest,
+    request: Request,
+    token: str = Depends(oauth2_scheme)
+):
+    """Run several GET requests in one round trip, authenticated once and sharing database sessions"""
+    items = batch_request.requests
+    if len(items) > settings.BATCH_MAX_REQUESTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.BATCH_MAX_REQUESTS} requests per batch"
+        )
+    if any(item.path.partition("?")[0].rstrip("/") == "/batch" for item in items):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Batches cannot be nested"
+        )
+
+    _, user_id = verify_access_token(token)
+    # get_db routes (e.g. /sync, which must not read from a lagging replica) get
+    # the primary; get_read_db routes get the replica when the user may use it
+    db = SessionLocal()
+    read_db = get_read_session(user_id)
+    if read_db.get_bind() is engine:
+        read_db.close()
+        read_db = db
+    try:
+        # From the primary, like get_current_user outside a batch
+        user = load_token_user(db, token)
+        # Handlers do their database work synchronously, so while they are
+        # gathered concurrently their statements still take turns on each session
+        responses = await asyncio.gather(*(_dispatch(request, item, user, db, read_db) for item in items))
+    finally:
+        read_db.close()
+        db.close()
+    return {"responses": responses}
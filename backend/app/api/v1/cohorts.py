@@ -0,0 +1,62 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.core.dependencies import get_current_user, get_read_db
+from app.models.user import User
+from app.services.cohorts import (
+    OUTCOME_COHORTS, PRODUCT_COHORTS, get_cohort_outcomes, get_cohort_products, last_refreshed
+)
+
+router = APIRouter()
+
+
+@router.get("")
+async def get_cohort(
+    curl_pattern: Optional[str] = None,
+    porosity: Optional[str] = None,
+    density: Optional[str] = None,
+    thickness: Optional[str] = None,
+    products_limit: int = Query(10, ge=0, le=50),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """Get outcome and product performance for users with similar hair.
+
+    Defaults to the current user's curl pattern and porosity. Cohorts with too
+    few users or outcomes are reported without statistics.
+    """
+    cohort = {
+        name: value for name, value in (
+            ("curl_pattern", curl_pattern), ("porosity", porosity),
+            ("density", density), ("thickness", thickness),
+        ) if value
+    }
+    if not cohort:
+        cohort = {
+            name: value for name, value in (
+                ("curl_pattern", current_user.curl_pattern), ("porosity", current_user.porosity)
+            ) if value
+        }
+        if not cohort:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No cohort given and hair profile has no curl pattern or porosity"
+            )
+    if frozenset(cohort) not in OUTCOME_COHORTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Supported cohorts: curl_pattern and/or porosity, or curl_pattern with density or thickness"
+        )
+    
+    outcomes = get_cohort_outcomes(db, cohort)
+    products = []
+    if outcomes and products_limit and frozenset(cohort) in PRODUCT_COHORTS:
+        products = get_cohort_products(db, cohort, products_limit)
+    
+    return {
+        "cohort": cohort,
+        "refreshed_at": last_refreshed(db),
+        "sufficient_data": outcomes is not None,
+        "outcomes": outcomes,
+        "top_products": products
+    }
@@ -1,24 +1,26 @@
-from fastapi import APIRouter, Depends
+import hashlib
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
-from typing import Dict, List, Any
+from sqlalchemy import func, and_, case, tuple_
+from typing import Dict, List, Any, Optional
 from datetime import date, timedelta
-from app.core.database import get_db
-from app.core.dependencies import get_current_user
-from app.models.user import User
+from app.core.dependencies import TokenUser, get_read_db, get_token_user
 from app.models.routine_log import RoutineLog
 from app.models.outcome import Outcome
 from app.models.routine import Routine
 from app.models.product import Product
-from app.models.weather import WeatherData
+from app.models.user import User
+from app.models.insight import Insight
+from app.services.insights import schedule_insight_refresh
 
 router = APIRouter()
 
 
 @router.get("/stats")
 async def get_dashboard_stats(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: TokenUser = Depends(get_token_user),
+    db: Session = Depends(get_read_db)
 ):
     """Get dashboard statistics and insights"""
     # Total logs
@@ -101,8 +103,8 @@ async def get_dashboard_stats(
 @router.get("/trends")
 async def get_trends(
     days: int = 30,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: TokenUser = Depends(get_token_user),
+    db: Session = Depends(get_read_db)
 ):
     """Get trends over time"""
     start_date = date.today() - timedelta(days=days)
@@ -137,53 +139,155 @@ async def get_trends(
     }
 
 
-@router.get("/insights")
-async def get_insights(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+@router.get("/factors")
+async def get_factor_breakdown(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    current_user: TokenUser = Depends(get_token_user),
+    db: Session = Depends(get_read_db)
 ):
-    """Get basic insights (simplified version)"""
-    insights = []
-    
-    # Weather correlation (simplified)
-    # Compare high humidity vs low humidity days
-    high_humidity_threshold = 60.0
-    low_humidity_threshold = 40.0
-    
-    high_humidity_outcomes = db.query(func.avg(Outcome.frizz)).select_from(Outcome).join(
-        RoutineLog, Outcome.routine_log_id == RoutineLog.id
-    ).join(
-        WeatherData, and_(
-            WeatherData.user_id == current_user.id,
-            WeatherData.date == RoutineLog.date
+    """Average outcomes by styling method, drying method, wash day and routine in one query"""
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start_date must be on or before end_date"
         )
+    
+    # GROUPING() is 0 for the columns a row is grouped by, which tells the sets apart
+    # (a NULL styling_method inside its own set is "not recorded", not a rollup)
+    factor = case(
+        (func.grouping(RoutineLog.styling_method) == 0, "styling_method"),
+        (func.grouping(RoutineLog.drying_method) == 0, "drying_method"),
+        (func.grouping(RoutineLog.wash_day) == 0, "wash_day"),
+        else_="routine"
+    ).label("factor")
+    query = db.query(
+        factor,
+        RoutineLog.styling_method,
+        RoutineLog.drying_method,
+        RoutineLog.wash_day,
+        RoutineLog.routine_id,
+        Routine.name.label("routine_name"),
+        func.count(Outcome.id).label("count"),
+        func.avg(Outcome.frizz).label("avg_frizz"),
+        func.avg(Outcome.definition).label("avg_definition"),
+        func.avg(Outcome.softness).label("avg_softness"),
+        func.avg(Outcome.overall_score).label("avg_overall")
+    ).select_from(RoutineLog).join(
+        Outcome, RoutineLog.id == Outcome.routine_log_id
+    ).outerjoin(
+        Routine, Routine.id == RoutineLog.routine_id
     ).filter(
-        and_(
-            RoutineLog.user_id == current_user.id,
-            WeatherData.humidity >= high_humidity_threshold
-        )
-    ).scalar()
+        RoutineLog.user_id == current_user.id
+    )
+    if start_date:
+        query = query.filter(RoutineLog.date >= start_date)
+    if end_date:
+        query = query.filter(RoutineLog.date <= end_date)
     
-    low_humidity_outcomes = db.query(func.avg(Outcome.frizz)).select_from(Outcome).join(
-        RoutineLog, Outcome.routine_log_id == RoutineLog.id
-    ).join(
-        WeatherData, and_(
-            WeatherData.user_id == current_user.id,
-            WeatherData.date == RoutineLog.date
+    rows = query.group_by(
+        func.grouping_sets(
+            tuple_(RoutineLog.styling_method),
+            tuple_(RoutineLog.drying_method),
+            tuple_(RoutineLog.wash_day),
+            tuple_(RoutineLog.routine_id, Routine.name)
         )
+    ).order_by("factor", func.avg(Outcome.overall_score).desc()).all()
+    
+    factors: Dict[str, List[Dict[str, Any]]] = {
+        "styling_method": [], "drying_method": [], "wash_day": [], "routine": []
+    }
+    for row in rows:
+        entry: Dict[str, Any] = {
+            "value": row.routine_id if row.factor == "routine" else getattr(row, row.factor),
+            "count": row.count,
+            "frizz": round(row.avg_frizz, 2),
+            "definition": round(row.avg_definition, 2),
+            "softness": round(row.avg_softness, 2),
+            "overall": round(row.avg_overall, 2)
+        }
+        if row.factor == "routine":
+            entry["name"] = row.routine_name
+        factors[row.factor].append(entry)
+    
+    return {
+        "start_date": str(start_date) if start_date else None,
+        "end_date": str(end_date) if end_date else None,
+        "factors": factors
+    }
+
+
+@router.get("/calendar")
+async def get_calendar(
+    request: Request,
+    response: Response,
+    year: Optional[int] = Query(None, ge=1900, le=2100),
+    current_user: TokenUser = Depends(get_token_user),
+    db: Session = Depends(get_read_db)
+):
+    """Per-day log counts and average overall score for one year, as parallel arrays"""
+    year = year or date.today().year
+    start = date(year, 1, 1)
+    
+    rows = db.query(
+        RoutineLog.date,
+        func.count(RoutineLog.id).label("logs"),
+        func.count(RoutineLog.id).filter(RoutineLog.wash_day.is_(True)).label("wash_days"),
+        func.count(Outcome.id).label("outcomes"),
+        func.avg(Outcome.overall_score).label("avg_overall")
+    ).select_from(RoutineLog).outerjoin(
+        Outcome, RoutineLog.id == Outcome.routine_log_id
     ).filter(
-        and_(
-            RoutineLog.user_id == current_user.id,
-            WeatherData.humidity <= low_humidity_threshold
-        )
-    ).scalar()
+        RoutineLog.user_id == current_user.id,
+        RoutineLog.date >= start,
+        RoutineLog.date < date(year + 1, 1, 1)
+    ).group_by(RoutineLog.date).order_by(RoutineLog.date).all()
     
-    if high_humidity_outcomes and low_humidity_outcomes:
-        if high_humidity_outcomes > low_humidity_outcomes:
-            insights.append({
-                "type": "weather",
-                "message": f"High humidity days (≥{high_humidity_threshold}%) show {round((high_humidity_outcomes - low_humidity_outcomes) / low_humidity_outcomes * 100, 1)}% higher frizz on average",
-                "confidence": "medium"
-            })
+    # Only days with logs are listed; days[i] is the offset from January 1st
+    body = {
+        "year": year,
+        "start_date": str(start),
+        "days": [(row.date - start).days for row in rows],
+        "logs": [row.logs for row in rows],
+        "wash_days": [row.wash_days for row in rows],
+        "outcomes": [row.outcomes for row in rows],
+        "overall": [round(row.avg_overall, 2) if row.avg_overall is not None else None for row in rows],
+    }
+    
+    # Private per-user cache; clients revalidate with If-None-Match and get a 304 if unchanged
+    etag = '"' + hashlib.sha1(json.dumps(body, separators=(",", ":")).encode()).hexdigest() + '"'
+    cache_control = "private, no-cache" if year >= date.today().year else "private, max-age=3600"
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag, "Cache-Control": cache_control})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    return body
+
+
+@router.get("/insights")
+async def get_insights(
+    current_user: TokenUser = Depends(get_token_user),
+    db: Session = Depends(get_read_db)
+):
+    """Get precomputed insights (refreshed in the background after writes)"""
+    rows = db.query(User.insights_computed_at, Insight).outerjoin(
+        Insight, Insight.user_id == User.id
+    ).filter(User.id == current_user.id).order_by(Insight.id).all()
+    
+    computed_at = rows[0][0] if rows else None
+    if computed_at is None:
+        # Never computed (e.g. data from before insights were stored); build them now in the background
+        schedule_insight_refresh(current_user.id)
     
-    return {"insights": insights}
+    return {
+        "insights": [
+            {
+                "type": insight.insight_type,
+                "message": insight.message,
+                "confidence": insight.confidence,
+                "sample_size": insight.sample_size,
+            }
+            for _, insight in rows if insight is not None
+        ],
+        "computed_at": computed_at,
+    }
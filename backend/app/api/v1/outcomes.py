@@ -1,40 +1,25 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
+from app.core.config import settings
 from app.core.database import get_db
-from app.core.dependencies import get_current_user
-from app.models.user import User
+from app.core.dependencies import TokenUser, get_read_db, get_token_user
+from app.core.fields import FieldSelection, sparse_fields
 from app.models.outcome import Outcome
 from app.models.routine_log import RoutineLog
 from app.schemas.outcome import Outcome as OutcomeSchema, OutcomeCreate, OutcomeUpdate
+from app.services.insights import schedule_insight_refresh
+from app.services.scoring import calculate_overall_score
 
 router = APIRouter()
 
-
-def calculate_overall_score(frizz: int, definition: int, softness: int, hold_hours: float = None) -> float:
-    """Calculate overall score from ratings (inverted frizz, weighted)"""
-    # Invert frizz (1 = no frizz = good, 5 = very frizzy = bad)
-    # Higher definition and softness are better
-    # Hold hours contribute if provided
-    frizz_score = (6 - frizz) / 5.0  # Invert: 5->1, 1->5, normalize to 0-1
-    definition_score = definition / 5.0
-    softness_score = softness / 5.0
-    
-    # Weighted average (frizz 40%, definition 30%, softness 30%)
-    base_score = (frizz_score * 0.4 + definition_score * 0.3 + softness_score * 0.3) * 5
-    
-    # If hold_hours provided, add bonus (max 24 hours = full point)
-    if hold_hours:
-        hold_bonus = min(hold_hours / 24.0, 1.0)  # Max 1 point
-        return min(base_score + hold_bonus, 5.0)  # Cap at 5
-    
-    return base_score
+outcome_fields = sparse_fields(OutcomeSchema, Outcome)
 
 
 @router.post("", response_model=OutcomeSchema, status_code=status.HTTP_201_CREATED)
 async def create_outcome(
     outcome_data: OutcomeCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """Create an outcome for a routine log"""
@@ -67,39 +52,44 @@ async def create_outcome(
     
     db_outcome = Outcome(
         routine_log_id=outcome_data.routine_log_id,
+        routine_log_date=log.date,
         frizz=outcome_data.frizz,
         definition=outcome_data.definition,
         softness=outcome_data.softness,
         hold_hours=outcome_data.hold_hours,
         notes=outcome_data.notes,
-        overall_score=overall_score
+        overall_score=overall_score,
+        score_version=settings.SCORING_VERSION
     )
     db.add(db_outcome)
     db.commit()
     db.refresh(db_outcome)
+    schedule_insight_refresh(current_user.id)
     return db_outcome
 
 
 @router.get("", response_model=List[OutcomeSchema])
 async def get_outcomes(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    fields: FieldSelection = Depends(outcome_fields),
+    current_user: TokenUser = Depends(get_token_user),
+    db: Session = Depends(get_read_db)
 ):
     """Get all outcomes for current user"""
-    outcomes = db.query(Outcome).join(RoutineLog).filter(
+    outcomes = db.query(Outcome).options(*fields.load_options()).join(RoutineLog).filter(
         RoutineLog.user_id == current_user.id
     ).all()
-    return outcomes
+    return fields.render(outcomes)
 
 
 @router.get("/{outcome_id}", response_model=OutcomeSchema)
 async def get_outcome(
     outcome_id: int,
-    current_user: User = Depends(get_current_user),
+    fields: FieldSelection = Depends(outcome_fields),
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """Get a specific outcome"""
-    outcome = db.query(Outcome).join(RoutineLog).filter(
+    outcome = db.query(Outcome).options(*fields.load_options()).join(RoutineLog).filter(
         Outcome.id == outcome_id,
         RoutineLog.user_id == current_user.id
     ).first()
@@ -108,14 +98,14 @@ async def get_outcome(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Outcome not found"
         )
-    return outcome
+    return fields.render(outcome)
 
 
 @router.put("/{outcome_id}", response_model=OutcomeSchema)
 async def update_outcome(
     outcome_id: int,
     outcome_update: OutcomeUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """Update an outcome"""
@@ -138,19 +128,21 @@ async def update_outcome(
         softness = update_data.get('softness', outcome.softness)
         hold_hours = update_data.get('hold_hours', outcome.hold_hours)
         update_data['overall_score'] = calculate_overall_score(frizz, definition, softness, hold_hours)
+        update_data['score_version'] = settings.SCORING_VERSION
     
     for field, value in update_data.items():
         setattr(outcome, field, value)
     
     db.commit()
     db.refresh(outcome)
+    schedule_insight_refresh(current_user.id)
     return outcome
 
 
 @router.delete("/{outcome_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_outcome(
     outcome_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """Delete an outcome"""
@@ -166,4 +158,5 @@ async def delete_outcome(
     
     db.delete(outcome)
     db.commit()
+    schedule_insight_refresh(current_user.id)
     return None
@@ -0,0 +1,64 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from app.core.dependencies import get_current_user, get_read_db
+from app.models.routine import Routine
+from app.models.user import User
+from app.models.weather import WeatherData
+from app.schemas.prediction import Forecast, OutcomePredictionRequest, OutcomePredictions
+from app.services.outcome_model import PROFILE_FIELDS, WEATHER_FIELDS, current_model, predict, routine_features
+
+router = APIRouter()
+
+
+@router.post("/outcomes", response_model=OutcomePredictions)
+async def predict_outcomes(
+    request: OutcomePredictionRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """Predict the overall score of candidate routines for your hair on a given day"""
+    model = current_model()
+    if model is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="No outcome prediction model has been trained yet"
+        )
+
+    query = db.query(Routine)
+    if request.routine_ids:
+        query = query.filter(
+            Routine.id.in_(request.routine_ids),
+            or_(Routine.user_id == current_user.id, Routine.is_public.is_(True))
+        )
+    else:
+        query = query.filter(Routine.user_id == current_user.id)
+    routines = query.all()
+
+    # An explicit forecast wins; otherwise use stored weather for the user's location that day
+    weather = request.forecast or Forecast()
+    if request.forecast is None and request.date and current_user.location_id:
+        stored = db.query(WeatherData).filter(
+            WeatherData.location_id == current_user.location_id,
+            WeatherData.date == request.date,
+            WeatherData.found.is_(True)
+        ).first()
+        if stored:
+            weather = Forecast(**{field: getattr(stored, field) for field in WEATHER_FIELDS})
+
+    profile = {field: getattr(current_user, field) for field in PROFILE_FIELDS}
+    scores = predict(model, [routine_features(routine, request.wash_day, profile, weather.model_dump()) for routine in routines])
+    predictions = sorted(
+        (
+            {"routine_id": routine.id, "name": routine.name, "predicted_score": round(score, 2)}
+            for routine, score in zip(routines, scores)
+        ),
+        key=lambda p: p["predicted_score"],
+        reverse=True
+    )
+    return {
+        "model_version": model.version,
+        "date": request.date,
+        "weather": weather,
+        "predictions": predictions
+    }
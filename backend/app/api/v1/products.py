@@ -1,19 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from typing import List
 from app.core.database import get_db
-from app.core.dependencies import get_current_user
-from app.models.user import User
+from app.core.dependencies import TokenUser, get_read_db, get_token_user
+from app.core.fields import FieldSelection, sparse_fields
 from app.models.product import Product
-from app.schemas.product import Product as ProductSchema, ProductCreate, ProductUpdate
+from app.schemas.product import Product as ProductSchema, ProductCreate, ProductSuggestion, ProductUpdate
+from app.services.product_catalog import autocomplete
 
 router = APIRouter()
 
+product_fields = sparse_fields(ProductSchema, Product)
+
 
 @router.post("", response_model=ProductSchema, status_code=status.HTTP_201_CREATED)
 async def create_product(
     product_data: ProductCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """Create a new product"""
@@ -26,25 +29,38 @@ async def create_product(
 
 @router.get("", response_model=List[ProductSchema])
 async def get_products(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    fields: FieldSelection = Depends(product_fields),
+    current_user: TokenUser = Depends(get_token_user),
+    db: Session = Depends(get_read_db)
 ):
     """Get all products for current user (including unassigned / community products with user_id NULL)"""
     from sqlalchemy import or_
-    products = db.query(Product).filter(
+    products = db.query(Product).options(*fields.load_options()).filter(
         or_(Product.user_id == current_user.id, Product.user_id.is_(None))
     ).all()
-    return products
+    return fields.render(products)
+
+
+@router.get("/autocomplete", response_model=List[ProductSuggestion])
+async def autocomplete_products(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=25),
+    current_user: TokenUser = Depends(get_token_user),
+    db: Session = Depends(get_read_db)
+):
+    """Typeahead over brand and name: your products first, then the community catalog"""
+    return autocomplete(db, q, limit, current_user.id)
 
 
 @router.get("/{product_id}", response_model=ProductSchema)
 async def get_product(
     product_id: int,
-    current_user: User = Depends(get_current_user),
+    fields: FieldSelection = Depends(product_fields),
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """Get a specific product"""
-    product = db.query(Product).filter(
+    product = db.query(Product).options(*fields.load_options()).filter(
         Product.id == product_id,
         Product.user_id == current_user.id
     ).first()
@@ -53,14 +69,14 @@ async def get_product(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Product not found"
         )
-    return product
+    return fields.render(product)
 
 
 @router.put("/{product_id}", response_model=ProductSchema)
 async def update_product(
     product_id: int,
     product_update: ProductUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """Update a product"""
@@ -86,7 +102,7 @@ async def update_product(
 @router.delete("/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_product(
     product_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """Delete a product"""
@@ -3,18 +3,21 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import date
 from app.core.database import get_db
-from app.core.dependencies import get_current_user
-from app.models.user import User
+from app.core.dependencies import TokenUser, get_read_db, get_token_user
+from app.core.fields import FieldSelection, sparse_fields
 from app.models.routine_log import RoutineLog
 from app.schemas.routine_log import RoutineLog as RoutineLogSchema, RoutineLogCreate, RoutineLogUpdate
+from app.services.insights import schedule_insight_refresh
 
 router = APIRouter()
 
+routine_log_fields = sparse_fields(RoutineLogSchema, RoutineLog)
+
 
 @router.post("", response_model=RoutineLogSchema, status_code=status.HTTP_201_CREATED)
 async def create_routine_log(
     log_data: RoutineLogCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """Create a new routine log"""
@@ -31,11 +34,12 @@ async def get_routine_logs(
     limit: int = 100,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    fields: FieldSelection = Depends(routine_log_fields),
+    current_user: TokenUser = Depends(get_token_user),
+    db: Session = Depends(get_read_db)
 ):
     """Get routine logs for current user"""
-    query = db.query(RoutineLog).filter(RoutineLog.user_id == current_user.id)
+    query = db.query(RoutineLog).options(*fields.load_options()).filter(RoutineLog.user_id == current_user.id)
     
     if start_date:
         query = query.filter(RoutineLog.date >= start_date)
@@ -43,17 +47,18 @@ async def get_routine_logs(
         query = query.filter(RoutineLog.date <= end_date)
     
     logs = query.order_by(RoutineLog.date.desc()).offset(skip).limit(limit).all()
-    return logs
+    return fields.render(logs)
 
 
 @router.get("/{log_id}", response_model=RoutineLogSchema)
 async def get_routine_log(
     log_id: int,
-    current_user: User = Depends(get_current_user),
+    fields: FieldSelection = Depends(routine_log_fields),
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """Get a specific routine log"""
-    log = db.query(RoutineLog).filter(
+    log = db.query(RoutineLog).options(*fields.load_options()).filter(
         RoutineLog.id == log_id,
         RoutineLog.user_id == current_user.id
     ).first()
@@ -62,14 +67,14 @@ async def get_routine_log(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Routine log not found"
         )
-    return log
+    return fields.render(log)
 
 
 @router.put("/{log_id}", response_model=RoutineLogSchema)
 async def update_routine_log(
     log_id: int,
     log_update: RoutineLogUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """Update a routine log"""
@@ -89,13 +94,16 @@ async def update_routine_log(
     
     db.commit()
     db.refresh(log)
+    # A changed date can move a rated log onto different weather
+    if "date" in update_data:
+        schedule_insight_refresh(current_user.id)
     return log
 
 
 @router.delete("/{log_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_routine_log(
     log_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """Delete a routine log"""
@@ -111,4 +119,5 @@ async def delete_routine_log(
     
     db.delete(log)
     db.commit()
+    schedule_insight_refresh(current_user.id)
     return None
@@ -1,19 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.core.database import get_db
-from app.core.dependencies import get_current_user
-from app.models.user import User
+from app.core.dependencies import TokenUser, get_read_db, get_token_user
+from app.core.fields import FieldSelection, sparse_fields
+from app.core.pagination import decode_cursor, encode_cursor
 from app.models.routine import Routine
-from app.schemas.routine import Routine as RoutineSchema, RoutineCreate, RoutineUpdate
+from app.schemas.routine import Routine as RoutineSchema, RoutineCreate, RoutineUpdate, PublicRoutineFeed, SimilarRoutine
+from app.services.routine_feed import get_feed
+from app.services.routine_similarity import find_similar, similar_routines
 
 router = APIRouter()
 
+routine_fields = sparse_fields(RoutineSchema, Routine)
+
 
 @router.post("", response_model=RoutineSchema, status_code=status.HTTP_201_CREATED)
 async def create_routine(
     routine_data: RoutineCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """Create a new routine template"""
@@ -21,27 +27,57 @@ async def create_routine(
     db.add(db_routine)
     db.commit()
     db.refresh(db_routine)
+    similar_routines.update(db_routine)
     return db_routine
 
 
 @router.get("", response_model=List[RoutineSchema])
 async def get_routines(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    fields: FieldSelection = Depends(routine_fields),
+    current_user: TokenUser = Depends(get_token_user),
+    db: Session = Depends(get_read_db)
 ):
     """Get all routines for current user"""
-    routines = db.query(Routine).filter(Routine.user_id == current_user.id).all()
-    return routines
+    routines = db.query(Routine).options(*fields.load_options()).filter(Routine.user_id == current_user.id).all()
+    return fields.render(routines)
+
+
+@router.get("/public", response_model=PublicRoutineFeed)
+async def get_public_routines(
+    method_tag: Optional[str] = None,
+    drying_method: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    current_user: TokenUser = Depends(get_token_user),
+    db: Session = Depends(get_read_db)
+):
+    """Get the community feed of public routines, best rated first"""
+    after = tuple(decode_cursor(cursor, (float, int))) if cursor else None
+    rows = get_feed(db, limit + 1, after, method_tag, drying_method)
+    page = rows[:limit]
+    return {
+        "routines": [
+            {
+                **RoutineSchema.model_validate(routine).model_dump(),
+                "score": ranking.score,
+                "rating_count": ranking.rating_count,
+                "average_score": ranking.average_score
+            }
+            for routine, ranking in page
+        ],
+        "next_cursor": encode_cursor([page[-1][1].score, page[-1][1].routine_id]) if len(rows) > limit else None
+    }
 
 
 @router.get("/{routine_id}", response_model=RoutineSchema)
 async def get_routine(
     routine_id: int,
-    current_user: User = Depends(get_current_user),
+    fields: FieldSelection = Depends(routine_fields),
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """Get a specific routine"""
-    routine = db.query(Routine).filter(
+    routine = db.query(Routine).options(*fields.load_options()).filter(
         Routine.id == routine_id,
         Routine.user_id == current_user.id
     ).first()
@@ -50,14 +86,53 @@ async def get_routine(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Routine not found"
         )
-    return routine
+    return fields.render(routine)
+
+
+@router.get("/{routine_id}/similar", response_model=List[SimilarRoutine])
+async def get_similar_routines(
+    routine_id: int,
+    limit: int = Query(10, ge=1, le=50),
+    current_user: TokenUser = Depends(get_token_user),
+    db: Session = Depends(get_read_db)
+):
+    """Get public routines with the most similar steps, products and methods"""
+    routine = db.query(Routine).filter(
+        Routine.id == routine_id,
+        or_(Routine.user_id == current_user.id, Routine.is_public.is_(True))
+    ).first()
+    if not routine:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Routine not found"
+        )
+
+    matches = find_similar(routine, limit)
+    if matches is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Similar routines are still being indexed, please retry shortly",
+            headers={"Retry-After": "5"}
+        )
+    # The index can lag other workers by a refresh; drop routines no longer public
+    found = {
+        r.id: r for r in db.query(Routine).filter(
+            Routine.id.in_([match_id for match_id, _ in matches]),
+            Routine.is_public.is_(True)
+        )
+    } if matches else {}
+    return [
+        {**RoutineSchema.model_validate(found[match_id]).model_dump(), "similarity": round(similarity, 4)}
+        for match_id, similarity in matches
+        if match_id in found
+    ]
 
 
 @router.put("/{routine_id}", response_model=RoutineSchema)
 async def update_routine(
     routine_id: int,
     routine_update: RoutineUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """Update a routine"""
@@ -77,13 +152,14 @@ async def update_routine(
     
     db.commit()
     db.refresh(routine)
+    similar_routines.update(routine)
     return routine
 
 
 @router.delete("/{routine_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_routine(
     routine_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """Delete a routine"""
@@ -99,4 +175,5 @@ async def delete_routine(
     
     db.delete(routine)
     db.commit()
+    similar_routines.remove(routine_id)
     return None
@@ -0,0 +1,99 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import Float, cast, func, literal, select, tuple_, union_all
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.core.dependencies import TokenUser, get_read_db, get_token_user
+from app.core.pagination import decode_cursor, encode_cursor
+from app.models.outcome import Outcome
+from app.models.product import Product
+from app.models.routine import Routine
+from app.models.routine_log import RoutineLog
+
+router = APIRouter()
+
+SEARCH_CONFIG = "english"
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=20, MinWords=5"
+SEARCH_TYPES = ("routine_log", "outcome", "product", "routine")
+
+
+def _sources(user_id: int, query):
+    """One SELECT per searchable type: (type, id, text to highlight, rank), scoped to the user"""
+    def matching(kind, id_column, vector, body):
+        return select(
+            literal(kind).label("type"),
+            id_column.label("id"),
+            body.label("body"),
+            cast(func.ts_rank_cd(vector, query), Float).label("rank")
+        ).where(vector.op("@@")(query))
+
+    return {
+        "routine_log": matching(
+            "routine_log", RoutineLog.id, RoutineLog.search_vector, RoutineLog.notes
+        ).where(RoutineLog.user_id == user_id),
+        "outcome": matching(
+            "outcome", Outcome.id, Outcome.search_vector, Outcome.notes
+        ).join(RoutineLog, Outcome.routine_log_id == RoutineLog.id).where(RoutineLog.user_id == user_id),
+        "product": matching(
+            "product", Product.id, Product.search_vector,
+            func.concat_ws(" — ", Product.brand, Product.name, Product.notes)
+        ).where(Product.user_id == user_id),
+        "routine": matching(
+            "routine", Routine.id, Routine.search_vector, Routine.name
+        ).where(Routine.user_id == user_id),
+    }
+
+
+@router.get("")
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    types: Optional[str] = Query(None, description="Comma-separated subset of: " + ", ".join(SEARCH_TYPES)),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    current_user: TokenUser = Depends(get_token_user),
+    db: Session = Depends(get_read_db)
+):
+    """Full-text search across your routine logs, outcomes, products and routines"""
+    selected = SEARCH_TYPES
+    if types:
+        selected = tuple(t.strip() for t in types.split(",") if t.strip())
+        unknown = set(selected) - set(SEARCH_TYPES)
+        if unknown or not selected:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown search types: {', '.join(sorted(unknown)) or '(none)'}"
+            )
+
+    query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    sources = _sources(current_user.id, query)
+    matches = union_all(*(sources[kind] for kind in selected)).subquery("matches")
+
+    # Keyset pagination on (rank, type, id), all descending
+    page = select(matches)
+    if cursor:
+        rank, kind, row_id = decode_cursor(cursor, (float, str, int))
+        page = page.where(
+            tuple_(matches.c.rank, matches.c.type, matches.c.id) < tuple_(literal(rank, Float), kind, row_id)
+        )
+    page = page.order_by(
+        matches.c.rank.desc(), matches.c.type.desc(), matches.c.id.desc()
+    ).limit(limit + 1).subquery("page")
+
+    # Headlines are costly, so only build them for the rows on this page
+    rows = db.execute(
+        select(
+            page.c.type,
+            page.c.id,
+            page.c.rank,
+            func.ts_headline(SEARCH_CONFIG, func.coalesce(page.c.body, ""), query, HEADLINE_OPTIONS).label("headline")
+        ).order_by(page.c.rank.desc(), page.c.type.desc(), page.c.id.desc())
+    ).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return {
+        "results": [
+            {"type": row.type, "id": row.id, "rank": row.rank, "headline": row.headline}
+            for row in rows
+        ],
+        "next_cursor": encode_cursor([rows[-1].rank, rows[-1].type, rows[-1].id]) if has_more else None
+    }
@@ -0,0 +1,32 @@
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.core.database import get_db
+from app.core.dependencies import get_current_user
+from app.core.pagination import decode_cursor, encode_cursor
+from app.models.user import User
+from app.services.sync import changes_since, next_cursor, oldest_cursor
+
+router = APIRouter()
+
+
+@router.get("")
+async def sync(
+    cursor: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    # Primary only: a lagging replica could hand out a cursor past changes it has not replayed yet
+    db: Session = Depends(get_db)
+):
+    """Everything created, updated or deleted since `cursor`; omit it for a full sync"""
+    now = db.execute(select(func.now())).scalar()
+    since = decode_cursor(cursor, (datetime.fromisoformat,))[0] if cursor else None
+    if since is not None and since < oldest_cursor(now):
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Sync cursor has expired; sync again without a cursor"
+        )
+    
+    result = changes_since(db, current_user, since)
+    return {"cursor": encode_cursor([next_cursor(now).isoformat()]), **result}
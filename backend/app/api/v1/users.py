@@ -1,7 +1,9 @@
+from datetime import datetime, timezone
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
+from app.core.token_revocation import revoke_user_tokens
 from app.models.user import User
 from app.schemas.user import User as UserSchema, UserUpdate, UserProfile
 
@@ -44,3 +46,17 @@ async def update_user_profile(
     db.commit()
     db.refresh(current_user)
     return current_user
+
+
+@router.delete("/me", status_code=status.HTTP_202_ACCEPTED)
+async def delete_current_user(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Delete the account; its data is removed by a background job shortly after"""
+    now = datetime.now(timezone.utc)
+    current_user.deletion_requested_at = now
+    current_user.tokens_valid_after = now
+    db.commit()
+    revoke_user_tokens(current_user.id, now)
+    return {"detail": "Account deletion scheduled"}
@@ -1,25 +1,92 @@
-from sqlalchemy import create_engine
+import logging
+
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
 
 from app.core.config import settings
-
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
+from app.core.pool_stats import (
+    InstrumentedNullPool, InstrumentedQueuePool, PoolStats, attach_pool_listeners, instrumented, pool_stats
 )
+from app.core.write_tracker import mark_user_write, user_wrote_recently
+
+logger = logging.getLogger(__name__)
+
+
+def pool_options(stats: PoolStats) -> dict:
+    """create_engine pool arguments for this worker, derived from settings; checkouts are recorded in `stats`"""
+    if settings.DB_PGBOUNCER_TRANSACTION_MODE:
+        # PgBouncer owns the pool; holding connections here would pin server
+        # connections and break transaction-level multiplexing
+        return {"poolclass": instrumented(InstrumentedNullPool, stats), "pool_pre_ping": False}
+
+    pool_size = settings.DB_POOL_SIZE
+    max_overflow = settings.DB_MAX_OVERFLOW
+    if settings.DB_MAX_CONNECTIONS:
+        per_worker = max(settings.DB_MAX_CONNECTIONS // max(settings.WEB_CONCURRENCY, 1), 1)
+        if pool_size + max_overflow > per_worker:
+            logger.warning(
+                "Capping pool to %s connections per worker (DB_MAX_CONNECTIONS=%s, WEB_CONCURRENCY=%s)",
+                per_worker, settings.DB_MAX_CONNECTIONS, settings.WEB_CONCURRENCY,
+            )
+            pool_size = min(pool_size, per_worker)
+            max_overflow = per_worker - pool_size
+
+    return {
+        "poolclass": instrumented(InstrumentedQueuePool, stats),
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+engine = create_engine(settings.DATABASE_URL, **pool_options(pool_stats["primary"]))
+attach_pool_listeners(engine.pool, pool_stats["primary"])
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Read-only traffic goes to the replica when one is configured, else the primary
+replica_engine = (
+    create_engine(settings.DATABASE_REPLICA_URL, **pool_options(pool_stats["replica"]))
+    if settings.DATABASE_REPLICA_URL else None
+)
+if replica_engine is not None:
+    attach_pool_listeners(replica_engine.pool, pool_stats["replica"])
+ReadSessionLocal = (
+    sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+    if replica_engine is not None else SessionLocal
+)
+
 Base = declarative_base()
 
 
-def get_db():
+@event.listens_for(SessionLocal, "after_commit")
+def _remember_user_write(session):
+    """Pin the committing user's reads to the primary until the replica catches up"""
+    user_id = session.info.get("user_id")
+    if user_id is not None and replica_engine is not None:
+        mark_user_write(user_id)
+
+
+def get_db(request: Request):
     """Dependency for getting database session"""
+    shared = request.scope.get("batch_session")
+    if shared is not None:
+        # Sub-request of /batch: reuse the batch's session (closed by /batch)
+        yield shared
+        return
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+def get_read_session(user_id: int):
+    """Read-only session for a user: the replica, unless they wrote recently"""
+    if replica_engine is not None and not user_wrote_recently(user_id):
+        return ReadSessionLocal()
+    return SessionLocal()
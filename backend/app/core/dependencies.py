@@ -1,46 +1,141 @@
-from fastapi import Depends, HTTPException, status
+from dataclasses import dataclass
+from typing import Tuple, Union
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_db, get_read_session
 from app.core.security import decode_token
+from app.core.token_revocation import RevocationListUnavailable, is_token_revoked
 from app.models.user import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
-    """Get the current authenticated user"""
-    credentials_exception = HTTPException(
+@dataclass
+class TokenUser:
+    """The authenticated user as described by a verified access token"""
+    id: int
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
+
+
+def verify_access_token(token: str, require_shared_revocations: bool = False) -> Tuple[dict, int]:
+    """Decode an access token and return its payload and user id.
+
+    With `require_shared_revocations`, raises RevocationListUnavailable when
+    Redis cannot be checked (see is_token_revoked).
+    """
     if not token:
-        raise credentials_exception
+        raise _credentials_exception()
     
     payload = decode_token(token)
     if payload is None:
-        raise credentials_exception
+        raise _credentials_exception()
     
     if payload.get("type") != "access":
-        raise credentials_exception
+        raise _credentials_exception()
     
     user_id = payload.get("sub")
     if user_id is None:
-        raise credentials_exception
+        raise _credentials_exception()
     
     # Convert user_id to integer (JWT stores it as string)
     try:
         user_id = int(user_id)
     except (ValueError, TypeError):
-        raise credentials_exception
+        raise _credentials_exception()
+    
+    if is_token_revoked(payload, user_id, require_shared=require_shared_revocations):
+        raise _credentials_exception()
+    
+    return payload, user_id
+
+
+def load_token_user(db: Session, token: str) -> User:
+    """Verify an access token and load its user row with `db`"""
+    payload, user_id = verify_access_token(token)
     
     user = db.query(User).filter(User.id == user_id).first()
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
     
+    if user.tokens_valid_after and payload.get("iat", 0) < user.tokens_valid_after.timestamp():
+        raise _credentials_exception()
+    
+    # Lets commits on this request's session be attributed to the user
+    db.info["user_id"] = user.id
     return user
+
+
+async def get_current_user(
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> User:
+    """Get the current authenticated user (loads the full user row)"""
+    batch_user = request.scope.get("batch_user")
+    if batch_user is not None:
+        # Already authenticated once by /batch
+        return batch_user
+    return load_token_user(db, token)
+
+
+async def get_token_user(
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> Union[TokenUser, User]:
+    """Get the current user for handlers that only need the user id.
+
+    With AUTH_STATELESS_TOKENS the token's claims and the revocation list are
+    trusted and the users table is not queried; otherwise, or while Redis is
+    unavailable, this is the same as get_current_user.
+    """
+    if request.scope.get("batch_user") is not None or not settings.AUTH_STATELESS_TOKENS:
+        return await get_current_user(request, token, db)
+    
+    try:
+        _, user_id = verify_access_token(token, require_shared_revocations=True)
+    except RevocationListUnavailable:
+        # Password changes and account deletions from other processes are then
+        # only visible in users.tokens_valid_after, so check the row after all
+        return await get_current_user(request, token, db)
+    # The session has not touched the database; this only tags its commits
+    db.info["user_id"] = user_id
+    return TokenUser(id=user_id)
+
+
+def get_read_db(request: Request, current_user: TokenUser = Depends(get_token_user)):
+    """Dependency for a read-only session (replica when configured).
+
+    Users who wrote within READ_YOUR_WRITES_SECONDS are served from the
+    primary so they always see their own changes.
+    """
+    shared = request.scope.get("batch_read_session")
+    if shared is not None:
+        yield shared
+        return
+    db = get_read_session(current_user.id)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_current_admin_user(
+    current_user: User = Depends(get_current_user)
+) -> User:
+    """Get the current user, requiring an admin account"""
+    if current_user.email not in settings.ADMIN_EMAILS:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    return current_user
@@ -0,0 +1,65 @@
+from typing import Any, Callable, Dict, List, Optional, Sequence, Type
+
+from fastapi import HTTPException, Query, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only
+
+
+class FieldSelection:
+    """The fields a client asked for with `fields=`, or None for the full schema"""
+
+    def __init__(self, model, names: Optional[List[str]], requires: Optional[Dict[str, List[str]]] = None):
+        self.model = model
+        self.names = names
+        self.requires = requires or {}
+
+    def load_options(self) -> list:
+        """Query options that SELECT only the requested columns"""
+        if self.names is None:
+            return []
+        columns = inspect(self.model).column_attrs.keys()
+        needed = [column for name in self.names for column in self.requires.get(name, [name])]
+        return [load_only(*(getattr(self.model, name) for name in dict.fromkeys(needed) if name in columns))]
+
+    def render(self, result: Any) -> Any:
+        """Pass full results through to the response_model; narrow sparse ones to a dict per row"""
+        if self.names is None:
+            return result
+        if isinstance(result, Sequence):
+            return JSONResponse(jsonable_encoder([self._pick(row) for row in result]))
+        return JSONResponse(jsonable_encoder(self._pick(result)))
+
+    def _pick(self, row) -> dict:
+        return {name: getattr(row, name) for name in self.names}
+
+
+def sparse_fields(
+    schema: Type[BaseModel], model, requires: Optional[Dict[str, List[str]]] = None
+) -> Callable[..., FieldSelection]:
+    """Dependency parsing a comma-separated `fields=` against `schema`; id is always included.
+
+    `requires` maps schema fields that are not columns (e.g. properties) to
+    the columns they are computed from.
+    """
+    allowed = list(schema.model_fields)
+
+    def dependency(
+        fields: Optional[str] = Query(None, description="Comma-separated subset of: " + ", ".join(allowed))
+    ) -> FieldSelection:
+        if not fields:
+            return FieldSelection(model, None, requires)
+        names = [name.strip() for name in fields.split(",") if name.strip()]
+        unknown = [name for name in names if name not in schema.model_fields]
+        if unknown or not names:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(unknown) or '(none)'}"
+            )
+        if "id" in schema.model_fields and "id" not in names:
+            names.insert(0, "id")
+        return FieldSelection(model, list(dict.fromkeys(names)), requires)
+
+    return dependency
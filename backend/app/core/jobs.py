@@ -0,0 +1,121 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class DebouncedJobQueue:
+    """Runs `job(key)` on a background thread once a key has gone quiet.
+
+    Each schedule() pushes the key's run time back by `delay` seconds, but never
+    past `max_delay` after its first pending schedule, so a steady stream of
+    writes still gets refreshed. Queues are per process; jobs must be idempotent.
+    """
+
+    def __init__(self, name: str, job: Callable[[Hashable], None], delay: float, max_delay: float):
+        self.name = name
+        self.job = job
+        self.delay = delay
+        self.max_delay = max_delay
+        self._pending: Dict[Hashable, Tuple[float, float]] = {}  # key -> (due, first scheduled)
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    def schedule(self, key: Hashable) -> None:
+        now = time.monotonic()
+        with self._condition:
+            _, first = self._pending.get(key, (None, now))
+            self._pending[key] = (min(now + self.delay, first + self.max_delay), first)
+            self._condition.notify()
+
+    def start(self) -> None:
+        with self._condition:
+            if self._thread is not None:
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name=f"jobs-{self.name}", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Run whatever is still pending, then stop the thread"""
+        with self._condition:
+            thread, self._thread = self._thread, None
+            self._stopping = True
+            self._condition.notify()
+        if thread is not None:
+            thread.join(timeout)
+
+    def run_pending(self) -> int:
+        """Run every pending key now, on the calling thread; returns how many ran"""
+        with self._condition:
+            keys = list(self._pending)
+            self._pending.clear()
+        for key in keys:
+            self._run_job(key)
+        return len(keys)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._stopping:
+                    now = time.monotonic()
+                    due = [key for key, (at, _) in self._pending.items() if at <= now]
+                    if due:
+                        break
+                    next_at = min((at for at, _ in self._pending.values()), default=None)
+                    self._condition.wait(None if next_at is None else next_at - now)
+                if self._stopping:
+                    break
+                for key in due:
+                    del self._pending[key]
+            for key in due:
+                self._run_job(key)
+        self.run_pending()
+
+    def _run_job(self, key: Hashable) -> None:
+        try:
+            self.job(key)
+        except Exception:
+            logger.exception("%s job failed for %r", self.name, key)
+
+
+class PeriodicJob:
+    """Runs `job()` on a background thread every `interval` seconds.
+
+    Every worker runs its own copy, so jobs must coordinate through the
+    database (e.g. an advisory lock plus a last-run timestamp) if they should
+    only happen once per interval across a deployment.
+    """
+
+    def __init__(self, name: str, job: Callable[[], None], interval: float, initial_delay: Optional[float] = None):
+        self.name = name
+        self.job = job
+        self.interval = interval
+        self.initial_delay = interval if initial_delay is None else initial_delay
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None or self.interval <= 0:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name=f"jobs-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        thread, self._thread = self._thread, None
+        self._stop_event.set()
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self) -> None:
+        delay = self.initial_delay
+        while not self._stop_event.wait(delay):
+            delay = self.interval
+            try:
+                self.job()
+            except Exception:
+                logger.exception("%s job failed", self.name)
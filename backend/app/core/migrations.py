@@ -0,0 +1,52 @@
+from pathlib import Path
+from typing import Optional, Set
+
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import ProgrammingError
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+
+class SchemaVersionMismatch(RuntimeError):
+    """Raised at startup when the database is not at the expected migration"""
+
+
+def get_head_revisions() -> Set[str]:
+    """Head revision(s) of the migration scripts shipped with this code"""
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(ALEMBIC_INI.parent / "alembic"))
+    return set(ScriptDirectory.from_config(config).get_heads())
+
+
+def get_database_revisions(engine: Engine) -> Optional[Set[str]]:
+    """Revision(s) recorded in alembic_version, or None if never migrated"""
+    try:
+        with engine.connect() as conn:
+            rows = conn.execute(text("SELECT version_num FROM alembic_version")).fetchall()
+    except ProgrammingError:
+        return None
+    return {row[0] for row in rows}
+
+
+def check_schema_version(engine: Engine) -> None:
+    """Fail fast unless the database schema is at the code's head revision.
+
+    This is a single-row read, so every worker can run it on boot without
+    reflecting tables or racing on DDL. Schema changes are applied once per
+    deploy with `alembic upgrade head`.
+    """
+    expected = get_head_revisions()
+    current = get_database_revisions(engine)
+    if current is None:
+        raise SchemaVersionMismatch(
+            "Database has no alembic_version table. Run `alembic upgrade head` "
+            "(or `alembic stamp 0001` for a database created before migrations)."
+        )
+    if current != expected:
+        raise SchemaVersionMismatch(
+            f"Database schema is at {sorted(current)} but this code expects {sorted(expected)}. "
+            "Run `alembic upgrade head` before starting the API."
+        )
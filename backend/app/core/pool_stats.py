@@ -0,0 +1,118 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Type
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import NullPool, Pool, QueuePool
+
+# Upper bounds (ms) of the checkout wait histogram buckets; the last bucket is open-ended
+WAIT_BUCKETS_MS: List[float] = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+
+class PoolStats:
+    """Per-process counters for connection pool checkouts"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.connects = 0
+            self.invalidations = 0
+            self.total_wait_ms = 0.0
+            self.max_wait_ms = 0.0
+            self.buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+
+    def observe_wait(self, wait_ms: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+            self.buckets[bisect_left(WAIT_BUCKETS_MS, wait_ms)] += 1
+
+    def count_connect(self) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def count_invalidation(self) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            observed = self.checkouts + self.timeouts
+            labels = [f"le_{int(b)}ms" for b in WAIT_BUCKETS_MS] + ["gt_5000ms"]
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "connections_opened": self.connects,
+                "invalidations": self.invalidations,
+                "wait_ms": {
+                    "mean": round(self.total_wait_ms / observed, 3) if observed else None,
+                    "max": round(self.max_wait_ms, 3),
+                    "histogram": dict(zip(labels, self.buckets)),
+                },
+            }
+
+
+# One set of counters per engine, so replica waits never mix into the primary's
+pool_stats: Dict[str, PoolStats] = {"primary": PoolStats(), "replica": PoolStats()}
+
+
+class _TimedCheckoutMixin:
+    """Records how long each checkout waited for a connection"""
+
+    stats: PoolStats
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.stats.observe_wait((time.perf_counter() - started) * 1000, timed_out=True)
+            raise
+        self.stats.observe_wait((time.perf_counter() - started) * 1000)
+        return connection
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class InstrumentedNullPool(_TimedCheckoutMixin, NullPool):
+    pass
+
+
+def instrumented(pool_class: Type[Pool], stats: PoolStats) -> Type[Pool]:
+    """An Instrumented*Pool class recording into `stats`; a class attribute survives pool.recreate()"""
+    return type(pool_class.__name__, (pool_class,), {"stats": stats})
+
+
+def attach_pool_listeners(pool: Pool, stats: PoolStats) -> None:
+    """Count physical connects and invalidations for any pool class"""
+    event.listen(pool, "connect", lambda *args: stats.count_connect())
+    event.listen(pool, "invalidate", lambda *args: stats.count_invalidation())
+
+
+def describe_pool(pool: Pool, stats: PoolStats) -> Dict:
+    """Live pool occupancy plus the accumulated checkout statistics"""
+    state = {"pid": os.getpid(), "pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        state.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "max_overflow": pool._max_overflow,
+            "timeout": pool.timeout(),
+        })
+    state.update(stats.snapshot())
+    return state
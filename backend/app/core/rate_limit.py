@@ -0,0 +1,239 @@
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import redis
+from fastapi import status
+from jose import JWTError, jwt
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from app.core.config import settings
+from app.core.redis_client import get_redis, mark_redis_unavailable
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+# Atomic token bucket: KEYS[1] bucket hash; ARGV rate/s, capacity, now (s)
+# Returns {allowed (0/1), seconds until a token is available (as string)}
+_TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local wait = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+  allowed = 1
+else
+  wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(wait)}
+"""
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    scope: str  # "ip" or "user"
+    capacity: int  # burst size, i.e. N in "N/period"
+    rate: float  # tokens refilled per second
+
+    @classmethod
+    def parse(cls, spec: str) -> "RateLimitRule":
+        """Parse "user:10/minute" style specs"""
+        scope, _, limit = spec.strip().partition(":")
+        count, _, period = limit.partition("/")
+        if scope not in ("ip", "user") or period not in PERIODS:
+            raise ValueError(f"Invalid rate limit spec: {spec!r}")
+        return cls(scope=scope, capacity=int(count), rate=int(count) / PERIODS[period])
+
+
+def parse_rules(config: Dict[str, str]) -> Dict[str, List[RateLimitRule]]:
+    return {
+        route: [RateLimitRule.parse(spec) for spec in specs.split(";") if spec.strip()]
+        for route, specs in config.items()
+    }
+
+
+class InMemoryTokenBuckets:
+    """Per-process token buckets, used when Redis is unavailable.
+
+    Past MAX_BUCKETS keys, buckets that have refilled completely are dropped
+    (the same as never having been used), then those closest to full, so
+    minting new keys cannot reset the limits of clients that are drained.
+    """
+
+    MAX_BUCKETS = 50000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, Tuple[float, float, float]] = {}  # key -> (tokens, ts, full again at)
+
+    def take(self, key: str, rule: RateLimitRule) -> Tuple[bool, float]:
+        now = time.monotonic()
+        with self._lock:
+            tokens, ts, _ = self._buckets.get(key, (float(rule.capacity), now, now))
+            tokens = min(rule.capacity, tokens + (now - ts) * rule.rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now, now + (rule.capacity - tokens) / rule.rate)
+            if len(self._buckets) > self.MAX_BUCKETS:
+                self._evict(now)
+            return (True, 0.0) if allowed else (False, (1 - tokens) / rule.rate)
+
+    def _evict(self, now: float) -> None:
+        for key in [key for key, (_, _, full_at) in self._buckets.items() if full_at <= now]:
+            del self._buckets[key]
+        excess = len(self._buckets) - self.MAX_BUCKETS * 9 // 10  # headroom, so sweeps stay rare
+        if excess > 0:
+            for key in sorted(self._buckets, key=lambda key: self._buckets[key][2])[:excess]:
+                del self._buckets[key]
+
+
+class ConcurrencyLimiter:
+    """Per-process cap on in-flight requests for a route"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self.in_flight >= self.limit:
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+
+class RateLimiter:
+    """Token buckets for the RATE_LIMITS rules, in Redis when available.
+
+    Shared by RateLimitMiddleware and /batch, which charges each of its
+    sub-requests as if it had been sent on its own.
+    """
+
+    def __init__(self):
+        self.rules = parse_rules(settings.RATE_LIMITS)
+        self.memory = InMemoryTokenBuckets()
+        self._script = None
+
+    def check(self, request: Request, method: str, path: str) -> Optional[JSONResponse]:
+        """Take a token for `method path` from the caller's buckets; a 429 response when one is empty"""
+        route = f"{method} {path.rstrip('/') or '/'}"
+        rules = [(route, rule) for rule in self.rules.get(route, [])]
+        if path.startswith("/api/"):
+            rules += [("*", rule) for rule in self.rules.get("*", [])]
+        if not rules:
+            return None
+        user_id = self._user_id(request)
+        for rule_route, rule in rules:
+            subject = user_id if rule.scope == "user" else self._client_ip(request)
+            if subject is None:
+                continue
+            allowed, retry_after = self._take(f"{rule_route}:{rule.scope}:{subject}", rule)
+            if not allowed:
+                return reject(status.HTTP_429_TOO_MANY_REQUESTS, "Rate limit exceeded", retry_after)
+        return None
+
+    def _take(self, key: str, rule: RateLimitRule) -> Tuple[bool, float]:
+        client = get_redis()
+        if client is not None:
+            try:
+                if self._script is None:
+                    self._script = client.register_script(_TOKEN_BUCKET_LUA)
+                allowed, wait = self._script(
+                    keys=[f"curliq:ratelimit:{key}"], args=[rule.rate, rule.capacity, time.time()]
+                )
+                return bool(int(allowed)), float(wait)
+            except redis.RedisError:
+                mark_redis_unavailable()
+        return self.memory.take(key, rule)
+
+    @staticmethod
+    def _user_id(request: Request) -> Optional[str]:
+        """User id from a valid bearer token; signature checked, revocation is not"""
+        header = request.headers.get("authorization", "")
+        if not header.lower().startswith("bearer "):
+            return None
+        try:
+            payload = jwt.decode(header[7:], settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        except JWTError:
+            return None
+        return payload.get("sub")
+
+    @staticmethod
+    def _client_ip(request: Request) -> Optional[str]:
+        if settings.RATE_LIMIT_TRUST_FORWARDED_FOR:
+            forwarded = request.headers.get("x-forwarded-for")
+            if forwarded:
+                return forwarded.split(",")[0].strip()
+        return request.client.host if request.client else None
+
+
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """This process's RateLimiter, created on first use"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter()
+    return _rate_limiter
+
+
+def reject(status_code: int, detail: str, retry_after: float) -> JSONResponse:
+    return JSONResponse(
+        status_code=status_code,
+        content={"detail": detail},
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+class RateLimitMiddleware(BaseHTTPMiddleware):
+    """Token-bucket rate limits per user/IP plus per-route concurrency caps.
+
+    Routes are matched as "METHOD /path"; "*" applies to every /api/ request.
+    Over-limit requests get 429, saturated routes get 503, both with
+    Retry-After, before any handler or database work runs.
+    """
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.limiter = get_rate_limiter()
+        self.concurrency = {
+            route: ConcurrencyLimiter(limit) for route, limit in settings.CONCURRENCY_LIMITS.items()
+        }
+
+    async def dispatch(self, request: Request, call_next):
+        if not settings.RATE_LIMIT_ENABLED or request.method == "OPTIONS":
+            return await call_next(request)
+
+        rejected = self.limiter.check(request, request.method, request.url.path)
+        if rejected is not None:
+            return rejected
+
+        limiter = self.concurrency.get(f"{request.method} {request.url.path.rstrip('/') or '/'}")
+        if limiter is None:
+            return await call_next(request)
+        if not limiter.try_acquire():
+            return reject(
+                status.HTTP_503_SERVICE_UNAVAILABLE, "Server busy, please retry", settings.CONCURRENCY_RETRY_AFTER
+            )
+        try:
+            return await call_next(request)
+        finally:
+            limiter.release()
@@ -0,0 +1,33 @@
+import time
+from typing import Optional
+
+import redis
+
+from app.core.config import settings
+
+# After a Redis failure, callers use their in-process fallback for this long
+REDIS_RETRY_SECONDS = 30.0
+
+_client: Optional[redis.Redis] = None
+_retry_after = 0.0
+
+
+def get_redis() -> Optional[redis.Redis]:
+    """Shared Redis client, or None when Redis is not configured or recently failed.
+
+    Callers must treat Redis as optional: catch redis.RedisError, call
+    mark_redis_unavailable() and fall back to per-process state.
+    """
+    global _client
+    if not settings.REDIS_URL or time.monotonic() < _retry_after:
+        return None
+    if _client is None:
+        _client = redis.Redis.from_url(
+            settings.REDIS_URL, socket_timeout=0.1, socket_connect_timeout=0.1
+        )
+    return _client
+
+
+def mark_redis_unavailable() -> None:
+    global _retry_after
+    _retry_after = time.monotonic() + REDIS_RETRY_SECONDS
@@ -0,0 +1,39 @@
+"""Copying files to an archive location: a local directory or s3://bucket/prefix.
+
+S3-compatible stores (MinIO, Ceph, R2, ...) are reached by setting
+AWS_S3_ENDPOINT_URL. Credentials are the AWS_* settings, or boto3's usual
+lookup (environment, instance profile) when those are empty.
+"""
+
+import shutil
+from pathlib import Path
+from urllib.parse import urlparse
+
+from app.core.config import settings
+
+
+def store_file(path: Path, url: str, key: str) -> str:
+    """Copy a local file to `key` under `url`; returns where it was stored"""
+    if url.startswith("s3://"):
+        return _store_s3(path, url, key)
+    target = Path(url) / key
+    target.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(path, target)
+    return str(target)
+
+
+def _store_s3(path: Path, url: str, key: str) -> str:
+    # boto3 is slow to import, and only S3 archives need it
+    import boto3
+
+    parsed = urlparse(url)
+    object_key = "/".join(part for part in (parsed.path.strip("/"), key) if part)
+    client = boto3.client(
+        "s3",
+        endpoint_url=settings.AWS_S3_ENDPOINT_URL or None,
+        region_name=settings.AWS_REGION,
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID or None,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY or None,
+    )
+    client.upload_file(str(path), parsed.netloc, object_key)
+    return f"s3://{parsed.netloc}/{object_key}"
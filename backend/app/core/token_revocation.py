@@ -0,0 +1,100 @@
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+import redis
+
+from app.core.config import settings
+from app.core.redis_client import get_redis, mark_redis_unavailable
+
+_REVOKED_KEY = "curliq:revoked-token:{jti}"
+_VALID_AFTER_KEY = "curliq:tokens-valid-after:{user_id}"
+
+# In-process fallback used when Redis is not reachable. It only covers the
+# worker that recorded the revocation, so multi-worker deployments need Redis.
+_lock = threading.Lock()
+_revoked: Dict[str, float] = {}  # jti -> unix expiry
+_valid_after: Dict[int, float] = {}  # user_id -> unix timestamp
+
+
+class RevocationListUnavailable(Exception):
+    """Redis could not be consulted, so revocations made in other processes are unknown"""
+
+
+def _max_token_lifetime() -> int:
+    return max(settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60, settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400)
+
+
+def revoke_token(jti: str, expires_at: float) -> None:
+    """Revoke a single token (logout) until it would have expired anyway"""
+    ttl = max(int(expires_at - time.time()), 1)
+    with _lock:
+        _revoked[jti] = expires_at
+    client = get_redis()
+    if client is not None:
+        try:
+            client.set(_REVOKED_KEY.format(jti=jti), 1, ex=ttl)
+        except redis.RedisError:
+            mark_redis_unavailable()
+
+
+def revoke_user_tokens(user_id: int, before: Optional[datetime] = None) -> None:
+    """Revoke every token a user was issued before `before` (default: now).
+
+    Used for password changes and account deletion.
+    """
+    cutoff = (before or datetime.now(timezone.utc)).timestamp()
+    with _lock:
+        _valid_after[user_id] = cutoff
+    client = get_redis()
+    if client is not None:
+        try:
+            client.set(_VALID_AFTER_KEY.format(user_id=user_id), cutoff, ex=_max_token_lifetime())
+        except redis.RedisError:
+            mark_redis_unavailable()
+
+
+def is_token_revoked(payload: dict, user_id: int, require_shared: bool = False) -> bool:
+    """Whether a decoded token was logged out or issued before a revocation cutoff.
+
+    Without Redis only this process's revocations are known; with
+    `require_shared` that raises RevocationListUnavailable instead of
+    answering from them alone.
+    """
+    jti = payload.get("jti")
+    issued_at = payload.get("iat")
+    now = time.time()
+
+    with _lock:
+        if jti and _revoked.get(jti, 0.0) > now:
+            return True
+        cutoff = _valid_after.get(user_id)
+        if cutoff is not None and (issued_at is None or issued_at < cutoff):
+            return True
+        if len(_revoked) > 10000:
+            for expired in [key for key, exp in _revoked.items() if exp <= now]:
+                del _revoked[expired]
+
+    client = get_redis()
+    if client is None:
+        if require_shared:
+            raise RevocationListUnavailable()
+        return False
+    try:
+        pipe = client.pipeline(transaction=False)
+        pipe.get(_VALID_AFTER_KEY.format(user_id=user_id))
+        if jti:
+            pipe.exists(_REVOKED_KEY.format(jti=jti))
+        results = pipe.execute()
+    except redis.RedisError:
+        mark_redis_unavailable()
+        if require_shared:
+            raise RevocationListUnavailable()
+        return False
+    cutoff = results[0]
+    if jti and results[1]:
+        return True
+    if cutoff is not None and (issued_at is None or issued_at < float(cutoff)):
+        return True
+    return False
@@ -0,0 +1,46 @@
+import threading
+import time
+from typing import Dict
+
+import redis
+
+from app.core.config import settings
+from app.core.redis_client import get_redis, mark_redis_unavailable
+
+_KEY = "curliq:recent-write:{user_id}"
+
+_lock = threading.Lock()
+_recent_writes: Dict[int, float] = {}  # user_id -> monotonic expiry
+
+
+def mark_user_write(user_id: int) -> None:
+    """Record that a user just committed a write"""
+    window = settings.READ_YOUR_WRITES_SECONDS
+    with _lock:
+        _recent_writes[user_id] = time.monotonic() + window
+        if len(_recent_writes) > 10000:
+            now = time.monotonic()
+            for uid in [uid for uid, expiry in _recent_writes.items() if expiry < now]:
+                del _recent_writes[uid]
+
+    client = get_redis()
+    if client is not None:
+        try:
+            client.set(_KEY.format(user_id=user_id), 1, ex=window)
+        except redis.RedisError:
+            mark_redis_unavailable()
+
+
+def user_wrote_recently(user_id: int) -> bool:
+    """Whether the user wrote within the read-your-writes window, on any worker"""
+    with _lock:
+        if _recent_writes.get(user_id, 0.0) > time.monotonic():
+            return True
+
+    client = get_redis()
+    if client is not None:
+        try:
+            return bool(client.exists(_KEY.format(user_id=user_id)))
+        except redis.RedisError:
+            mark_redis_unavailable()
+    return False
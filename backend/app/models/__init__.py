@@ -4,5 +4,11 @@ from app.models.routine import Routine
 from app.models.routine_log import RoutineLog
 from app.models.outcome import Outcome
 from app.models.weather import WeatherData
+from app.models.location import Location, GeocodeCache
+from app.models.insight import Insight
+from app.models.view_refresh import ViewRefresh
+from app.models.routine_ranking import RoutineRanking
+from app.models.model_artifact import ModelArtifact
+from app.models.tombstone import Tombstone
 
-__all__ = ["User", "Product", "Routine", "RoutineLog", "Outcome", "WeatherData"]
+__all__ = ["User", "Product", "Routine", "RoutineLog", "Outcome", "WeatherData", "Location", "GeocodeCache", "Insight", "ViewRefresh", "RoutineRanking", "ModelArtifact", "Tombstone"]
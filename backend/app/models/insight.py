@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class Insight(Base):
+    """A precomputed dashboard insight, rewritten by the background refresh job"""
+    __tablename__ = "insights"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    insight_type = Column(String, nullable=False)  # weather, method, product
+    message = Column(String, nullable=False)
+    confidence = Column(String, nullable=False)  # low, medium, high
+    sample_size = Column(Integer, nullable=False)  # rated logs the insight is based on
+    computed_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Boolean
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class Location(Base):
+    """A canonical place, shared by every user and weather row that refers to it"""
+    __tablename__ = "locations"
+
+    id = Column(Integer, primary_key=True, index=True)
+    # "lat,lon" rounded to 2 decimals for geocoded places, "q:<normalized text>" otherwise
+    key = Column(String, unique=True, nullable=False)
+    name = Column(String, nullable=False)  # display name, e.g. "Austin, Texas, US"
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Relationships
+    weather = relationship("WeatherData", back_populates="place")
+
+
+class GeocodeCache(Base):
+    """Which location a normalized free-text query resolves to"""
+    __tablename__ = "geocode_cache"
+
+    id = Column(Integer, primary_key=True, index=True)
+    query = Column(String, unique=True, nullable=False)  # normalized location text
+    location_id = Column(Integer, ForeignKey("locations.id"), nullable=True)  # null if not found
+    found = Column(Boolean, nullable=False, default=True)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=True)  # only set for negative entries
+    
+    # Relationships
+    location = relationship("Location")
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, JSON, LargeBinary, UniqueConstraint, Index, text
+from sqlalchemy.orm import deferred
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class ModelArtifact(Base):
+    """One trained version of a model; at most one version per name is current"""
+    __tablename__ = "model_artifacts"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False)
+    version = Column(Integer, nullable=False)
+    
+    # joblib-serialized scikit-learn pipeline; only loaded when needed
+    artifact = deferred(Column(LargeBinary, nullable=False))
+    
+    # Holdout metrics and training details
+    metrics = Column(JSON, nullable=True)
+    training_rows = Column(Integer, nullable=False)
+    is_current = Column(Boolean, nullable=False, default=False)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    __table_args__ = (
+        UniqueConstraint("name", "version", name="uq_model_artifacts_name_version"),
+        Index("uq_model_artifacts_current", "name", unique=True, postgresql_where=text("is_current")),
+    )
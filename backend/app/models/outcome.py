@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, Float, ForeignKey, DateTime, String
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, Float, ForeignKeyConstraint, Date, DateTime, String, Computed, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
 
@@ -8,7 +9,9 @@ class Outcome(Base):
     __tablename__ = "outcomes"
 
     id = Column(Integer, primary_key=True, index=True)
-    routine_log_id = Column(Integer, ForeignKey("routine_logs.id"), unique=True, nullable=False)
+    routine_log_id = Column(Integer, unique=True, nullable=False)
+    # The log's date, part of its key in the partitioned routine_logs table
+    routine_log_date = Column(Date, nullable=False)
     
     # Ratings (1-5 scale)
     frizz = Column(Integer, nullable=False)  # 1 = no frizz, 5 = very frizzy
@@ -20,12 +23,28 @@ class Outcome(Base):
     
     # Computed overall score (weighted average)
     overall_score = Column(Float, nullable=False)
+    # SCORING_VERSIONS entry overall_score was computed with
+    score_version = Column(Integer, nullable=False, server_default="1")
     
     # Optional notes
     notes = Column(String, nullable=True)
+    # Generated tsvector over notes for /search
+    search_vector = deferred(Column(TSVECTOR, Computed(
+        "to_tsvector('english', coalesce(notes, ''))",
+        persisted=True
+    )))
     
     # When was this rated
     rated_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
     routine_log = relationship("RoutineLog", back_populates="outcome")
+    
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["routine_log_id", "routine_log_date"], ["routine_logs.id", "routine_logs.date"],
+            name="outcomes_routine_log_fkey", ondelete="CASCADE", onupdate="CASCADE"
+        ),
+        Index("ix_outcomes_search", "search_vector", postgresql_using="gin"),
+    )
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, ARRAY, DateTime, Boolean
-from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, ARRAY, DateTime, Boolean, Computed, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
+from sqlalchemy.sql import func, text
 from app.core.database import Base
 
 
@@ -8,12 +9,17 @@ class Product(Base):
     __tablename__ = "products"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)  # Nullable for community products
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=True, index=True)  # Nullable for community products
     brand = Column(String, nullable=False)
     name = Column(String, nullable=False)
     type = Column(String, nullable=False)  # shampoo, conditioner, leave-in, cream, gel, mousse, oil
     ingredients = Column(ARRAY(String), nullable=True)
     notes = Column(String, nullable=True)
+    # Generated tsvector for /search: name ranks above brand, brand above notes
+    search_vector = deferred(Column(TSVECTOR, Computed(
+        "setweight(to_tsvector('english', coalesce(name, '')), 'A') || setweight(to_tsvector('english', coalesce(brand, '')), 'B') || setweight(to_tsvector('english', coalesce(notes, '')), 'C')",
+        persisted=True
+    )))
     usage_count = Column(Integer, default=0)
     success_rate = Column(Float, default=0.0)  # Computed from outcomes
     is_starred = Column(Boolean, default=False)
@@ -22,3 +28,9 @@ class Product(Base):
     
     # Relationships
     owner = relationship("User", back_populates="products")
+    
+    __table_args__ = (
+        Index("ix_products_search", "search_vector", postgresql_using="gin"),
+        # Typeahead over "brand name" (requires the pg_trgm extension)
+        Index("ix_products_brand_name_trgm", text("(brand || ' ' || name) gin_trgm_ops"), postgresql_using="gin"),
+    )
@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, JSON, DateTime
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, JSON, DateTime, Computed, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
 
@@ -8,8 +9,13 @@ class Routine(Base):
     __tablename__ = "routines"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     name = Column(String, nullable=False)
+    # Generated tsvector over the name for /search
+    search_vector = deferred(Column(TSVECTOR, Computed(
+        "to_tsvector('english', coalesce(name, ''))",
+        persisted=True
+    )))
     is_template = Column(Boolean, default=True)
     is_public = Column(Boolean, default=False)
     
@@ -28,3 +34,7 @@ class Routine(Base):
     # Relationships
     owner = relationship("User", back_populates="routines")
     routine_logs = relationship("RoutineLog", back_populates="routine", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        Index("ix_routines_search", "search_vector", postgresql_using="gin"),
+    )
@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, JSON, DateTime, Date, Time
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, JSON, DateTime, Date, Time, Computed, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
 
@@ -7,10 +8,12 @@ from app.core.database import Base
 class RoutineLog(Base):
     __tablename__ = "routine_logs"
 
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    routine_id = Column(Integer, ForeignKey("routines.id"), nullable=True)  # Can log without template
-    date = Column(Date, nullable=False)
+    # The table is partitioned by month on date, so its primary key is (id, date);
+    # ids still come from one sequence and the mapper identifies rows by id alone
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    routine_id = Column(Integer, ForeignKey("routines.id", ondelete="CASCADE"), nullable=True, index=True)  # Can log without template
+    date = Column(Date, primary_key=True)
     time = Column(Time, nullable=True)
     
     # Products used per step (JSONB): {"cleanse": [product_id1, product_id2], "condition": [product_id3], ...}
@@ -24,6 +27,11 @@ class RoutineLog(Base):
     # Optional fields
     time_spent = Column(Integer, nullable=True)  # minutes
     notes = Column(String, nullable=True)
+    # Full-text search document, maintained by Postgres; deferred so normal reads skip it
+    search_vector = deferred(Column(TSVECTOR, Computed(
+        "to_tsvector('english', coalesce(notes, ''))",
+        persisted=True
+    )))
     photo_urls = Column(JSON, nullable=True)  # Array of S3 URLs
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -33,3 +41,10 @@ class RoutineLog(Base):
     user = relationship("User", back_populates="routine_logs")
     routine = relationship("Routine", back_populates="routine_logs")
     outcome = relationship("Outcome", back_populates="routine_log", uselist=False, cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        Index("ix_routine_logs_search", "search_vector", postgresql_using="gin"),
+        Index("ix_routine_logs_user_date", "user_id", "date"),
+        {"postgresql_partition_by": "RANGE (date)"},
+    )
+    __mapper_args__ = {"primary_key": [id]}
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Index
+from sqlalchemy.dialects.postgresql import ARRAY
+from app.core.database import Base
+
+
+class RoutineRanking(Base):
+    """Periodically recomputed feed position of a public routine"""
+    __tablename__ = "routine_rankings"
+
+    routine_id = Column(Integer, ForeignKey("routines.id", ondelete="CASCADE"), primary_key=True)
+    # Bayesian average: outcomes shrunk toward the global mean by ROUTINE_RANKING_PRIOR_WEIGHT
+    score = Column(Float, nullable=False)
+    rating_count = Column(Integer, nullable=False)
+    average_score = Column(Float, nullable=True)  # raw mean, null when unrated
+    
+    # Copied from the routine at refresh time for filtered feeds
+    method_tags = Column(ARRAY(String), nullable=False)
+    drying_method = Column(String, nullable=True)
+    
+    computed_at = Column(DateTime(timezone=True), nullable=False)
+    
+    __table_args__ = (
+        Index("ix_routine_rankings_feed", "score", "routine_id"),
+        Index("ix_routine_rankings_method_tags", "method_tags", postgresql_using="gin"),
+    )
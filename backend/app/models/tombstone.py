@@ -0,0 +1,20 @@
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime, Index
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class Tombstone(Base):
+    """A deleted row, kept so /sync can tell offline clients to drop it"""
+    __tablename__ = "tombstones"
+
+    id = Column(BigInteger, primary_key=True)
+    # Owner of the deleted row; null for community products, which every user syncs,
+    # and for deleted accounts (entity "users"), which nobody does
+    user_id = Column(Integer, nullable=True)
+    entity = Column(String, nullable=False)  # products, routines, routine_logs, outcomes, users
+    entity_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    
+    __table_args__ = (
+        Index("ix_tombstones_user_deleted_at", "user_id", "deleted_at"),
+    )
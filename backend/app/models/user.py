@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, DateTime, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, JSON, ForeignKey
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 from app.core.database import Base
 
@@ -12,6 +12,8 @@ class User(Base):
     password_hash = Column(String, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Tokens issued before this moment are rejected (password change, account deletion)
+    tokens_valid_after = Column(DateTime(timezone=True), nullable=True)
     
     # Hair profile (stored as JSONB)
     curl_pattern = Column(String)  # 2A, 2B, 2C, 3A, 3B, 3C, 4A, 4B, 4C
@@ -20,8 +22,21 @@ class User(Base):
     thickness = Column(String, nullable=True)  # fine, medium, coarse
     scalp_type = Column(String, nullable=True)  # dry, oily, sensitive, normal
     location = Column(String, nullable=True)  # city, state, country for weather
+    location_id = Column(Integer, ForeignKey("locations.id"), nullable=True)  # resolved canonical location
+    insights_computed_at = Column(DateTime(timezone=True), nullable=True)  # null until the first refresh
+    # Set by DELETE /users/me; the account-deletion job removes the account's rows in chunks
+    deletion_requested_at = Column(DateTime(timezone=True), nullable=True, index=True)
     
-    # Relationships
-    products = relationship("Product", back_populates="owner", cascade="all, delete-orphan")
-    routines = relationship("Routine", back_populates="owner", cascade="all, delete-orphan")
-    routine_logs = relationship("RoutineLog", back_populates="user", cascade="all, delete-orphan")
+    # Relationships; the foreign keys cascade, so deleting a user does not load its rows
+    products = relationship("Product", back_populates="owner", cascade="all, delete-orphan", passive_deletes=True)
+    routines = relationship("Routine", back_populates="owner", cascade="all, delete-orphan", passive_deletes=True)
+    routine_logs = relationship("RoutineLog", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    insights = relationship("Insight", cascade="all, delete-orphan", passive_deletes=True)
+    place = relationship("Location")
+
+    @validates("location")
+    def _reset_place(self, key, value):
+        # A new location text is re-resolved on the next weather fetch
+        if value != self.location:
+            self.location_id = None
+        return value
@@ -0,0 +1,10 @@
+from sqlalchemy import Column, String, DateTime
+from app.core.database import Base
+
+
+class ViewRefresh(Base):
+    """When a materialized view was last refreshed"""
+    __tablename__ = "view_refreshes"
+
+    name = Column(String, primary_key=True)
+    refreshed_at = Column(DateTime(timezone=True), nullable=False)
@@ -1,26 +1,41 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Date, DateTime, Index
+from sqlalchemy import Column, Integer, Float, ForeignKey, Date, DateTime, Boolean, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
 
 
 class WeatherData(Base):
+    """Weather for one location and date, stored once and shared by all users there"""
     __tablename__ = "weather_data"
 
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    date = Column(Date, nullable=False)
-    location = Column(String, nullable=False)  # city, state, country
+    # Partitioned by month on date like routine_logs; rows are identified by id
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    location_id = Column(Integer, ForeignKey("locations.id"), nullable=False)
+    date = Column(Date, primary_key=True)
     
-    # Weather metrics
-    humidity = Column(Float, nullable=False)  # percentage
-    dew_point = Column(Float, nullable=False)  # celsius
-    temperature = Column(Float, nullable=False)  # celsius
+    # Weather metrics (null on negative cache entries)
+    humidity = Column(Float, nullable=True)  # percentage
+    dew_point = Column(Float, nullable=True)  # celsius
+    temperature = Column(Float, nullable=True)  # celsius
     wind_speed = Column(Float, nullable=True)  # m/s
     
+    # False when upstream had no data; retried after expires_at
+    found = Column(Boolean, nullable=False, default=True)
+    expires_at = Column(DateTime(timezone=True), nullable=True)
+    
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())  # set when a negative entry is refetched
+    
+    # Relationships
+    place = relationship("Location", back_populates="weather")
     
-    # Index for efficient queries
+    # One row per location and date; also serves the (location, date) lookups
     __table_args__ = (
-        Index('idx_user_date', 'user_id', 'date'),
+        UniqueConstraint('location_id', 'date', name='uq_weather_location_date'),
+        {"postgresql_partition_by": "RANGE (date)"},
     )
+    __mapper_args__ = {"primary_key": [id]}
+
+    @property
+    def location(self) -> str:
+        return self.place.name if self.place else None
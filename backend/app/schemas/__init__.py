@@ -1,15 +1,19 @@
 from app.schemas.user import User, UserCreate, UserUpdate, UserProfile, Token, TokenData
-from app.schemas.product import Product, ProductCreate, ProductUpdate
-from app.schemas.routine import Routine, RoutineCreate, RoutineUpdate
+from app.schemas.product import Product, ProductCreate, ProductUpdate, ProductSuggestion
+from app.schemas.routine import Routine, RoutineCreate, RoutineUpdate, PublicRoutine, PublicRoutineFeed, SimilarRoutine
 from app.schemas.routine_log import RoutineLog, RoutineLogCreate, RoutineLogUpdate
 from app.schemas.outcome import Outcome, OutcomeCreate, OutcomeUpdate
 from app.schemas.weather import WeatherData, WeatherDataCreate
+from app.schemas.prediction import Forecast, OutcomePredictionRequest, OutcomePredictions, RoutinePrediction
+from app.schemas.batch import BatchItem, BatchRequest, BatchItemResponse, BatchResponse
 
 __all__ = [
     "User", "UserCreate", "UserUpdate", "UserProfile", "Token", "TokenData",
-    "Product", "ProductCreate", "ProductUpdate",
-    "Routine", "RoutineCreate", "RoutineUpdate",
+    "Product", "ProductCreate", "ProductUpdate", "ProductSuggestion",
+    "Routine", "RoutineCreate", "RoutineUpdate", "PublicRoutine", "PublicRoutineFeed", "SimilarRoutine",
     "RoutineLog", "RoutineLogCreate", "RoutineLogUpdate",
     "Outcome", "OutcomeCreate", "OutcomeUpdate",
     "WeatherData", "WeatherDataCreate",
+    "Forecast", "OutcomePredictionRequest", "OutcomePredictions", "RoutinePrediction",
+    "BatchItem", "BatchRequest", "BatchItemResponse", "BatchResponse",
 ]
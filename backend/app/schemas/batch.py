@@ -0,0 +1,24 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+
+
+class BatchItem(BaseModel):
+    # Echoed back so clients can match responses; defaults to the path
+    id: Optional[str] = None
+    # API path relative to /api/v1, with an optional query string, e.g. "/dashboard/trends?days=7"
+    path: str = Field(..., pattern=r"^/")
+
+
+class BatchRequest(BaseModel):
+    requests: List[BatchItem] = Field(..., min_length=1)
+
+
+class BatchItemResponse(BaseModel):
+    id: str
+    status: int
+    headers: Dict[str, str] = {}
+    body: Any = None
+
+
+class BatchResponse(BaseModel):
+    responses: List[BatchItemResponse]
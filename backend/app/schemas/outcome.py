@@ -27,7 +27,9 @@ class Outcome(OutcomeBase):
     id: int
     routine_log_id: int
     overall_score: float
+    score_version: int
     rated_at: datetime
+    updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
@@ -0,0 +1,36 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+import datetime
+
+
+class Forecast(BaseModel):
+    humidity: Optional[float] = None  # percentage
+    dew_point: Optional[float] = None  # celsius
+    temperature: Optional[float] = None  # celsius
+    wind_speed: Optional[float] = None  # m/s
+
+
+class OutcomePredictionRequest(BaseModel):
+    # Defaults to all of your own routines
+    routine_ids: Optional[List[int]] = Field(None, min_length=1, max_length=200)
+    date: Optional[datetime.date] = None
+    # Overrides the stored weather for `date`
+    forecast: Optional[Forecast] = None
+    # Whether the routines would be done on a wash day
+    wash_day: bool = True
+
+
+class RoutinePrediction(BaseModel):
+    routine_id: int
+    name: str
+    predicted_score: float
+
+
+class OutcomePredictions(BaseModel):
+    model_version: int
+    date: Optional[datetime.date] = None
+    weather: Forecast
+    predictions: List[RoutinePrediction]  # Best predicted score first
+
+    class Config:
+        protected_namespaces = ()
@@ -35,3 +35,11 @@ class Product(ProductBase):
 
     class Config:
         from_attributes = True
+
+
+class ProductSuggestion(BaseModel):
+    id: int
+    brand: str
+    name: str
+    type: str
+    community: bool  # True for the shared catalog, False for the user's own products
@@ -33,3 +33,18 @@ class Routine(RoutineBase):
 
     class Config:
         from_attributes = True
+
+
+class PublicRoutine(Routine):
+    score: float  # Bayesian-average feed score
+    rating_count: int
+    average_score: Optional[float] = None
+
+
+class PublicRoutineFeed(BaseModel):
+    routines: List[PublicRoutine]
+    next_cursor: Optional[str] = None
+
+
+class SimilarRoutine(Routine):
+    similarity: float  # Cosine similarity of routine features, 0-1
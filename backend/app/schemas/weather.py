@@ -13,13 +13,14 @@ class WeatherDataBase(BaseModel):
 
 
 class WeatherDataCreate(WeatherDataBase):
-    user_id: int
+    location_id: int
 
 
 class WeatherData(WeatherDataBase):
     id: int
-    user_id: int
+    location_id: int
     created_at: datetime
+    updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
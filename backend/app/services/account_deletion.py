@@ -0,0 +1,126 @@
+"""Deleting an account in the background, in constant memory.
+
+DELETE /users/me only sets users.deletion_requested_at and revokes the
+account's tokens. The account-deletion job then removes its rows with plain
+DELETE statements of ACCOUNT_DELETION_CHUNK_SIZE rows each, committed one at a
+time so no transaction holds locks for long: routine logs (outcomes go with
+them through ON DELETE CASCADE), routines, products, insights and tombstones,
+then the user row itself, whose cascades catch anything written in between.
+
+Every worker runs the job, so an account is first claimed with a session-level
+advisory lock; other workers skip it and move on to the next one. Chunks take
+their rows with FOR UPDATE SKIP LOCKED, so rows a request is still writing do
+not hold the deletion up; the user row's cascades remove them at the end.
+
+Bulk deletes skip the session hooks, so no sync tombstones are written for
+the account's rows; a single "users" tombstone (with no user_id, so /sync
+never returns it) tells incremental analytics snapshots to drop the
+account's exported rows.
+"""
+
+import logging
+from typing import Dict, List, Optional
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal, engine
+from app.core.jobs import PeriodicJob
+from app.models.insight import Insight
+from app.models.product import Product
+from app.models.routine import Routine
+from app.models.routine_log import RoutineLog
+from app.models.tombstone import Tombstone
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Children before parents, so each chunk's cascades stay small
+OWNED_MODELS = (RoutineLog, Routine, Product, Insight, Tombstone)
+
+
+def _delete_chunk(db: Session, model, user_id: int, chunk_size: int) -> int:
+    ids = select(model.id).where(
+        model.user_id == user_id
+    ).order_by(model.id).limit(chunk_size).with_for_update(skip_locked=True).scalar_subquery()
+    result = db.execute(
+        delete(model).where(model.id.in_(ids)).execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+def _lock_key(user_id: int):
+    return func.hashtext(f"account-deletion:{user_id}")
+
+
+def _claim(connection: Connection, user_id: int) -> bool:
+    """Take the account's advisory lock; held by the connection (not a transaction) until released"""
+    claimed = connection.execute(select(func.pg_try_advisory_lock(_lock_key(user_id)))).scalar()
+    connection.commit()
+    return bool(claimed)
+
+
+def delete_account(user_id: int, chunk_size: Optional[int] = None) -> Optional[Dict[str, int]]:
+    """Delete a user and everything they own; returns rows deleted per table.
+
+    None if another worker is already deleting the account.
+    """
+    chunk_size = chunk_size or settings.ACCOUNT_DELETION_CHUNK_SIZE
+    deleted: Dict[str, int] = {}
+    # One connection for the whole run, so the lock survives each chunk's commit
+    with engine.connect() as connection:
+        if not _claim(connection, user_id):
+            return None
+        db = SessionLocal(bind=connection)
+        try:
+            for model in OWNED_MODELS:
+                deleted[model.__tablename__] = 0
+                # Until nothing is left: a short chunk may only mean some rows were skipped as locked
+                while True:
+                    count = _delete_chunk(db, model, user_id, chunk_size)
+                    db.commit()
+                    deleted[model.__tablename__] += count
+                    if count == 0:
+                        break
+            deleted["users"] = db.execute(
+                delete(User).where(User.id == user_id).execution_options(synchronize_session=False)
+            ).rowcount
+            if deleted["users"]:
+                db.execute(insert(Tombstone).values(user_id=None, entity="users", entity_id=user_id))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+            connection.execute(select(func.pg_advisory_unlock(_lock_key(user_id))))
+            connection.commit()
+    logger.info("Deleted account %s: %s", user_id, deleted)
+    return deleted
+
+
+def pending_deletions(db: Session) -> List[int]:
+    """Ids of users whose deletion was requested, oldest request first"""
+    return [user_id for (user_id,) in db.query(User.id).filter(
+        User.deletion_requested_at.isnot(None)
+    ).order_by(User.deletion_requested_at)]
+
+
+def delete_requested_accounts() -> int:
+    """Finish every requested account deletion not claimed by another worker; returns how many accounts"""
+    db = SessionLocal()
+    try:
+        user_ids = pending_deletions(db)
+    finally:
+        db.close()
+    return sum(1 for user_id in user_ids if delete_account(user_id) is not None)
+
+
+account_deletion_job = PeriodicJob(
+    "account-deletion",
+    delete_requested_accounts,
+    interval=settings.ACCOUNT_DELETION_INTERVAL_SECONDS,
+    initial_delay=0,
+)
@@ -0,0 +1,138 @@
+"""Community cohort analytics served from materialized views.
+
+cohort_outcome_stats and cohort_product_stats (migration 0006) aggregate
+outcomes across users with the same hair profile. They are rebuilt with
+REFRESH MATERIALIZED VIEW CONCURRENTLY, so reads never block on a refresh;
+view_refreshes records the last run so that only one worker refreshes per
+COHORT_REFRESH_MINUTES.
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import column, table, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.jobs import PeriodicJob
+from app.models.product import Product
+from app.services import refreshes
+
+COHORT_VIEWS = ("cohort_outcome_stats", "cohort_product_stats")
+DIMENSIONS = ("curl_pattern", "porosity", "density", "thickness")
+
+# Dimension combinations each view is grouped by (its GROUPING SETS)
+OUTCOME_COHORTS = {
+    frozenset(),
+    frozenset({"curl_pattern"}),
+    frozenset({"porosity"}),
+    frozenset({"curl_pattern", "porosity"}),
+    frozenset({"curl_pattern", "density"}),
+    frozenset({"curl_pattern", "thickness"}),
+}
+PRODUCT_COHORTS = {
+    frozenset(),
+    frozenset({"curl_pattern"}),
+    frozenset({"porosity"}),
+    frozenset({"curl_pattern", "porosity"}),
+}
+
+outcome_stats = table(
+    "cohort_outcome_stats",
+    column("grouping_set"), *(column(name) for name in DIMENSIONS),
+    column("user_count"), column("outcome_count"),
+    column("avg_frizz"), column("avg_definition"), column("avg_softness"), column("avg_overall"),
+)
+product_stats = table(
+    "cohort_product_stats",
+    column("grouping_set"), column("curl_pattern"), column("porosity"), column("product_id"),
+    column("user_count"), column("use_count"), column("avg_overall"),
+)
+
+
+def _matches(view, cohort: Dict[str, str], dimensions) -> list:
+    """Filters selecting one cohort: its grouping set, then its values.
+
+    grouping_set is GROUPING(*dimensions), with a 1 bit for each dimension the
+    row is not grouped by and the first dimension as the most significant bit.
+    """
+    grouping_set = sum(1 << index for index, name in enumerate(reversed(dimensions)) if name not in cohort)
+    return [view.c.grouping_set == grouping_set, *(view.c[name] == cohort[name] for name in cohort)]
+
+
+def refresh_cohort_views(force: bool = False) -> bool:
+    """Refresh the cohort views unless another worker did so recently; True if refreshed"""
+    db = SessionLocal()
+    try:
+        now = refreshes.claim_refresh(
+            db, COHORT_VIEWS[0], timedelta(minutes=settings.COHORT_REFRESH_MINUTES), force
+        )
+        if now is None:
+            return False
+        for view in COHORT_VIEWS:
+            db.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view}"))
+        refreshes.mark_refreshed(db, COHORT_VIEWS, now)
+        db.commit()
+        return True
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+# Each worker checks a few times per interval; the timestamp check above keeps it to one refresh
+cohort_refresh_job = PeriodicJob(
+    "cohort-refresh",
+    refresh_cohort_views,
+    interval=max(60, settings.COHORT_REFRESH_MINUTES * 60 / 6) if settings.COHORT_REFRESH_MINUTES > 0 else 0,
+)
+
+
+def last_refreshed(db: Session) -> Optional[datetime]:
+    return refreshes.last_refreshed(db, COHORT_VIEWS[0])
+
+
+def get_cohort_outcomes(db: Session, cohort: Dict[str, str]) -> Optional[dict]:
+    """Outcome averages for a cohort, or None if it is below the privacy thresholds"""
+    row = db.query(outcome_stats).filter(*_matches(outcome_stats, cohort, DIMENSIONS)).first()
+    if (
+        row is None
+        or row.user_count < settings.COHORT_MIN_USERS
+        or row.outcome_count < settings.COHORT_MIN_OUTCOMES
+    ):
+        return None
+    return {
+        "user_count": row.user_count,
+        "outcome_count": row.outcome_count,
+        "frizz": round(row.avg_frizz, 2),
+        "definition": round(row.avg_definition, 2),
+        "softness": round(row.avg_softness, 2),
+        "overall": round(row.avg_overall, 2),
+    }
+
+
+def get_cohort_products(db: Session, cohort: Dict[str, str], limit: int) -> List[dict]:
+    """Best-scoring community products in a cohort, each used by enough distinct users"""
+    rows = db.query(
+        Product.id, Product.brand, Product.name, Product.type,
+        product_stats.c.user_count, product_stats.c.use_count, product_stats.c.avg_overall
+    ).select_from(product_stats).join(
+        Product, Product.id == product_stats.c.product_id
+    ).filter(
+        *_matches(product_stats, cohort, ("curl_pattern", "porosity")),
+        product_stats.c.user_count >= settings.COHORT_MIN_USERS
+    ).order_by(product_stats.c.avg_overall.desc()).limit(limit).all()
+    return [
+        {
+            "id": row.id,
+            "brand": row.brand,
+            "name": row.name,
+            "type": row.type,
+            "user_count": row.user_count,
+            "use_count": row.use_count,
+            "average_score": round(row.avg_overall, 2),
+        }
+        for row in rows
+    ]
@@ -0,0 +1,113 @@
+"""Dashboard insights, computed off the request path and stored per user.
+
+Writes that can change a user's insights (outcomes, routine logs, weather)
+call schedule_insight_refresh(); the refresh runs on a background thread once
+the user's writes have been quiet for INSIGHTS_REFRESH_DEBOUNCE_SECONDS and
+replaces the user's rows in the insights table in one transaction.
+"""
+
+from datetime import date, datetime, timezone
+from typing import List
+
+from sqlalchemy import and_, delete, func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.jobs import DebouncedJobQueue
+from app.models.insight import Insight
+from app.models.outcome import Outcome
+from app.models.routine_log import RoutineLog
+from app.models.user import User
+from app.models.weather import WeatherData
+
+HIGH_HUMIDITY_THRESHOLD = 60.0
+LOW_HUMIDITY_THRESHOLD = 40.0
+
+
+def _confidence(sample_size: int) -> str:
+    if sample_size >= 30:
+        return "high"
+    if sample_size >= 10:
+        return "medium"
+    return "low"
+
+
+def compute_insights(db: Session, user_id: int) -> List[dict]:
+    """Evaluate every insight type for a user"""
+    insights = []
+
+    # Weather correlation: frizz on high vs low humidity days, in one pass.
+    # Weather is shared per location, so match the user's location rather than the user
+    user_location = select(User.location_id).where(User.id == user_id).scalar_subquery()
+    high = WeatherData.humidity >= HIGH_HUMIDITY_THRESHOLD
+    low = WeatherData.humidity <= LOW_HUMIDITY_THRESHOLD
+    high_frizz, high_count, low_frizz, low_count = db.query(
+        func.avg(Outcome.frizz).filter(high),
+        func.count(Outcome.id).filter(high),
+        func.avg(Outcome.frizz).filter(low),
+        func.count(Outcome.id).filter(low),
+    ).select_from(Outcome).join(
+        RoutineLog, Outcome.routine_log_id == RoutineLog.id
+    ).join(
+        WeatherData, and_(
+            WeatherData.location_id == user_location,
+            WeatherData.date == RoutineLog.date
+        )
+    ).filter(RoutineLog.user_id == user_id).one()
+
+    if high_frizz and low_frizz and high_frizz > low_frizz:
+        sample_size = high_count + low_count
+        insights.append({
+            "insight_type": "weather",
+            "message": f"High humidity days (≥{HIGH_HUMIDITY_THRESHOLD}%) show {round((high_frizz - low_frizz) / low_frizz * 100, 1)}% higher frizz on average",
+            "confidence": _confidence(min(high_count, low_count)),
+            "sample_size": sample_size,
+        })
+
+    return insights
+
+
+def refresh_insights(user_id: int) -> None:
+    """Recompute and replace a user's stored insights"""
+    db = SessionLocal()
+    try:
+        computed_at = datetime.now(timezone.utc)
+        insights = compute_insights(db, user_id)
+        db.execute(delete(Insight).where(Insight.user_id == user_id))
+        db.add_all(Insight(user_id=user_id, computed_at=computed_at, **insight) for insight in insights)
+        # Keep updated_at untouched; this is derived data, not a profile edit
+        db.execute(
+            update(User).where(User.id == user_id)
+            .values(insights_computed_at=computed_at, updated_at=User.updated_at)
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+insight_jobs = DebouncedJobQueue(
+    "insights",
+    refresh_insights,
+    delay=settings.INSIGHTS_REFRESH_DEBOUNCE_SECONDS,
+    max_delay=settings.INSIGHTS_REFRESH_MAX_DELAY_SECONDS,
+)
+
+
+def schedule_insight_refresh(user_id: int) -> None:
+    insight_jobs.schedule(user_id)
+
+
+def schedule_location_refresh(db: Session, location_id: int, day: date) -> None:
+    """Refresh everyone at a location who logged a routine on a day with new weather"""
+    user_ids = db.query(RoutineLog.user_id).join(
+        User, User.id == RoutineLog.user_id
+    ).filter(
+        User.location_id == location_id,
+        RoutineLog.date == day
+    ).distinct()
+    for (user_id,) in user_ids:
+        insight_jobs.schedule(user_id)
@@ -0,0 +1,218 @@
+"""Predicting a routine's overall_score from routine, hair profile and weather.
+
+Training (train_outcome_model.py) reads every rated routine log with pandas,
+from the database or an analytics snapshot (app.services.snapshots),
+fits a scikit-learn pipeline and stores it in model_artifacts as a new
+version. Each worker loads the current version once at startup; predictions
+for any number of candidate routines are then a single pipeline.predict call.
+"""
+
+import io
+import logging
+from typing import Dict, List, NamedTuple, Optional
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import HistGradientBoostingRegressor
+from sklearn.feature_extraction import DictVectorizer
+from sklearn.metrics import mean_absolute_error, r2_score
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline, make_pipeline
+from sqlalchemy import and_, func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.model_artifact import ModelArtifact
+from app.models.outcome import Outcome
+from app.models.routine import Routine
+from app.models.routine_log import RoutineLog
+from app.models.user import User
+from app.models.weather import WeatherData
+
+logger = logging.getLogger(__name__)
+
+MODEL_NAME = "outcome_score"
+PROFILE_FIELDS = ("curl_pattern", "porosity", "density", "thickness")
+WEATHER_FIELDS = ("humidity", "dew_point", "temperature", "wind_speed")
+
+
+class LoadedModel(NamedTuple):
+    version: int
+    pipeline: Pipeline
+
+
+_current: Optional[LoadedModel] = None
+
+
+def products_by_step(steps) -> Dict[str, List[int]]:
+    """A routine template's steps in the shape of RoutineLog.products_used: {"step_type": [product ids]}"""
+    used: Dict[str, List[int]] = {}
+    for step in steps or []:
+        if isinstance(step, dict) and step.get("step_type"):
+            product_ids = used.setdefault(step["step_type"], [])
+            if step.get("product_id") is not None:
+                product_ids.append(step["product_id"])
+    return used
+
+
+def features(
+    products_used, methods, drying_method: Optional[str], wash_day: bool,
+    profile: Dict[str, Optional[str]], weather: Dict[str, Optional[float]]
+) -> dict:
+    """One feature row; strings are one-hot encoded and missing weather stays NaN.
+
+    Steps always come in as products_used ({"step": [product ids]}), so logged
+    routines and routine templates share one step vocabulary.
+    """
+    products_used = products_used if isinstance(products_used, dict) else {}
+    row = {f"step={step}": 1 for step in products_used}
+    row.update({f"method={method}": 1 for method in methods or [] if method})
+    row["products"] = sum(len(ids) for ids in products_used.values() if isinstance(ids, list))
+    row["wash_day"] = int(bool(wash_day))
+    if drying_method:
+        row["drying"] = drying_method
+    for field in PROFILE_FIELDS:
+        if profile.get(field):
+            row[field] = profile[field]
+    for field in WEATHER_FIELDS:
+        value = weather.get(field)
+        row[field] = np.nan if value is None else float(value)
+    return row
+
+
+def log_features(record: dict) -> dict:
+    """Features of a logged routine"""
+    return features(
+        record["products_used"],
+        [record["styling_method"]],
+        record["drying_method"],
+        record["wash_day"],
+        record,
+        record,
+    )
+
+
+def routine_features(
+    routine: Routine, wash_day: bool, profile: Dict[str, Optional[str]], weather: Dict[str, Optional[float]]
+) -> dict:
+    """Features of a routine template, as if it were logged on that kind of day with this profile and weather"""
+    return features(
+        products_by_step(routine.steps),
+        routine.method_tags,
+        routine.drying_method,
+        wash_day,
+        profile,
+        weather,
+    )
+
+
+def training_frame(db: Session) -> pd.DataFrame:
+    """Every rated routine log with its owner's profile and that day's weather"""
+    query = db.query(
+        RoutineLog.products_used, RoutineLog.styling_method, RoutineLog.drying_method, RoutineLog.wash_day,
+        *(getattr(User, field) for field in PROFILE_FIELDS),
+        *(getattr(WeatherData, field) for field in WEATHER_FIELDS),
+        Outcome.overall_score
+    ).join(
+        Outcome, Outcome.routine_log_id == RoutineLog.id
+    ).join(
+        User, User.id == RoutineLog.user_id
+    ).outerjoin(
+        WeatherData,
+        and_(
+            WeatherData.location_id == User.location_id,
+            WeatherData.date == RoutineLog.date,
+            WeatherData.found.is_(True)
+        )
+    )
+    return pd.read_sql(query.statement, db.connection())
+
+
+def _pipeline() -> Pipeline:
+    return make_pipeline(
+        DictVectorizer(sparse=False),
+        HistGradientBoostingRegressor(max_iter=200, learning_rate=0.05, random_state=0)
+    )
+
+
+def train_model(db: Session, activate: bool = True, frame: Optional[pd.DataFrame] = None) -> ModelArtifact:
+    """Fit, evaluate on a 20% holdout, refit on all rows and store a new version.
+
+    `frame` (e.g. rated rows of an analytics snapshot) replaces training_frame(db).
+    """
+    if frame is None:
+        frame = training_frame(db)
+    if len(frame) < settings.OUTCOME_MODEL_MIN_TRAINING_ROWS:
+        raise ValueError(
+            f"Need at least {settings.OUTCOME_MODEL_MIN_TRAINING_ROWS} rated routine logs to train, found {len(frame)}"
+        )
+    rows = [log_features(record) for record in frame.to_dict("records")]
+    target = frame["overall_score"].to_numpy()
+
+    train_rows, test_rows, train_y, test_y = train_test_split(rows, target, test_size=0.2, random_state=0)
+    predicted = _pipeline().fit(train_rows, train_y).predict(test_rows)
+    metrics = {
+        "mae": round(float(mean_absolute_error(test_y, predicted)), 4),
+        "r2": round(float(r2_score(test_y, predicted)), 4),
+        "baseline_mae": round(float(mean_absolute_error(test_y, np.full_like(test_y, train_y.mean()))), 4),
+        "holdout_rows": len(test_rows),
+    }
+
+    buffer = io.BytesIO()
+    joblib.dump(_pipeline().fit(rows, target), buffer)
+    version = (db.query(func.max(ModelArtifact.version)).filter(ModelArtifact.name == MODEL_NAME).scalar() or 0) + 1
+    artifact = ModelArtifact(
+        name=MODEL_NAME, version=version, artifact=buffer.getvalue(),
+        metrics=metrics, training_rows=len(rows), is_current=False
+    )
+    db.add(artifact)
+    db.flush()
+    if activate:
+        activate_version(db, version)
+    db.commit()
+    return artifact
+
+
+def activate_version(db: Session, version: int) -> None:
+    """Make `version` the one workers load; the caller commits"""
+    exists = db.query(ModelArtifact.id).filter(
+        ModelArtifact.name == MODEL_NAME, ModelArtifact.version == version
+    ).first()
+    if exists is None:
+        raise ValueError(f"No {MODEL_NAME} model version {version}")
+    db.query(ModelArtifact).filter(
+        ModelArtifact.name == MODEL_NAME, ModelArtifact.is_current.is_(True)
+    ).update({"is_current": False}, synchronize_session=False)
+    db.query(ModelArtifact).filter(
+        ModelArtifact.name == MODEL_NAME, ModelArtifact.version == version
+    ).update({"is_current": True}, synchronize_session=False)
+
+
+def load_current_model() -> Optional[LoadedModel]:
+    """Load the current version into this worker; called once at startup"""
+    global _current
+    db = SessionLocal()
+    try:
+        row = db.query(ModelArtifact.version, ModelArtifact.artifact).filter(
+            ModelArtifact.name == MODEL_NAME, ModelArtifact.is_current.is_(True)
+        ).first()
+    finally:
+        db.close()
+    if row is None:
+        logger.info("No %s model has been trained; predictions are unavailable", MODEL_NAME)
+        return None
+    _current = LoadedModel(row.version, joblib.load(io.BytesIO(row.artifact)))
+    return _current
+
+
+def current_model() -> Optional[LoadedModel]:
+    return _current
+
+
+def predict(model: LoadedModel, rows: List[dict]) -> List[float]:
+    """Predicted overall_score for each feature row, in one vectorized call"""
+    if not rows:
+        return []
+    return [float(score) for score in model.pipeline.predict(rows)]
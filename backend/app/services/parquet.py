@@ -0,0 +1,74 @@
+"""Writing query results to Parquet files in bounded memory.
+
+Rows are read through a server-side cursor chunk_size at a time, and each
+chunk becomes one part-NNNNN.parquet file (one per partition directory the
+chunk touches, when partitioned). The Arrow schema comes from the query's SQL
+column types rather than from each chunk's values, so every part of a dataset
+has the same schema even when a chunk is all NULL in a column.
+"""
+
+import json
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import ARRAY, JSON, Boolean, Date, DateTime, Integer, Numeric, Time
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import Select
+
+COMPRESSION = "zstd"
+
+
+def arrow_type(sql_type) -> pa.DataType:
+    if isinstance(sql_type, Boolean):
+        return pa.bool_()
+    if isinstance(sql_type, Integer):
+        return pa.int64()
+    if isinstance(sql_type, Numeric):
+        return pa.float64()
+    if isinstance(sql_type, DateTime):
+        return pa.timestamp("us", tz="UTC" if sql_type.timezone else None)
+    if isinstance(sql_type, Date):
+        return pa.date32()
+    if isinstance(sql_type, Time):
+        return pa.time64("us")
+    if isinstance(sql_type, ARRAY):
+        return pa.list_(arrow_type(sql_type.item_type))
+    # Strings, and JSON serialized to text
+    return pa.string()
+
+
+def write_query(
+    connection: Connection, statement: Select, directory: Path, chunk_size: int,
+    partition_by: Optional[str] = None
+) -> List[Path]:
+    """Write the rows of `statement` to directory/part-NNNNN.parquet; returns the files written.
+
+    With `partition_by`, rows go to directory/<column>=<value>/ instead (Hive
+    style, which pyarrow and pandas read back as a column) and the column
+    itself is left out of the files.
+    """
+    columns = [column for column in statement.selected_columns if column.name != partition_by]
+    schema = pa.schema([(column.name, arrow_type(column.type)) for column in columns])
+    json_columns = [column.name for column in columns if isinstance(column.type, JSON)]
+    directory.mkdir(parents=True, exist_ok=True)
+
+    files: List[Path] = []
+    # Set on the statement; Connection.execution_options() would change the caller's connection
+    streaming = statement.execution_options(stream_results=True, max_row_buffer=chunk_size)
+    chunks = pd.read_sql(streaming, connection, chunksize=chunk_size)
+    for index, frame in enumerate(chunks):
+        for name in json_columns:
+            frame[name] = frame[name].map(lambda value: None if value is None else json.dumps(value))
+        groups = [(directory, frame)] if partition_by is None else [
+            (directory / f"{partition_by}={value}", group.drop(columns=partition_by))
+            for value, group in frame.groupby(partition_by, sort=True)
+        ]
+        for target, rows in groups:
+            target.mkdir(exist_ok=True)
+            path = target / f"part-{index:05d}.parquet"
+            pq.write_table(pa.Table.from_pandas(rows, schema=schema, preserve_index=False), path, compression=COMPRESSION)
+            files.append(path)
+    return files
@@ -0,0 +1,191 @@
+"""Monthly partitions of routine_logs and weather_data (migration 0015).
+
+Every month is its own partition, <table>_pYYYY_MM, so queries filtered on
+date only read the months they cover. The maintenance job keeps
+PARTITION_MONTHS_AHEAD months created in advance; rows outside every
+partition go to <table>_default.
+
+Months older than a table's archive cutoff are written to Parquet under
+PARTITION_ARCHIVE_URL, then detached and dropped. A month of routine logs
+takes its logs' outcomes with it, into an outcomes/ dataset beside it.
+"""
+
+import logging
+import re
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+from sqlalchemy import column, delete, select, table, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.jobs import PeriodicJob
+from app.core.storage import store_file
+from app.models.outcome import Outcome
+from app.models.routine_log import RoutineLog
+from app.models.weather import WeatherData
+from app.services import parquet, refreshes
+
+logger = logging.getLogger(__name__)
+
+PARTITIONED = {"routine_logs": RoutineLog, "weather_data": WeatherData}
+PARTITION_NAME = re.compile(r"^(?P<table>\w+)_p(?P<year>\d{4})_(?P<month>\d{2})$")
+ARCHIVE_CHUNK_ROWS = 100000
+
+
+class Partition(NamedTuple):
+    table: str
+    name: str
+    month: date
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def archive_after_months() -> Dict[str, int]:
+    """Age in months at which each table's partitions are archived; 0 keeps them"""
+    return {
+        "routine_logs": settings.ROUTINE_LOG_ARCHIVE_AFTER_MONTHS,
+        "weather_data": settings.WEATHER_ARCHIVE_AFTER_MONTHS,
+    }
+
+
+def list_partitions(db, table_name: str) -> List[Partition]:
+    """The monthly partitions of a table, oldest first (the default partition is left out)"""
+    names = db.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = CAST(:table AS regclass)"
+    ), {"table": table_name}).scalars()
+    partitions = []
+    for name in names:
+        match = PARTITION_NAME.match(name)
+        if match and match["table"] == table_name:
+            partitions.append(Partition(table_name, name, date(int(match["year"]), int(match["month"]), 1)))
+    return sorted(partitions, key=lambda partition: partition.month)
+
+
+def create_partitions(db, table_name: str, first: date, last: date) -> List[str]:
+    """Create the missing monthly partitions from first's month to last's; the caller commits.
+
+    `db` is a Session or Connection. A month the default partition already
+    has rows for cannot get its own partition; those rows stay in the default.
+    """
+    existing = {partition.name for partition in list_partitions(db, table_name)}
+    created = []
+    month = first.replace(day=1)
+    while month <= last:
+        name = f"{table_name}_p{month:%Y_%m}"
+        if name not in existing:
+            try:
+                with db.begin_nested():
+                    db.execute(text(
+                        f"CREATE TABLE {name} PARTITION OF {table_name} "
+                        f"FOR VALUES FROM ('{month}') TO ('{add_months(month, 1)}')"
+                    ))
+                created.append(name)
+            except DBAPIError:
+                logger.warning("Could not create %s; its rows stay in %s_default", name, table_name, exc_info=True)
+        month = add_months(month, 1)
+    return created
+
+
+def _partition_select(partition: Partition, model):
+    columns = [c for c in model.__table__.columns if not isinstance(c.type, TSVECTOR)]
+    source = table(partition.name, *(column(c.name, c.type) for c in columns))
+    return select(*source.c)
+
+
+def archive_partition(db: Session, partition: Partition, url: str) -> List[str]:
+    """Write one month to Parquet under `url`, then detach and drop it; returns the stored files.
+
+    The partition is locked against writes first, so rows cannot be added
+    between the export and the drop. Nothing is dropped unless every file
+    was stored.
+    """
+    logs = _partition_select(partition, PARTITIONED[partition.table])
+    datasets = {partition.table: logs}
+    if partition.table == "routine_logs":
+        outcome_columns = [c for c in Outcome.__table__.columns if not isinstance(c.type, TSVECTOR)]
+        datasets["outcomes"] = select(*outcome_columns).where(
+            Outcome.routine_log_id.in_(select(logs.selected_columns.id))
+        )
+
+    stored = []
+    try:
+        db.execute(text(f"LOCK TABLE {partition.name} IN EXCLUSIVE MODE"))
+        with tempfile.TemporaryDirectory() as workdir:
+            for dataset, statement in datasets.items():
+                files = parquet.write_query(db.connection(), statement, Path(workdir) / dataset, ARCHIVE_CHUNK_ROWS)
+                for path in files:
+                    stored.append(store_file(path, url, f"{dataset}/{partition.month:%Y-%m}/{path.name}"))
+        if "outcomes" in datasets:
+            db.execute(delete(Outcome).where(
+                Outcome.routine_log_id.in_(select(logs.selected_columns.id))
+            ).execution_options(synchronize_session=False))
+        db.execute(text(f"ALTER TABLE {partition.table} DETACH PARTITION {partition.name}"))
+        db.execute(text(f"DROP TABLE {partition.name}"))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    logger.info("Archived %s to %s (%s files)", partition.name, url, len(stored))
+    return stored
+
+
+def archive_old_partitions(today: date, url: Optional[str] = None) -> List[str]:
+    """Archive every partition past its table's cutoff; returns the partitions archived"""
+    url = url or settings.PARTITION_ARCHIVE_URL
+    if not url:
+        return []
+    archived = []
+    db = SessionLocal()
+    try:
+        for table_name, months in archive_after_months().items():
+            if months <= 0:
+                continue
+            cutoff = add_months(today.replace(day=1), -months)
+            for partition in list_partitions(db, table_name):
+                if partition.month < cutoff:
+                    archive_partition(db, partition, url)
+                    archived.append(partition.name)
+    finally:
+        db.close()
+    return archived
+
+
+def maintain_partitions(force: bool = False) -> bool:
+    """Create upcoming months and archive old ones, unless another worker did recently"""
+    db = SessionLocal()
+    try:
+        now = refreshes.claim_refresh(
+            db, "partitions", timedelta(hours=settings.PARTITION_MAINTENANCE_HOURS), force
+        )
+        if now is None:
+            return False
+        today = now.date()
+        for table_name in PARTITIONED:
+            create_partitions(db, table_name, today, add_months(today.replace(day=1), settings.PARTITION_MONTHS_AHEAD))
+        refreshes.mark_refreshed(db, ["partitions"], now)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    archive_old_partitions(today)
+    return True
+
+
+partition_maintenance_job = PeriodicJob(
+    "partition-maintenance",
+    maintain_partitions,
+    interval=max(600, settings.PARTITION_MAINTENANCE_HOURS * 3600 / 6) if settings.PARTITION_MAINTENANCE_HOURS > 0 else 0,
+    initial_delay=60,
+)
@@ -0,0 +1,161 @@
+"""Product typeahead: an in-memory prefix index of the community catalog.
+
+Each worker keeps a sorted list of normalized "brand name" suffixes (one per
+word start), so a keystroke lookup is a bisect plus a short scan. A periodic
+job compares a cheap catalog version (count, max id, last change) and rebuilds
+the index off the request path when the catalog changed. Until the first build
+finishes, lookups fall back to the pg_trgm index in Postgres.
+"""
+
+import re
+import threading
+import unicodedata
+from bisect import bisect_left
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.jobs import PeriodicJob
+from app.models.product import Product
+
+# Candidates scanned per lookup; bounds the cost of one- or two-letter queries
+MAX_SCAN = 500
+
+
+class Suggestion(NamedTuple):
+    id: int
+    brand: str
+    name: str
+    type: str
+    usage_count: int
+
+
+def normalize(text: str) -> str:
+    """Lowercase, strip accents and punctuation, collapse whitespace"""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    return " ".join(re.sub(r"[^\w]+", " ", text).split())
+
+
+def product_label():
+    """brand || ' ' || name, the expression ix_products_brand_name_trgm indexes"""
+    return Product.brand.concat(" ").concat(Product.name)
+
+
+class PrefixIndex:
+    """Sorted (key, position, product id) entries for prefix lookups.
+
+    position is 0 for "brand name", 1 for the name alone and 2 for any later
+    word, and ranks matches at the start above matches mid-label.
+    """
+
+    def __init__(self, products: Iterable[Suggestion]):
+        self.products: Dict[int, Suggestion] = {}
+        entries: List[Tuple[str, int, int]] = []
+        for product in products:
+            self.products[product.id] = product
+            brand_words = normalize(product.brand).split()
+            words = brand_words + normalize(product.name).split()
+            for start in range(len(words)):
+                position = 0 if start == 0 else 1 if start == len(brand_words) else 2
+                entries.append((" ".join(words[start:]), position, product.id))
+        entries.sort()
+        self.keys = [key for key, _, _ in entries]
+        self.entries = entries
+
+    def search(self, query: str, limit: int) -> List[Suggestion]:
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        best: Dict[int, int] = {}
+        start = bisect_left(self.keys, prefix)
+        for key, position, product_id in self.entries[start:start + MAX_SCAN]:
+            if not key.startswith(prefix):
+                break
+            best[product_id] = min(position, best.get(product_id, position))
+        ranked = sorted(
+            best,
+            key=lambda pid: (best[pid], -self.products[pid].usage_count, self.products[pid].name.lower())
+        )
+        return [self.products[pid] for pid in ranked[:limit]]
+
+
+class CatalogCache:
+    """The current community PrefixIndex, swapped atomically when the catalog changes"""
+
+    def __init__(self):
+        self.index: Optional[PrefixIndex] = None
+        self.version: Optional[Tuple[int, Optional[int], Optional[datetime]]] = None
+        self._lock = threading.Lock()
+
+    def refresh(self, force: bool = False) -> bool:
+        """Rebuild the index if the community catalog changed; True if rebuilt"""
+        with self._lock:
+            db = SessionLocal()
+            try:
+                version = tuple(db.query(
+                    func.count(Product.id),
+                    func.max(Product.id),
+                    func.max(func.coalesce(Product.updated_at, Product.created_at))
+                ).filter(Product.user_id.is_(None)).one())
+                if not force and version == self.version:
+                    return False
+                rows = db.query(
+                    Product.id, Product.brand, Product.name, Product.type,
+                    func.coalesce(Product.usage_count, 0)
+                ).filter(Product.user_id.is_(None)).all()
+            finally:
+                db.close()
+            self.index = PrefixIndex(Suggestion(*row) for row in rows)
+            self.version = version
+            return True
+
+
+community_catalog = CatalogCache()
+
+catalog_refresh_job = PeriodicJob(
+    "product-catalog",
+    community_catalog.refresh,
+    interval=settings.PRODUCT_CATALOG_REFRESH_SECONDS,
+    initial_delay=0,
+)
+
+
+def _escape_like(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def search_database(db: Session, query: str, limit: int, user_id: Optional[int]) -> List[Suggestion]:
+    """Trigram-indexed substring match on brand and name; user_id None means the community catalog"""
+    label = product_label()
+    owner = Product.user_id.is_(None) if user_id is None else Product.user_id == user_id
+    rows = db.query(
+        Product.id, Product.brand, Product.name, Product.type, func.coalesce(Product.usage_count, 0)
+    ).filter(
+        owner,
+        label.ilike(f"%{_escape_like(query)}%", escape="\\")
+    ).order_by(
+        func.word_similarity(query, label).desc(), Product.name
+    ).limit(limit).all()
+    return [Suggestion(*row) for row in rows]
+
+
+def autocomplete(db: Session, query: str, limit: int, user_id: int) -> List[dict]:
+    """The user's own products first, then community products"""
+    own = search_database(db, query, limit, user_id)
+    community: List[Suggestion] = []
+    if len(own) < limit:
+        index = community_catalog.index
+        if index is not None:
+            community = index.search(query, limit - len(own))
+        else:
+            community = search_database(db, query, limit - len(own), None)
+    return [
+        {"id": s.id, "brand": s.brand, "name": s.name, "type": s.type, "community": False} for s in own
+    ] + [
+        {"id": s.id, "brand": s.brand, "name": s.name, "type": s.type, "community": True} for s in community
+    ]
@@ -0,0 +1,36 @@
+"""Coordination for periodic refresh jobs that every worker schedules.
+
+Each worker runs its own PeriodicJob; claim_refresh() lets exactly one of
+them do the work per interval, using an advisory lock for the duration of
+the transaction and the view_refreshes timestamps to skip recent runs.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.models.view_refresh import ViewRefresh
+
+
+def claim_refresh(db: Session, name: str, every: timedelta, force: bool = False) -> Optional[datetime]:
+    """Start time for this refresh, or None if another worker is running it or ran it recently"""
+    locked = db.execute(text("SELECT pg_try_advisory_xact_lock(hashtext(:key))"), {"key": f"refresh:{name}"}).scalar()
+    if not locked:
+        return None
+    now = datetime.now(timezone.utc)
+    last = db.get(ViewRefresh, name)
+    if not force and last and last.refreshed_at > now - every:
+        return None
+    return now
+
+
+def mark_refreshed(db: Session, names: Iterable[str], refreshed_at: datetime) -> None:
+    for name in names:
+        db.merge(ViewRefresh(name=name, refreshed_at=refreshed_at))
+
+
+def last_refreshed(db: Session, name: str) -> Optional[datetime]:
+    refresh = db.get(ViewRefresh, name)
+    return refresh.refreshed_at if refresh else None
@@ -0,0 +1,113 @@
+"""Public routine feed ranked by a periodically computed Bayesian average.
+
+A routine with two perfect ratings should not outrank one with two hundred
+good ones, so each score is shrunk toward the global mean:
+
+    score = (C * global_mean + sum of overall scores) / (C + rating count)
+
+with C = ROUTINE_RANKING_PRIOR_WEIGHT. Scores are written to routine_rankings
+in one set-based statement every ROUTINE_RANKING_REFRESH_MINUTES, so the feed
+itself is an indexed keyset scan.
+"""
+
+from datetime import timedelta
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text, tuple_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.jobs import PeriodicJob
+from app.models.routine import Routine
+from app.models.routine_ranking import RoutineRanking
+from app.services import refreshes
+
+REFRESH_NAME = "routine_rankings"
+
+_REFRESH_SQL = text("""
+    WITH stats AS (
+        SELECT r.id AS routine_id,
+               count(o.id) AS rating_count,
+               avg(o.overall_score) AS average_score,
+               coalesce(sum(o.overall_score), 0) AS total_score,
+               ARRAY(
+                   SELECT json_array_elements_text(
+                       CASE WHEN json_typeof(r.method_tags) = 'array' THEN r.method_tags ELSE '[]'::json END
+                   )
+               ) AS method_tags,
+               r.drying_method
+        FROM routines r
+        LEFT JOIN routine_logs l ON l.routine_id = r.id
+        LEFT JOIN outcomes o ON o.routine_log_id = l.id
+        WHERE r.is_public
+        GROUP BY r.id
+    ), prior AS (
+        SELECT coalesce(sum(total_score) / nullif(sum(rating_count), 0), 0) AS mean FROM stats
+    )
+    INSERT INTO routine_rankings
+        (routine_id, score, rating_count, average_score, method_tags, drying_method, computed_at)
+    SELECT s.routine_id,
+           (:prior_weight * prior.mean + s.total_score) / (:prior_weight + s.rating_count),
+           s.rating_count, s.average_score, s.method_tags, s.drying_method, :computed_at
+    FROM stats s CROSS JOIN prior
+    ON CONFLICT (routine_id) DO UPDATE SET
+        score = EXCLUDED.score,
+        rating_count = EXCLUDED.rating_count,
+        average_score = EXCLUDED.average_score,
+        method_tags = EXCLUDED.method_tags,
+        drying_method = EXCLUDED.drying_method,
+        computed_at = EXCLUDED.computed_at
+""")
+
+
+def refresh_routine_rankings(force: bool = False) -> bool:
+    """Recompute every public routine's score; True if this worker did the refresh"""
+    db = SessionLocal()
+    try:
+        now = refreshes.claim_refresh(
+            db, REFRESH_NAME, timedelta(minutes=settings.ROUTINE_RANKING_REFRESH_MINUTES), force
+        )
+        if now is None:
+            return False
+        db.execute(_REFRESH_SQL, {"prior_weight": settings.ROUTINE_RANKING_PRIOR_WEIGHT, "computed_at": now})
+        # Routines that were made private since the last refresh
+        db.query(RoutineRanking).filter(RoutineRanking.computed_at < now).delete(synchronize_session=False)
+        refreshes.mark_refreshed(db, [REFRESH_NAME], now)
+        db.commit()
+        return True
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+ranking_refresh_job = PeriodicJob(
+    "routine-rankings",
+    refresh_routine_rankings,
+    interval=max(60, settings.ROUTINE_RANKING_REFRESH_MINUTES * 60 / 6) if settings.ROUTINE_RANKING_REFRESH_MINUTES > 0 else 0,
+    initial_delay=0,
+)
+
+
+def get_feed(
+    db: Session,
+    limit: int,
+    after: Optional[Tuple[float, int]] = None,
+    method_tag: Optional[str] = None,
+    drying_method: Optional[str] = None,
+) -> List[Tuple[Routine, RoutineRanking]]:
+    """One page of public routines, best score first; `after` is the last (score, id) seen"""
+    query = db.query(Routine, RoutineRanking).join(
+        RoutineRanking, RoutineRanking.routine_id == Routine.id
+    ).filter(Routine.is_public.is_(True))
+    if method_tag:
+        query = query.filter(RoutineRanking.method_tags.contains([method_tag]))
+    if drying_method:
+        query = query.filter(RoutineRanking.drying_method == drying_method)
+    if after:
+        query = query.filter(tuple_(RoutineRanking.score, RoutineRanking.routine_id) < tuple_(*after))
+    return query.order_by(
+        RoutineRanking.score.desc(), RoutineRanking.routine_id.desc()
+    ).limit(limit).all()
@@ -0,0 +1,206 @@
+"""Routines like this one: nearest neighbours over hashed routine features.
+
+A routine becomes a sparse vector of its step types, products, method tags and
+drying method (hashed, so new products and tags need no vocabulary), scaled to
+unit length so cosine similarity is a dot product. Each worker keeps every
+public routine in a fitted scikit-learn NearestNeighbors index. Routines
+created, edited or deleted in this worker go into a small overlay that is
+searched alongside it and folded in by a rebuild once it grows; a periodic
+version check picks up changes made in other workers.
+"""
+
+import copy
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction import FeatureHasher
+from sklearn.neighbors import NearestNeighbors
+from sklearn.preprocessing import normalize
+from sqlalchemy import func
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.jobs import PeriodicJob
+from app.models.routine import Routine
+
+logger = logging.getLogger(__name__)
+
+N_FEATURES = 2 ** 14
+# Relative weight of each feature group; tags say the most about how a routine is done
+FEATURE_WEIGHTS = {"step": 1.0, "product": 1.0, "tag": 2.0, "drying": 1.5}
+# Overlay size at which it is merged into the fitted index
+MAX_OVERLAY = 256
+
+_hasher = FeatureHasher(n_features=N_FEATURES, input_type="dict", alternate_sign=False)
+
+
+def routine_features(steps, method_tags, drying_method) -> Dict[str, float]:
+    features: Dict[str, float] = {}
+    for step in steps or []:
+        if not isinstance(step, dict):
+            continue
+        if step.get("step_type"):
+            features[f"step:{step['step_type']}"] = FEATURE_WEIGHTS["step"]
+        if step.get("product_id") is not None:
+            features[f"product:{step['product_id']}"] = FEATURE_WEIGHTS["product"]
+    for tag in method_tags or []:
+        features[f"tag:{tag}"] = FEATURE_WEIGHTS["tag"]
+    if drying_method:
+        features[f"drying:{drying_method}"] = FEATURE_WEIGHTS["drying"]
+    return features
+
+
+def vectorize(rows: Iterable[Tuple]) -> sparse.csr_matrix:
+    """Unit-length feature rows for (steps, method_tags, drying_method) tuples"""
+    return normalize(_hasher.transform(routine_features(*row) for row in rows))
+
+
+class SimilarityIndex:
+    """Public routine vectors: a fitted index plus an overlay of local changes.
+
+    overlay maps a routine id to its new vector, or None if it was deleted or
+    made private; ids in the overlay are ignored in the fitted index.
+    """
+
+    def __init__(self, ids: List[int], vectors: sparse.csr_matrix):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.vectors = vectors
+        self.overlay: Dict[int, Optional[sparse.csr_matrix]] = {}
+        self.model: Optional[NearestNeighbors] = None
+        if len(ids):
+            # Ball trees need dense input; brute force on sparse rows is a sparse dot product
+            self.model = NearestNeighbors(metric="cosine", algorithm="brute").fit(vectors)
+
+    def vector(self, routine_id: int) -> Optional[sparse.csr_matrix]:
+        if routine_id in self.overlay:
+            return self.overlay[routine_id]
+        position = np.searchsorted(self.ids, routine_id)
+        if position < len(self.ids) and self.ids[position] == routine_id:
+            return self.vectors[position]
+        return None
+
+    def search(self, query: sparse.csr_matrix, k: int, exclude: int) -> List[Tuple[int, float]]:
+        """Top k (routine id, cosine similarity), best first"""
+        scores: Dict[int, float] = {}
+        if self.model is not None:
+            n_neighbors = min(len(self.ids), k + len(self.overlay) + 1)
+            distances, positions = self.model.kneighbors(query, n_neighbors=n_neighbors)
+            for distance, position in zip(distances[0], positions[0]):
+                routine_id = int(self.ids[position])
+                if routine_id not in self.overlay:
+                    scores[routine_id] = 1.0 - float(distance)
+        for routine_id, vector in self.overlay.items():
+            if vector is not None:
+                scores[routine_id] = float(query.multiply(vector).sum())
+        scores.pop(exclude, None)
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(routine_id, score) for routine_id, score in ranked[:k] if score > 0]
+
+    def with_change(self, routine_id: int, vector: Optional[sparse.csr_matrix]) -> "SimilarityIndex":
+        """A copy with one more overlay entry, merged once the overlay is large"""
+        updated = copy.copy(self)
+        updated.overlay = {**self.overlay, routine_id: vector}
+        return updated.merged() if len(updated.overlay) > MAX_OVERLAY else updated
+
+    def merged(self) -> "SimilarityIndex":
+        """A new fitted index with the overlay folded in"""
+        keep = [i for i, routine_id in enumerate(self.ids) if int(routine_id) not in self.overlay]
+        entries = [(int(self.ids[i]), self.vectors[i]) for i in keep]
+        entries += [(routine_id, vector) for routine_id, vector in self.overlay.items() if vector is not None]
+        entries.sort(key=lambda entry: entry[0])
+        if not entries:
+            return SimilarityIndex([], sparse.csr_matrix((0, N_FEATURES)))
+        return SimilarityIndex([rid for rid, _ in entries], sparse.vstack([v for _, v in entries]).tocsr())
+
+
+class SimilarityCache:
+    """The current SimilarityIndex for this worker"""
+
+    def __init__(self):
+        self.index: Optional[SimilarityIndex] = None
+        self.version: Optional[Tuple[int, Optional[int], Optional[datetime]]] = None
+        self._lock = threading.Lock()
+        self._building: Optional[threading.Thread] = None
+
+    def refresh(self, force: bool = False) -> bool:
+        """Rebuild from the database if public routines changed; True if rebuilt"""
+        with self._lock:
+            db = SessionLocal()
+            try:
+                version = tuple(db.query(
+                    func.count(Routine.id),
+                    func.max(Routine.id),
+                    func.max(func.coalesce(Routine.updated_at, Routine.created_at))
+                ).filter(Routine.is_public.is_(True)).one())
+                if not force and version == self.version:
+                    return False
+                rows = db.query(
+                    Routine.id, Routine.steps, Routine.method_tags, Routine.drying_method
+                ).filter(Routine.is_public.is_(True)).order_by(Routine.id).all()
+            finally:
+                db.close()
+            # FeatureHasher rejects an empty batch
+            vectors = vectorize((row[1], row[2], row[3]) for row in rows) if rows else sparse.csr_matrix((0, N_FEATURES))
+            self.index = SimilarityIndex([row[0] for row in rows], vectors)
+            self.version = version
+            return True
+
+    def build_in_background(self) -> None:
+        """Start a first build on its own thread, unless one is already running"""
+        with self._lock:
+            if self.index is not None or (self._building is not None and self._building.is_alive()):
+                return
+            self._building = threading.Thread(target=self._build, name="routine-similarity-build", daemon=True)
+            self._building.start()
+
+    def _build(self) -> None:
+        try:
+            self.refresh()
+        except Exception:
+            logger.exception("Building the routine similarity index failed")
+
+    def update(self, routine: Routine) -> None:
+        """Reflect a routine saved in this worker without waiting for the next refresh"""
+        vector = None
+        if routine.is_public:
+            vector = vectorize([(routine.steps, routine.method_tags, routine.drying_method)])
+        self._apply(routine.id, vector)
+
+    def remove(self, routine_id: int) -> None:
+        self._apply(routine_id, None)
+
+    def _apply(self, routine_id: int, vector: Optional[sparse.csr_matrix]) -> None:
+        with self._lock:
+            index = self.index
+            if index is None:
+                return
+            if vector is None and index.vector(routine_id) is None:
+                return
+            # Swapped rather than mutated, so searches in flight keep a consistent view
+            self.index = index.with_change(routine_id, vector)
+
+
+similar_routines = SimilarityCache()
+
+similarity_refresh_job = PeriodicJob(
+    "routine-similarity",
+    similar_routines.refresh,
+    interval=settings.ROUTINE_SIMILARITY_REFRESH_SECONDS,
+    initial_delay=0,
+)
+
+
+def find_similar(routine: Routine, k: int) -> Optional[List[Tuple[int, float]]]:
+    """(routine id, similarity) for the k public routines most like `routine`; None until the index is built"""
+    index = similar_routines.index
+    if index is None:
+        # First request before the background build (or with the job disabled);
+        # building here would block the event loop for the whole load and fit
+        similar_routines.build_in_background()
+        return None
+    query = vectorize([(routine.steps, routine.method_tags, routine.drying_method)])
+    return index.search(query, k, exclude=routine.id)
@@ -0,0 +1,108 @@
+"""Versioned formulas for Outcome.overall_score.
+
+Every outcome records the score_version its overall_score was computed with.
+To change the formula, add a version to SCORING_VERSIONS, deploy with
+SCORING_VERSION pointing at it (new and edited outcomes use it right away),
+then run rescore_outcomes.py to bring historical rows up to date.
+"""
+
+import logging
+from typing import Dict, NamedTuple, Optional
+
+from sqlalchemy import case, func, update
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.outcome import Outcome
+
+logger = logging.getLogger(__name__)
+
+
+class ScoringWeights(NamedTuple):
+    frizz: float
+    definition: float
+    softness: float
+    hold_full_hours: float  # hold time that earns the whole bonus
+    hold_bonus: float  # points added for hold_full_hours or more
+    cap: float
+
+
+SCORING_VERSIONS: Dict[int, ScoringWeights] = {
+    1: ScoringWeights(frizz=0.4, definition=0.3, softness=0.3, hold_full_hours=24.0, hold_bonus=1.0, cap=5.0),
+}
+
+
+def current_weights() -> ScoringWeights:
+    return SCORING_VERSIONS[settings.SCORING_VERSION]
+
+
+def calculate_overall_score(
+    frizz: int, definition: int, softness: int, hold_hours: float = None,
+    weights: Optional[ScoringWeights] = None
+) -> float:
+    """Calculate overall score from ratings (inverted frizz, weighted)"""
+    weights = weights or current_weights()
+    # Invert frizz (1 = no frizz = good, 5 = very frizzy = bad)
+    frizz_score = (6 - frizz) / 5.0
+    definition_score = definition / 5.0
+    softness_score = softness / 5.0
+    base_score = (
+        frizz_score * weights.frizz + definition_score * weights.definition + softness_score * weights.softness
+    ) * 5
+
+    # Hold hours, if given, add a bonus up to weights.hold_bonus
+    if hold_hours:
+        hold_bonus = min(hold_hours / weights.hold_full_hours, 1.0) * weights.hold_bonus
+        return min(base_score + hold_bonus, weights.cap)
+
+    return base_score
+
+
+def overall_score_sql(weights: ScoringWeights):
+    """calculate_overall_score as a SQL expression over the outcomes columns"""
+    base_score = (
+        (6 - Outcome.frizz) / 5.0 * weights.frizz
+        + Outcome.definition / 5.0 * weights.definition
+        + Outcome.softness / 5.0 * weights.softness
+    ) * 5
+    hold_bonus = func.least(Outcome.hold_hours / weights.hold_full_hours, 1.0) * weights.hold_bonus
+    return case(
+        (func.coalesce(Outcome.hold_hours, 0) != 0, func.least(base_score + hold_bonus, weights.cap)),
+        else_=base_score
+    )
+
+
+def rescore_outcomes(version: Optional[int] = None, chunk_size: int = 10000) -> int:
+    """Recompute overall_score for outcomes scored with another version; returns rows updated.
+
+    Walks the primary key in ranges and commits each range, so every
+    transaction is short and dashboards keep reading (a mix of old and new
+    scores) while it runs. Safe to interrupt and re-run, or to run twice.
+    """
+    version = settings.SCORING_VERSION if version is None else version
+    score = overall_score_sql(SCORING_VERSIONS[version])
+    db = SessionLocal()
+    try:
+        low, high = db.query(func.min(Outcome.id), func.max(Outcome.id)).filter(
+            Outcome.score_version != version
+        ).one()
+        updated = 0
+        start = low
+        while start is not None and start <= high:
+            result = db.execute(
+                update(Outcome).where(
+                    Outcome.id >= start,
+                    Outcome.id < start + chunk_size,
+                    Outcome.score_version != version
+                ).values(overall_score=score, score_version=version).execution_options(synchronize_session=False)
+            )
+            db.commit()
+            updated += result.rowcount
+            start += chunk_size
+            logger.info("Rescored outcomes up to id %s (%s rows so far)", start - 1, updated)
+        return updated
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
@@ -0,0 +1,220 @@
+"""Analytics snapshots: the training dataset as Parquet files (export_snapshot.py).
+
+A snapshot directory holds one directory per run and a manifest.json listing
+the finished runs:
+
+    <dir>/<run>/routine_logs/month=YYYY-MM/part-NNNNN.parquet
+    <dir>/<run>/products/part-NNNNN.parquet
+    <dir>/<run>/deleted/part-NNNNN.parquet     (incremental runs only)
+
+routine_logs has one row per log with its outcome (when rated), its owner's
+hair profile and that day's weather at the owner's location. The first run,
+or one with full=True, exports everything; later runs export only rows where
+any of those changed since the previous run, plus the routine logs, outcomes,
+products and accounts deleted since (from tombstones). read_snapshot() merges
+the runs back into the current dataset.
+
+Each run reads in one REPEATABLE READ transaction, so its datasets agree with
+each other. Its cursor is backdated by SYNC_OVERLAP_SECONDS like /sync cursors,
+so a row may be exported by two consecutive runs.
+"""
+
+import json
+import logging
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+import pyarrow.parquet as pq
+from sqlalchemy import DateTime, String, and_, func, literal, select, union_all
+from sqlalchemy.sql import Select
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.outcome import Outcome
+from app.models.product import Product
+from app.models.routine_log import RoutineLog
+from app.models.tombstone import Tombstone
+from app.models.user import User
+from app.models.weather import WeatherData
+from app.services import parquet
+from app.services.sync import next_cursor, oldest_cursor
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = "manifest.json"
+PROFILE_FIELDS = ("curl_pattern", "porosity", "density", "thickness", "scalp_type", "location_id")
+OUTCOME_FIELDS = ("frizz", "definition", "softness", "hold_hours", "overall_score", "score_version", "rated_at")
+WEATHER_FIELDS = ("humidity", "dew_point", "temperature", "wind_speed")
+DELETED_ENTITIES = ("routine_logs", "outcomes", "products", "users")
+# Stored as JSON text in the files; read_snapshot() decodes them
+JSON_COLUMNS = {"routine_logs": ("products_used",)}
+
+
+def _changed_at(*models_and_created):
+    return func.greatest(
+        *(func.coalesce(model.updated_at, created) for model, created in models_and_created),
+        type_=DateTime(timezone=True)
+    ).label("changed_at")
+
+
+def log_rows(since: Optional[datetime]) -> Select:
+    """Routine logs joined with outcome, profile and weather; only those changed after `since`"""
+    changed_at = _changed_at(
+        (RoutineLog, RoutineLog.created_at),
+        (Outcome, Outcome.rated_at),
+        (User, User.created_at),
+        (WeatherData, WeatherData.created_at),
+    )
+    statement = select(
+        func.to_char(RoutineLog.date, "YYYY-MM").label("month"),
+        RoutineLog.id, RoutineLog.user_id, RoutineLog.routine_id, RoutineLog.date, RoutineLog.time,
+        RoutineLog.products_used, RoutineLog.wash_day, RoutineLog.styling_method, RoutineLog.drying_method,
+        RoutineLog.time_spent,
+        *(getattr(User, field) for field in PROFILE_FIELDS),
+        Outcome.id.label("outcome_id"),
+        *(getattr(Outcome, field) for field in OUTCOME_FIELDS),
+        *(getattr(WeatherData, field) for field in WEATHER_FIELDS),
+        changed_at,
+    ).join(
+        User, User.id == RoutineLog.user_id
+    ).outerjoin(
+        Outcome, and_(Outcome.routine_log_id == RoutineLog.id, Outcome.routine_log_date == RoutineLog.date)
+    ).outerjoin(
+        WeatherData,
+        and_(
+            WeatherData.location_id == User.location_id,
+            WeatherData.date == RoutineLog.date,
+            WeatherData.found.is_(True)
+        )
+    ).where(
+        User.deletion_requested_at.is_(None)
+    # Date order keeps each chunk to a month or two, so it writes few files
+    ).order_by(RoutineLog.date, RoutineLog.id)
+    if since is not None:
+        statement = statement.where(changed_at > since)
+    return statement
+
+
+def product_rows(since: Optional[datetime]) -> Select:
+    """Community products and those of active users; only those changed after `since`"""
+    changed_at = _changed_at((Product, Product.created_at))
+    statement = select(
+        Product.id, Product.user_id, Product.brand, Product.name, Product.type, Product.ingredients,
+        Product.usage_count, Product.success_rate, changed_at,
+    ).outerjoin(
+        User, User.id == Product.user_id
+    ).where(
+        User.deletion_requested_at.is_(None)
+    ).order_by(Product.id)
+    if since is not None:
+        statement = statement.where(changed_at > since)
+    return statement
+
+
+def deleted_rows(since: datetime):
+    """(entity, id) of everything deleted after `since`, including accounts awaiting deletion"""
+    return union_all(
+        select(Tombstone.entity, Tombstone.entity_id.label("id")).where(
+            Tombstone.entity.in_(DELETED_ENTITIES),
+            Tombstone.deleted_at > since
+        ),
+        select(literal("users", String).label("entity"), User.id).where(
+            User.deletion_requested_at > since
+        ),
+    )
+
+
+def load_manifest(directory: Path) -> dict:
+    path = directory / MANIFEST
+    return json.loads(path.read_text()) if path.exists() else {"runs": []}
+
+
+def _save_manifest(directory: Path, manifest: dict) -> None:
+    # Replaced in one step, so a crash never leaves a half-written manifest
+    temporary = directory / f".{MANIFEST}.tmp"
+    temporary.write_text(json.dumps(manifest, indent=2))
+    os.replace(temporary, directory / MANIFEST)
+
+
+def run_snapshot(directory: Path, full: bool = False, chunk_size: Optional[int] = None) -> dict:
+    """Export a run into `directory` and add it to the manifest; returns the run's manifest entry"""
+    chunk_size = chunk_size or settings.SNAPSHOT_CHUNK_ROWS
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest = load_manifest(directory)
+
+    workdir = None
+    db = SessionLocal()
+    try:
+        connection = db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        now = connection.execute(select(func.now())).scalar()
+        since = None
+        if manifest["runs"] and not full:
+            since = datetime.fromisoformat(manifest["runs"][-1]["cursor"])
+            if since < oldest_cursor(now):
+                logger.warning("Last snapshot is older than the tombstone retention; exporting everything")
+                since = None
+
+        mode = "full" if since is None else "incremental"
+        run_id = f"{now:%Y%m%dT%H%M%S}-{mode}"
+        workdir = directory / f".{run_id}.tmp"
+        shutil.rmtree(workdir, ignore_errors=True)
+        datasets = {"routine_logs": (log_rows(since), "month"), "products": (product_rows(since), None)}
+        if since is not None:
+            datasets["deleted"] = (deleted_rows(since), None)
+
+        rows = {}
+        for name, (statement, partition_by) in datasets.items():
+            files = parquet.write_query(connection, statement, workdir / name, chunk_size, partition_by)
+            rows[name] = sum(pq.ParquetFile(path).metadata.num_rows for path in files)
+    except Exception:
+        if workdir is not None:
+            shutil.rmtree(workdir, ignore_errors=True)
+        raise
+    finally:
+        db.rollback()
+        db.close()
+
+    os.replace(workdir, directory / run_id)
+    entry = {
+        "id": run_id,
+        "mode": mode,
+        "since": since.isoformat() if since else None,
+        "cursor": next_cursor(now).isoformat(),
+        "rows": rows,
+    }
+    manifest["runs"].append(entry)
+    _save_manifest(directory, manifest)
+    logger.info("Snapshot %s written to %s: %s", run_id, directory, rows)
+    return entry
+
+
+def read_snapshot(directory: Path, dataset: str = "routine_logs") -> pd.DataFrame:
+    """The current routine_logs or products: runs from the latest full one on, newest row per id wins"""
+    runs = load_manifest(directory)["runs"]
+    fulls = [index for index, run in enumerate(runs) if run["mode"] == "full"]
+    if not fulls:
+        raise ValueError(f"No full snapshot in {directory}")
+    runs = runs[fulls[-1]:]
+
+    frames = [pd.read_parquet(directory / run["id"] / dataset) for run in runs if run["rows"].get(dataset)]
+    deleted = [pd.read_parquet(directory / run["id"] / "deleted") for run in runs if run["rows"].get("deleted")]
+    frame = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    if frame.empty:
+        return frame
+    frame = frame.drop_duplicates(subset="id", keep="last").reset_index(drop=True)
+    for column in JSON_COLUMNS.get(dataset, ()):
+        frame[column] = frame[column].map(lambda value: None if value is None else json.loads(value))
+    if not deleted:
+        return frame
+
+    gone = pd.concat(deleted, ignore_index=True).groupby("entity")["id"].apply(set)
+    frame = frame[~frame["id"].isin(gone.get(dataset, set()))]
+    frame = frame[~frame["user_id"].isin(gone.get("users", set()))]
+    if dataset == "routine_logs":
+        unrated = frame["outcome_id"].isin(gone.get("outcomes", set()))
+        frame.loc[unrated, ["outcome_id", *OUTCOME_FIELDS]] = None
+    return frame.reset_index(drop=True)
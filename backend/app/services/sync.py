@@ -0,0 +1,164 @@
+"""Delta sync for offline clients.
+
+A sync cursor is a database timestamp. /sync returns every row of the user's
+data whose updated_at (or creation time, for rows never edited) is after it,
+plus tombstones for rows deleted since. Tombstones are written from a session
+hook, so ORM cascades (a routine's logs, a log's outcome) are covered too.
+
+updated_at is the time the writing transaction started, not when it
+committed, so new cursors are backdated by SYNC_OVERLAP_SECONDS; clients may
+see a recent change twice and must apply changes as idempotent upserts.
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import event, func, insert, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.jobs import PeriodicJob
+from app.models.outcome import Outcome
+from app.models.product import Product
+from app.models.routine import Routine
+from app.models.routine_log import RoutineLog
+from app.models.tombstone import Tombstone
+from app.models.user import User
+from app.models.weather import WeatherData
+from app.schemas.outcome import Outcome as OutcomeSchema
+from app.schemas.product import Product as ProductSchema
+from app.schemas.routine import Routine as RoutineSchema
+from app.schemas.routine_log import RoutineLog as RoutineLogSchema
+from app.schemas.weather import WeatherData as WeatherDataSchema
+
+# Entity name in /sync responses and tombstones for each synced model
+ENTITIES = {
+    Product: "products",
+    Routine: "routines",
+    RoutineLog: "routine_logs",
+    Outcome: "outcomes",
+}
+
+
+@event.listens_for(Session, "after_flush")
+def _record_tombstones(session: Session, flush_context) -> None:
+    deleted = [obj for obj in session.deleted if type(obj) in ENTITIES or isinstance(obj, User)]
+    if not deleted:
+        return
+    # A deleted account takes its data with it; nobody is left to sync it
+    gone_users = {obj.id for obj in deleted if isinstance(obj, User)}
+    log_owners = {obj.id: obj.user_id for obj in deleted if isinstance(obj, RoutineLog)}
+    missing = {obj.routine_log_id for obj in deleted if isinstance(obj, Outcome)} - set(log_owners)
+    if missing:
+        log_owners.update(session.execute(
+            select(RoutineLog.id, RoutineLog.user_id).where(RoutineLog.id.in_(missing))
+        ).all())
+
+    rows = []
+    for obj in deleted:
+        if isinstance(obj, User):
+            continue
+        user_id = log_owners.get(obj.routine_log_id) if isinstance(obj, Outcome) else obj.user_id
+        if user_id in gone_users:
+            continue
+        rows.append({"user_id": user_id, "entity": ENTITIES[type(obj)], "entity_id": obj.id})
+    if rows:
+        session.execute(insert(Tombstone), rows)
+
+
+def _changed(model, since: Optional[datetime], created_column=None) -> list:
+    """Filters for rows changed after `since` (none on a first sync)"""
+    if since is None:
+        return []
+    return [func.coalesce(model.updated_at, created_column or model.created_at) > since]
+
+
+def changes_since(db: Session, user: User, since: Optional[datetime]) -> dict:
+    """Rows created or updated after `since`, and ids deleted since then"""
+    changes: Dict[str, List] = {
+        "products": [
+            ProductSchema.model_validate(row) for row in db.query(Product).filter(
+                or_(Product.user_id == user.id, Product.user_id.is_(None)),
+                *_changed(Product, since)
+            ).order_by(Product.id)
+        ],
+        "routines": [
+            RoutineSchema.model_validate(row) for row in db.query(Routine).filter(
+                Routine.user_id == user.id,
+                *_changed(Routine, since)
+            ).order_by(Routine.id)
+        ],
+        "routine_logs": [
+            RoutineLogSchema.model_validate(row) for row in db.query(RoutineLog).filter(
+                RoutineLog.user_id == user.id,
+                *_changed(RoutineLog, since)
+            ).order_by(RoutineLog.id)
+        ],
+        "outcomes": [
+            OutcomeSchema.model_validate(row) for row in db.query(Outcome).join(
+                RoutineLog, Outcome.routine_log_id == RoutineLog.id
+            ).filter(
+                RoutineLog.user_id == user.id,
+                *_changed(Outcome, since, Outcome.rated_at)
+            ).order_by(Outcome.id)
+        ],
+        "weather": [],
+    }
+
+    # Weather is shared per location; after a profile change (possibly a new
+    # location) send the whole list and tell the client to replace its copy
+    full = since is None or (user.updated_at is not None and user.updated_at > since)
+    if user.location_id is not None:
+        changes["weather"] = [
+            WeatherDataSchema.model_validate(row) for row in db.query(WeatherData).filter(
+                WeatherData.location_id == user.location_id,
+                WeatherData.found.is_(True),
+                *_changed(WeatherData, None if full else since)
+            ).order_by(WeatherData.date)
+        ]
+
+    deleted: Dict[str, List[int]] = {entity: [] for entity in ENTITIES.values()}
+    if since is not None:
+        tombstones = db.query(Tombstone.entity, Tombstone.entity_id).filter(
+            or_(
+                Tombstone.user_id == user.id,
+                (Tombstone.user_id.is_(None)) & (Tombstone.entity == "products")
+            ),
+            Tombstone.deleted_at > since
+        ).order_by(Tombstone.id)
+        for entity, entity_id in tombstones:
+            deleted[entity].append(entity_id)
+
+    # Entities the client should replace wholesale rather than merge
+    replace = list(changes) if since is None else ["weather"] if full else []
+    return {"changes": changes, "deleted": deleted, "replace": replace}
+
+
+def oldest_cursor(now: datetime) -> datetime:
+    """Cursors older than this may have missed purged tombstones"""
+    return now - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+
+
+def next_cursor(now: datetime) -> datetime:
+    return now - timedelta(seconds=settings.SYNC_OVERLAP_SECONDS)
+
+
+def purge_tombstones() -> int:
+    """Delete tombstones past the retention window; returns how many"""
+    db = SessionLocal()
+    try:
+        now = db.execute(select(func.now())).scalar()
+        purged = db.query(Tombstone).filter(
+            Tombstone.deleted_at < oldest_cursor(now)
+        ).delete(synchronize_session=False)
+        db.commit()
+        return purged
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+tombstone_purge_job = PeriodicJob("tombstone-purge", purge_tombstones, interval=6 * 3600)
@@ -0,0 +1,236 @@
+"""Weather lookups backed by canonical locations and shared (location, date) rows.
+
+Free text is geocoded once into geocode_cache -> locations, and every
+(location, date) pair is fetched from OpenWeatherMap at most once into
+weather_data, which all users at that location share. "No data" answers are
+negatively cached for WEATHER_NEGATIVE_CACHE_HOURS.
+
+No transaction or pooled connection is held while waiting on upstream.
+Concurrent misses for one key share a single request within a worker; across
+workers they may both fetch, and a short Postgres advisory lock around the
+write makes the first stored answer win.
+"""
+
+import asyncio
+import re
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Awaitable, Callable, Dict, Optional
+
+import httpx
+from fastapi import HTTPException, status
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.location import GeocodeCache, Location
+from app.models.weather import WeatherData
+
+
+class UpstreamNotFound(Exception):
+    """Upstream answered definitively that it has no data (safe to cache)"""
+
+
+def normalize_location(location: str) -> str:
+    """Canonical cache key for free text like ' Austin ,  TX '"""
+    parts = [re.sub(r"\s+", " ", part).strip().lower() for part in location.split(",")]
+    return ",".join(part for part in parts if part)
+
+
+def location_key(latitude: float, longitude: float) -> str:
+    # ~1 km precision, so nearby spellings of the same city share weather
+    return f"{latitude:.2f},{longitude:.2f}"
+
+
+def _negative_expiry() -> datetime:
+    return datetime.now(timezone.utc) + timedelta(hours=settings.WEATHER_NEGATIVE_CACHE_HOURS)
+
+
+def _is_live(expires_at: Optional[datetime]) -> bool:
+    return expires_at is None or expires_at > datetime.now(timezone.utc)
+
+
+def _lock(db: Session, key: str) -> None:
+    """Serialize writes of one cache key across workers until commit/rollback"""
+    db.execute(text("SELECT pg_advisory_xact_lock(hashtext(:key))"), {"key": key})
+
+
+_in_flight: Dict[str, asyncio.Future] = {}
+
+
+async def _single_flight(key: str, fetch: Callable[[], Awaitable[dict]]) -> dict:
+    """Run fetch() once for all of this worker's concurrent callers asking for `key`"""
+    task = _in_flight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(fetch())
+        _in_flight[key] = task
+        task.add_done_callback(lambda _: _in_flight.pop(key, None))
+    # Shielded, so one caller disconnecting does not cancel the others' request
+    return await asyncio.shield(task)
+
+
+async def _fetch_or_none(key: str, fetch: Callable[[], Awaitable[dict]]) -> Optional[dict]:
+    """The upstream answer, or None when upstream has no data"""
+    try:
+        return await _single_flight(key, fetch)
+    except UpstreamNotFound:
+        return None
+
+
+def _require_api_key() -> None:
+    if not settings.WEATHER_API_KEY:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Weather API key not configured"
+        )
+
+
+async def _get_json(url: str, params: dict) -> object:
+    """GET from OpenWeatherMap; 4xx means "no data", anything else is transient"""
+    async with httpx.AsyncClient() as client:
+        try:
+            response = await client.get(
+                url, params={**params, "appid": settings.WEATHER_API_KEY}, timeout=10.0
+            )
+        except httpx.HTTPError as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Failed to fetch weather data: {str(e)}"
+            )
+    if response.status_code in (400, 404):
+        raise UpstreamNotFound(response.text)
+    if response.status_code >= 400:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Failed to fetch weather data: upstream returned {response.status_code}"
+        )
+    return response.json()
+
+
+async def fetch_geocode_from_api(query: str) -> dict:
+    """Resolve free-text location to coordinates via the geocoding API"""
+    results = await _get_json(f"{settings.WEATHER_GEOCODING_URL}/direct", {"q": query, "limit": 1})
+    if not results:
+        raise UpstreamNotFound(query)
+    top = results[0]
+    name = ", ".join(part for part in (top.get("name"), top.get("state"), top.get("country")) if part)
+    return {"name": name, "latitude": top["lat"], "longitude": top["lon"]}
+
+
+async def fetch_weather_from_api(latitude: float, longitude: float, target_date: date) -> dict:
+    """Current conditions for today, the historical record (at noon UTC) for past dates"""
+    if target_date >= date.today():
+        data = await _get_json(
+            f"{settings.WEATHER_API_URL}/weather",
+            {"lat": latitude, "lon": longitude, "units": "metric"},
+        )
+        main = data["main"]
+        return {
+            "humidity": main["humidity"],
+            "dew_point": data.get("dew_point", main["temp"] - (100 - main["humidity"]) / 5),  # Approximation
+            "temperature": main["temp"],
+            "wind_speed": data.get("wind", {}).get("speed", 0),
+        }
+
+    noon = datetime.combine(target_date, time(12, 0), tzinfo=timezone.utc)
+    data = await _get_json(
+        f"{settings.WEATHER_ONECALL_URL}/timemachine",
+        {"lat": latitude, "lon": longitude, "dt": int(noon.timestamp()), "units": "metric"},
+    )
+    if not data.get("data"):
+        raise UpstreamNotFound(f"{latitude},{longitude} {target_date}")
+    observation = data["data"][0]
+    return {
+        "humidity": observation["humidity"],
+        "dew_point": observation.get("dew_point", observation["temp"] - (100 - observation["humidity"]) / 5),
+        "temperature": observation["temp"],
+        "wind_speed": observation.get("wind_speed", 0),
+    }
+
+
+def _location_for(db: Session, query: str, result: dict) -> Location:
+    """Find or create the canonical location for a geocoding result"""
+    key = location_key(result["latitude"], result["longitude"])
+    place = db.query(Location).filter(Location.key == key).first()
+    if place is None:
+        # Upgrade a text-only location created before this query could be geocoded
+        place = db.query(Location).filter(Location.key == f"q:{query}").first()
+        if place is None:
+            place = Location()
+            db.add(place)
+        place.key = key
+        place.name = result["name"]
+        place.latitude, place.longitude = result["latitude"], result["longitude"]
+    return place
+
+
+async def geocode(db: Session, location: str) -> Location:
+    """Canonical location for free text, geocoded upstream at most once"""
+    query = normalize_location(location)
+    cached = db.query(GeocodeCache).filter(GeocodeCache.query == query)
+    entry = cached.first()
+    if entry is None or not _is_live(entry.expires_at):
+        _require_api_key()
+        db.commit()
+        result = await _fetch_or_none(f"geocode:{query}", lambda: fetch_geocode_from_api(query))
+        _lock(db, f"geocode:{query}")
+        entry = cached.populate_existing().first()
+        # Another worker may have stored an answer while this one waited
+        if entry is None or not _is_live(entry.expires_at):
+            if entry is None:
+                entry = GeocodeCache(query=query)
+                db.add(entry)
+            if result is not None:
+                entry.location = _location_for(db, query, result)
+                entry.found, entry.expires_at = True, None
+            else:
+                entry.location = None
+                entry.found, entry.expires_at = False, _negative_expiry()
+        db.commit()
+
+    if not entry.found:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Location '{location}' could not be found"
+        )
+    return entry.location
+
+
+async def get_weather(db: Session, place: Location, target_date: date) -> WeatherData:
+    """Shared weather row for a location and date, fetched upstream at most once"""
+    if target_date > date.today():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Weather can only be fetched for today or past dates"
+        )
+    if place.latitude is None:
+        # Text-only location carried over from before geocoding; resolve it now
+        place = await geocode(db, place.name)
+
+    query = db.query(WeatherData).filter(WeatherData.location_id == place.id, WeatherData.date == target_date)
+    entry = query.first()
+    if entry is None or not _is_live(entry.expires_at):
+        _require_api_key()
+        key = f"weather:{place.id}:{target_date.isoformat()}"
+        location_id, latitude, longitude = place.id, place.latitude, place.longitude
+        db.commit()
+        metrics = await _fetch_or_none(key, lambda: fetch_weather_from_api(latitude, longitude, target_date))
+        _lock(db, key)
+        entry = query.populate_existing().first()
+        if entry is None or not _is_live(entry.expires_at):
+            if entry is None:
+                entry = WeatherData(location_id=location_id, date=target_date)
+                db.add(entry)
+            if metrics is not None:
+                entry.found, entry.expires_at = True, None
+                for field, value in metrics.items():
+                    setattr(entry, field, value)
+            else:
+                entry.found, entry.expires_at = False, _negative_expiry()
+        db.commit()
+
+    if not entry.found:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No weather data available for '{place.name}' on {target_date}"
+        )
+    return entry
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Requests-per-second of authenticated requests with and without stateless tokens.
+
+Boots the API twice, once with AUTH_STATELESS_TOKENS=false (user row loaded
+on every request) and once with it enabled (claims + revocation list only),
+and drives the same authenticated endpoint at fixed concurrency.
+
+Usage (from backend/):
+    python -m benchmarks.auth --duration 20 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+from benchmarks.common import running_api, summarize, write_results
+
+PASSWORD = "bench-password-123"
+MODES = {"database_lookup": "false", "stateless": "true"}
+
+
+async def drive(base_url: str, path: str, token: str, duration: float, concurrency: int) -> dict:
+    latencies: List[float] = []
+    errors = 0
+    headers = {"Authorization": f"Bearer {token}"}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        async def worker(deadline: float) -> None:
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(path, headers=headers)
+                    ok = response.status_code == 200
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    latencies.append((time.perf_counter() - started) * 1000)
+                else:
+                    errors += 1
+
+        # Warm up connections and caches before measuring
+        await asyncio.gather(*(worker(time.perf_counter() + 2.0) for _ in range(concurrency)))
+        latencies.clear()
+        errors = 0
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(started + duration) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return summarize(latencies, errors, elapsed)
+
+
+def get_token(base_url: str, email: str) -> str:
+    with httpx.Client(base_url=base_url, timeout=30.0) as client:
+        client.post("/api/v1/auth/register", json={"email": email, "password": PASSWORD})
+        response = client.post("/api/v1/auth/login", data={"username": email, "password": PASSWORD})
+        response.raise_for_status()
+        return response.json()["access_token"]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare auth modes by requests per second")
+    parser.add_argument("--database-url", help="DATABASE_URL for the booted API (defaults to settings)")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    parser.add_argument("--duration", type=float, default=20.0, help="Measured seconds per mode")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent clients")
+    parser.add_argument("--path", default="/api/v1/routines", help="Authenticated endpoint to drive")
+    parser.add_argument("--output", default="benchmark_results/auth.json", help="Result JSON path")
+    args = parser.parse_args()
+
+    email = f"bench-auth-{int(time.time())}@example.com"
+    results: Dict[str, dict] = {}
+    for mode, flag in MODES.items():
+        with running_api(args.database_url, args.workers, {"AUTH_STATELESS_TOKENS": flag}) as base_url:
+            token = get_token(base_url, email)
+            results[mode] = asyncio.run(drive(base_url, args.path, token, args.duration, args.concurrency))
+        stats = results[mode]
+        print(f"{mode:16} {stats['throughput_rps']:>9} req/s  p50 {stats['p50_ms']} ms  p99 {stats['p99_ms']} ms  errors {stats['errors']}")
+
+    baseline: Optional[float] = results["database_lookup"]["throughput_rps"]
+    if baseline:
+        speedup = results["stateless"]["throughput_rps"] / baseline
+        results["stateless_speedup"] = round(speedup, 3)
+        print(f"stateless / database_lookup throughput: {speedup:.2f}x")
+
+    write_results(args.output, "auth", vars(args), results)
+    print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
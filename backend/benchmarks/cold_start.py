@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Cold-start time budget for a single API worker.
+
+Measures, over several fresh processes:
+  * import time of `main` (everything a worker imports before serving)
+  * boot time from process spawn until /health answers
+  * latency of the first requests a new worker serves
+
+and fails when the median of any phase exceeds its budget, so slow imports or
+expensive startup work show up before they reach autoscaling.
+
+Usage (from backend/):
+    python -m benchmarks.cold_start --runs 5 --output benchmark_results/cold_start.json
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+from benchmarks.common import BACKEND_DIR, running_api, write_results
+
+# Median milliseconds allowed per phase
+DEFAULT_BUDGET_MS: Dict[str, float] = {
+    "import_ms": 2000.0,
+    "boot_to_ready_ms": 3000.0,
+    "first_health_ms": 50.0,
+    "first_openapi_ms": 500.0,
+    "first_authenticated_ms": 300.0,
+}
+
+IMPORT_SNIPPET = (
+    "import time; started = time.perf_counter(); import main; "
+    "print((time.perf_counter() - started) * 1000)"
+)
+
+
+def measure_import(database_url: Optional[str]) -> float:
+    env = os.environ.copy()
+    if database_url:
+        env["DATABASE_URL"] = database_url
+    output = subprocess.check_output([sys.executable, "-c", IMPORT_SNIPPET], cwd=BACKEND_DIR, env=env)
+    return float(output.decode().strip().splitlines()[-1])
+
+
+def timed_get(client: httpx.Client, path: str, **kwargs) -> float:
+    started = time.perf_counter()
+    response = client.get(path, **kwargs)
+    elapsed = (time.perf_counter() - started) * 1000
+    response.raise_for_status()
+    return elapsed
+
+
+def measure_boot(database_url: Optional[str], email: Optional[str], password: Optional[str]) -> Dict[str, float]:
+    spawned = time.perf_counter()
+    with running_api(database_url) as base_url:
+        sample = {"boot_to_ready_ms": (time.perf_counter() - spawned) * 1000}
+        with httpx.Client(base_url=base_url, timeout=30.0) as client:
+            # The readiness poll already hit /health once; this is the first "real" hit
+            sample["first_health_ms"] = timed_get(client, "/health")
+            sample["first_openapi_ms"] = timed_get(client, "/openapi.json")
+            if email and password:
+                token = client.post(
+                    "/api/v1/auth/login", data={"username": email, "password": password}
+                ).json()["access_token"]
+                sample["first_authenticated_ms"] = timed_get(
+                    client, "/api/v1/users/me", headers={"Authorization": f"Bearer {token}"}
+                )
+    return sample
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure API worker cold-start time")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh processes to measure")
+    parser.add_argument("--database-url", help="DATABASE_URL for the booted API (defaults to settings)")
+    parser.add_argument("--email", help="Existing user for the first authenticated request")
+    parser.add_argument("--password", help="Password for --email")
+    parser.add_argument("--output", default="benchmark_results/cold_start.json", help="Result JSON path")
+    for phase, budget in DEFAULT_BUDGET_MS.items():
+        parser.add_argument(f"--budget-{phase.replace('_', '-')}", type=float, default=budget,
+                            help=f"Median budget for {phase} (default {budget})")
+    args = parser.parse_args()
+
+    samples: Dict[str, List[float]] = {}
+    for _ in range(args.runs):
+        samples.setdefault("import_ms", []).append(measure_import(args.database_url))
+        for phase, value in measure_boot(args.database_url, args.email, args.password).items():
+            samples.setdefault(phase, []).append(value)
+
+    results = {}
+    over_budget = []
+    for phase, values in samples.items():
+        budget = getattr(args, f"budget_{phase}")
+        median = statistics.median(values)
+        results[phase] = {
+            "median": round(median, 2),
+            "min": round(min(values), 2),
+            "max": round(max(values), 2),
+            "budget": budget,
+            "within_budget": median <= budget,
+        }
+        if median > budget:
+            over_budget.append(phase)
+        print(f"{phase:24} median {median:9.2f} ms  (budget {budget:.0f} ms){'  OVER' if median > budget else ''}")
+
+    write_results(args.output, "cold_start", {"runs": args.runs}, results)
+    print(f"Results written to {args.output}")
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""Shared helpers for benchmark scripts: booting the API, stats and result files"""
+
+import json
+import math
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def free_port() -> int:
+    """Ask the OS for an unused TCP port"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_healthy(base_url: str, timeout: float = 30.0) -> float:
+    """Poll /health until the server answers; returns seconds waited"""
+    started = time.perf_counter()
+    deadline = started + timeout
+    while time.perf_counter() < deadline:
+        try:
+            response = httpx.get(f"{base_url}/health", timeout=1.0)
+            if response.status_code == 200:
+                return time.perf_counter() - started
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.05)
+    raise RuntimeError(f"API at {base_url} did not become healthy within {timeout}s")
+
+
+@contextmanager
+def running_api(
+    database_url: Optional[str] = None,
+    workers: int = 1,
+    extra_env: Optional[Dict[str, str]] = None,
+) -> Iterator[str]:
+    """Boot `main:app` under uvicorn in a subprocess and yield its base URL"""
+    port = free_port()
+    env = os.environ.copy()
+    # Benchmarks measure the handlers, not the rate limiter; pass
+    # extra_env={"RATE_LIMIT_ENABLED": "true"} to include it
+    env["RATE_LIMIT_ENABLED"] = "false"
+    if database_url:
+        env["DATABASE_URL"] = database_url
+    if extra_env:
+        env.update(extra_env)
+
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "main:app",
+            "--host", "127.0.0.1",
+            "--port", str(port),
+            "--workers", str(workers),
+            "--log-level", "warning",
+        ],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        wait_until_healthy(base_url)
+        yield base_url
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    # Multiply first: pct / 100 * n can land just above an integer (0.07 * 100 = 7.000000000000001)
+    rank = max(math.ceil(pct * len(sorted_values) / 100.0) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def summarize(latencies_ms: List[float], errors: int, duration_s: float) -> dict:
+    """Latency percentiles and throughput for one endpoint"""
+    values = sorted(latencies_ms)
+    return {
+        "requests": len(values),
+        "errors": errors,
+        "throughput_rps": round(len(values) / duration_s, 2) if duration_s else None,
+        "mean_ms": round(sum(values) / len(values), 2) if values else None,
+        "p50_ms": _round(percentile(values, 50)),
+        "p95_ms": _round(percentile(values, 95)),
+        "p99_ms": _round(percentile(values, 99)),
+        "max_ms": _round(values[-1] if values else None),
+    }
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 2) if value is not None else None
+
+
+def git_revision() -> Optional[str]:
+    """Current commit hash, so result files can be traced back to code"""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(path: str, benchmark: str, config: dict, results: dict) -> None:
+    """Write a benchmark run as JSON with enough metadata to compare runs"""
+    payload = {
+        "benchmark": benchmark,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "host": platform.node(),
+        "config": config,
+        "results": results,
+    }
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2, sort_keys=True)
+
+
+def load_results(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
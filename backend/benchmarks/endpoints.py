@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""Mixed-traffic load test for the v1 API.
+
+Boots `main:app` under uvicorn (or targets an already running server), drives
+a weighted mix of realistic requests from concurrent async clients and reports
+p50/p95/p99 latency and throughput per endpoint. Results are written as JSON
+so two runs can be compared.
+
+Usage (from backend/):
+    python -m benchmarks.endpoints --duration 60 --concurrency 32 --output results/run.json
+    python -m benchmarks.endpoints --compare results/before.json results/after.json
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+import httpx
+
+from benchmarks.common import load_results, running_api, summarize, write_results
+
+API = "/api/v1"
+PASSWORD = "bench-password-123"
+
+# Relative weights of each request type in the traffic mix
+TRAFFIC_MIX: Dict[str, int] = {
+    "login": 2,
+    "routine_log_create": 8,
+    "outcome_create": 6,
+    "dashboard_stats": 12,
+    "dashboard_trends": 12,
+    "dashboard_insights": 8,
+    "products_list": 14,
+    "routines_list": 10,
+    "routine_logs_list": 16,
+    "outcomes_list": 12,
+}
+
+STYLING_METHODS = ["wash-and-go", "twist-out", "braid-out", "roller-set"]
+DRYING_METHODS = ["air-dry", "diffuser", "hooded-dryer"]
+
+
+@dataclass
+class BenchUser:
+    email: str
+    token: str = ""
+    pending_log_ids: List[int] = field(default_factory=list)
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.token}"}
+
+
+@dataclass
+class Recorder:
+    latencies: Dict[str, List[float]] = field(default_factory=lambda: defaultdict(list))
+    errors: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+    def record(self, name: str, started: float, response: Optional[httpx.Response]) -> None:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if response is None or response.status_code >= 400:
+            self.errors[name] += 1
+        else:
+            self.latencies[name].append(elapsed_ms)
+
+
+def random_log_payload(rng: random.Random) -> dict:
+    return {
+        "date": (date.today() - timedelta(days=rng.randint(0, 120))).isoformat(),
+        "wash_day": rng.random() < 0.7,
+        "styling_method": rng.choice(STYLING_METHODS),
+        "drying_method": rng.choice(DRYING_METHODS),
+        "time_spent": rng.randint(10, 90),
+        "notes": "benchmark log",
+    }
+
+
+def random_outcome_payload(rng: random.Random, log_id: int) -> dict:
+    return {
+        "routine_log_id": log_id,
+        "frizz": rng.randint(1, 5),
+        "definition": rng.randint(1, 5),
+        "softness": rng.randint(1, 5),
+        "hold_hours": round(rng.uniform(4, 72), 1),
+    }
+
+
+async def login(client: httpx.AsyncClient, user: BenchUser) -> httpx.Response:
+    response = await client.post(
+        f"{API}/auth/login", data={"username": user.email, "password": PASSWORD}
+    )
+    if response.status_code == 200:
+        user.token = response.json()["access_token"]
+    return response
+
+
+async def create_log(client: httpx.AsyncClient, user: BenchUser, rng: random.Random) -> httpx.Response:
+    response = await client.post(
+        f"{API}/routine-logs", json=random_log_payload(rng), headers=user.headers
+    )
+    if response.status_code == 201:
+        user.pending_log_ids.append(response.json()["id"])
+    return response
+
+
+async def setup_users(
+    client: httpx.AsyncClient, count: int, seed_logs: int, run_tag: str, rng: random.Random
+) -> List[BenchUser]:
+    """Register and log in benchmark users, then give each a small history"""
+    users = []
+    for i in range(count):
+        user = BenchUser(email=f"bench-{run_tag}-{i}@example.com")
+        await client.post(
+            f"{API}/auth/register",
+            json={
+                "email": user.email,
+                "password": PASSWORD,
+                "curl_pattern": rng.choice(["2C", "3A", "3B", "3C", "4A"]),
+                "porosity": rng.choice(["low", "medium", "high"]),
+            },
+        )
+        response = await login(client, user)
+        response.raise_for_status()
+        for _ in range(seed_logs):
+            await create_log(client, user, rng)
+        # Rate most of the seeded logs so dashboard aggregates have data to work on
+        for _ in range(len(user.pending_log_ids) * 3 // 4):
+            log_id = user.pending_log_ids.pop()
+            await client.post(
+                f"{API}/outcomes", json=random_outcome_payload(rng, log_id), headers=user.headers
+            )
+        users.append(user)
+    return users
+
+
+async def run_request(
+    name: str, client: httpx.AsyncClient, user: BenchUser, rng: random.Random, recorder: Recorder
+) -> None:
+    started = time.perf_counter()
+    response: Optional[httpx.Response] = None
+    try:
+        if name == "login":
+            response = await login(client, user)
+        elif name == "routine_log_create":
+            response = await create_log(client, user, rng)
+        elif name == "outcome_create":
+            if not user.pending_log_ids:
+                # Needs a log without an outcome; the log write is recorded on its own
+                await run_request("routine_log_create", client, user, rng, recorder)
+                started = time.perf_counter()
+            # Still none if the log write was rejected (e.g. 429); counts as a failed outcome write
+            if user.pending_log_ids:
+                log_id = user.pending_log_ids.pop()
+                response = await client.post(
+                    f"{API}/outcomes", json=random_outcome_payload(rng, log_id), headers=user.headers
+                )
+        elif name == "dashboard_stats":
+            response = await client.get(f"{API}/dashboard/stats", headers=user.headers)
+        elif name == "dashboard_trends":
+            response = await client.get(
+                f"{API}/dashboard/trends", params={"days": rng.choice([7, 30, 90])}, headers=user.headers
+            )
+        elif name == "dashboard_insights":
+            response = await client.get(f"{API}/dashboard/insights", headers=user.headers)
+        elif name == "products_list":
+            response = await client.get(f"{API}/products", headers=user.headers)
+        elif name == "routines_list":
+            response = await client.get(f"{API}/routines", headers=user.headers)
+        elif name == "routine_logs_list":
+            response = await client.get(f"{API}/routine-logs", headers=user.headers)
+        elif name == "outcomes_list":
+            response = await client.get(f"{API}/outcomes", headers=user.headers)
+        else:
+            raise ValueError(f"Unknown request type: {name}")
+    except httpx.HTTPError:
+        response = None
+    recorder.record(name, started, response)
+
+
+async def virtual_client(
+    worker_id: int,
+    client: httpx.AsyncClient,
+    users: List[BenchUser],
+    seed: int,
+    deadline: float,
+    recorder: Recorder,
+) -> None:
+    rng = random.Random(seed * 1000 + worker_id)
+    names = list(TRAFFIC_MIX)
+    weights = [TRAFFIC_MIX[n] for n in names]
+    user = users[worker_id % len(users)]
+    while time.perf_counter() < deadline:
+        name = rng.choices(names, weights=weights)[0]
+        await run_request(name, client, user, rng, recorder)
+
+
+async def run_load(base_url: str, args: argparse.Namespace) -> dict:
+    rng = random.Random(args.seed)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.timeout) as client:
+        run_tag = f"{args.seed}-{int(time.time())}"
+        users = await setup_users(client, args.users, args.seed_logs, run_tag, rng)
+
+        if args.warmup > 0:
+            await asyncio.gather(*(
+                virtual_client(i, client, users, args.seed, time.perf_counter() + args.warmup, Recorder())
+                for i in range(args.concurrency)
+            ))
+
+        recorder = Recorder()
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(*(
+            virtual_client(i, client, users, args.seed, deadline, recorder)
+            for i in range(args.concurrency)
+        ))
+        duration = time.perf_counter() - started
+
+    endpoints = {
+        name: summarize(recorder.latencies.get(name, []), recorder.errors.get(name, 0), duration)
+        for name in TRAFFIC_MIX
+    }
+    all_latencies = [value for values in recorder.latencies.values() for value in values]
+    return {
+        "duration_s": round(duration, 2),
+        "overall": summarize(all_latencies, sum(recorder.errors.values()), duration),
+        "endpoints": endpoints,
+    }
+
+
+def compare(before_path: str, after_path: str, max_p99_regression: Optional[float]) -> int:
+    """Print per-endpoint latency deltas; non-zero exit if p99 regressed too far"""
+    before = load_results(before_path)["results"]["endpoints"]
+    after = load_results(after_path)["results"]["endpoints"]
+    failed = False
+    print(f"{'endpoint':22} {'p50':>18} {'p95':>18} {'p99':>18} {'rps':>16}")
+    for name in sorted(set(before) | set(after)):
+        old, new = before.get(name, {}), after.get(name, {})
+        cells = []
+        for key in ("p50_ms", "p95_ms", "p99_ms", "throughput_rps"):
+            a, b = old.get(key), new.get(key)
+            if a and b:
+                cells.append(f"{a:>7}->{b:<7} {(b - a) / a * 100:+5.0f}%")
+            else:
+                cells.append(f"{a}->{b}")
+        print(f"{name:22} " + " ".join(f"{c:>18}" for c in cells))
+        a, b = old.get("p99_ms"), new.get("p99_ms")
+        if max_p99_regression is not None and a and b and (b - a) / a * 100 > max_p99_regression:
+            failed = True
+    return 1 if failed else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load-test the CurlLabs API")
+    parser.add_argument("--base-url", help="Target an already running API instead of booting one")
+    parser.add_argument("--database-url", help="DATABASE_URL for the booted API (defaults to settings)")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for the booted API")
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds of traffic")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Unmeasured seconds before measuring")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent virtual clients")
+    parser.add_argument("--users", type=int, default=8, help="Benchmark users to register")
+    parser.add_argument("--seed-logs", type=int, default=40, help="Logs created per user before the run")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the traffic mix")
+    parser.add_argument("--output", default="benchmark_results/endpoints.json", help="Result JSON path")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="Compare two result files")
+    parser.add_argument("--max-p99-regression", type=float, help="Fail --compare if any p99 grew by more than this %%")
+    args = parser.parse_args()
+
+    if args.compare:
+        return compare(args.compare[0], args.compare[1], args.max_p99_regression)
+
+    if args.base_url:
+        results = asyncio.run(run_load(args.base_url, args))
+    else:
+        with running_api(args.database_url, workers=args.workers) as base_url:
+            results = asyncio.run(run_load(base_url, args))
+
+    config = {
+        key: getattr(args, key)
+        for key in ("base_url", "workers", "duration", "warmup", "concurrency", "users", "seed_logs", "seed")
+    }
+    config["traffic_mix"] = TRAFFIC_MIX
+    write_results(args.output, "endpoints", config, results)
+
+    print(f"{'endpoint':22} {'reqs':>7} {'err':>5} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for name, stats in list(results["endpoints"].items()) + [("overall", results["overall"])]:
+        print(
+            f"{name:22} {stats['requests']:>7} {stats['errors']:>5} {stats['throughput_rps'] or 0:>8} "
+            f"{stats['p50_ms'] or '-':>8} {stats['p95_ms'] or '-':>8} {stats['p99_ms'] or '-':>8}"
+        )
+    print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
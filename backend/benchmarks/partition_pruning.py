@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Partition pruning check for the date-filtered read endpoints.
+
+Calls each endpoint in-process against the configured database, captures
+the SQL it runs, and EXPLAINs every statement that reads routine_logs or
+weather_data to count the monthly partitions its plan scans. Endpoints
+filtered to a date range must only scan the months in that range (plus the
+default partition); stats endpoints over all history are reported only.
+
+Usage (from backend/):
+    python -m benchmarks.partition_pruning --email you@example.com
+"""
+
+import argparse
+import os
+import re
+import sys
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from benchmarks.common import write_results
+
+PARTITION = re.compile(r"^(routine_logs|weather_data)_(p\d{4}_\d{2}|default)$")
+
+
+def months_between(start: date, end: date) -> int:
+    return (end.year - start.year) * 12 + end.month - start.month + 1
+
+
+def checks(today: date, months_ahead: int) -> List[Tuple[str, Optional[int]]]:
+    """(path, most partitions any statement may scan, or None to only report)"""
+    year_start = date(today.year, 1, 1)
+    trends_start = today - timedelta(days=30)
+    factors_start = today - timedelta(days=90)
+    # One partition per month in range plus the default partition; ranges with no
+    # end also read the (empty) months created ahead of today
+    return [
+        ("/dashboard/stats", None),
+        ("/dashboard/trends?days=30", months_between(trends_start, today) + months_ahead + 1),
+        (f"/dashboard/calendar?year={today.year}", 12 + 1),
+        (f"/dashboard/factors?start_date={factors_start}", months_between(factors_start, today) + months_ahead + 1),
+        (f"/routine-logs?start_date={factors_start}&end_date={today}", months_between(factors_start, today) + 1),
+        (f"/weather?start_date={factors_start}&end_date={today}", months_between(factors_start, today) + 1),
+        (f"/weather?start_date={year_start}", None),
+    ]
+
+
+def scanned_partitions(plan: dict) -> List[str]:
+    found = []
+    if PARTITION.match(plan.get("Relation Name", "")):
+        found.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        found.extend(scanned_partitions(child))
+    return found
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check partition pruning on date-filtered endpoints")
+    parser.add_argument("--email", required=True, help="Existing user whose data the endpoints read")
+    parser.add_argument("--database-url", help="Database to check (defaults to settings)")
+    parser.add_argument("--output", help="Write the per-endpoint results to this JSON file")
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+
+    # Imported after the environment is set, so settings pick it up
+    from fastapi.testclient import TestClient
+
+    import main as api
+    from app.core.config import settings
+    from app.core.database import SessionLocal
+    from app.core.security import create_access_token
+    from app.models.user import User
+
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == args.email).first()
+    finally:
+        db.close()
+    if user is None:
+        print(f"❌ User '{args.email}' not found")
+        return 1
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': user.id})}"}
+
+    captured: List[Tuple[str, object]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        reads = statement.lstrip().upper().startswith("SELECT")
+        if reads and not executemany and re.search(r"\b(routine_logs|weather_data)\b", statement):
+            captured.append((statement, parameters))
+
+    event.listen(Engine, "before_cursor_execute", capture)
+    client = TestClient(api.app)
+    results: Dict[str, dict] = {}
+    failed = False
+    for path, limit in checks(date.today(), settings.PARTITION_MONTHS_AHEAD):
+        captured.clear()
+        response = client.get(f"/api/v1{path}", headers=headers)
+        response.raise_for_status()
+        statements = list(captured)
+        scans = []
+        db = SessionLocal()
+        try:
+            cursor = db.connection().connection.cursor()
+            for statement, parameters in statements:
+                cursor.execute(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+                scans.append(sorted(set(scanned_partitions(cursor.fetchone()[0][0]["Plan"]))))
+        finally:
+            db.close()
+        most = max((len(scan) for scan in scans), default=0)
+        ok = limit is None or most <= limit
+        failed = failed or not ok
+        results[path] = {"statements": len(statements), "max_partitions": most, "limit": limit, "partitions": scans}
+        status = "report" if limit is None else ("ok" if ok else "FAIL")
+        print(f"{status:6} {path:60} {most:4} partitions scanned" + (f" (limit {limit})" if limit else ""))
+    event.remove(Engine, "before_cursor_execute", capture)
+
+    if args.output:
+        write_results(args.output, "partition_pruning", {"email": args.email}, results)
+    print("❌ Some date-filtered queries scan partitions outside their range" if failed else "✅ Partition pruning OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
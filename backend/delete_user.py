@@ -2,32 +2,52 @@
 """Script to delete a user from the database"""
 
 import sys
+from datetime import datetime, timezone
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.token_revocation import revoke_user_tokens
 from app.models.user import User
+from app.services.account_deletion import delete_account
 
 # Create database connection
 engine = create_engine(settings.DATABASE_URL)
 SessionLocal = sessionmaker(bind=engine)
 
 def delete_user(email: str):
-    """Delete a user by email"""
+    """Delete a user by email, in chunks, without loading their data"""
     db = SessionLocal()
     try:
         user = db.query(User).filter(User.email == email).first()
-        if user:
-            db.delete(user)
-            db.commit()
-            print(f"✅ User '{email}' deleted successfully")
-        else:
+        if not user:
             print(f"❌ User '{email}' not found")
+            return
+        user_id = user.id
+        # Marked first, so an interrupted run is finished by the account-deletion job
+        now = datetime.now(timezone.utc)
+        user.deletion_requested_at = now
+        user.tokens_valid_after = now
+        db.commit()
+        # Outstanding access tokens would otherwise stay valid until they expire
+        revoke_user_tokens(user_id, now)
     except Exception as e:
         db.rollback()
         print(f"❌ Error deleting user: {e}")
+        return
     finally:
         db.close()
 
+    try:
+        deleted = delete_account(user_id)
+    except Exception as e:
+        print(f"❌ Error deleting user: {e}")
+        return
+    if deleted is None:
+        print(f"✅ User '{email}' is already being deleted by a running API worker")
+        return
+    rows = ", ".join(f"{count} {table}" for table, count in deleted.items() if table != "users")
+    print(f"✅ User '{email}' deleted successfully ({rows})")
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print("Usage: python delete_user.py <email>")
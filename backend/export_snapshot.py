@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""Script to export the analytics snapshot used for offline model training.
+
+Streams routine logs (with outcomes, hair profiles and weather) and products
+into Parquet files under DIRECTORY. After the first run, each run exports only
+what changed since the previous one; see app/services/snapshots.py.
+
+    python export_snapshot.py snapshots/          # incremental once a full run exists
+    python export_snapshot.py snapshots/ --full   # start again from a full export
+    python export_snapshot.py snapshots/ --list
+"""
+
+import argparse
+from pathlib import Path
+
+from app.services.snapshots import load_manifest, run_snapshot
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export an analytics snapshot as Parquet")
+    parser.add_argument("directory", type=Path, help="Snapshot directory (created if missing)")
+    parser.add_argument("--full", action="store_true", help="Export everything, not just changes since the last run")
+    parser.add_argument("--chunk-rows", type=int, help="Rows per fetch and per file (default SNAPSHOT_CHUNK_ROWS)")
+    parser.add_argument("--list", action="store_true", help="List the runs in the directory")
+    args = parser.parse_args()
+
+    if args.list:
+        for run in load_manifest(args.directory)["runs"]:
+            print(f"{run['id']:32} since={run['since'] or '-':34} {run['rows']}")
+        return
+
+    run = run_snapshot(args.directory, full=args.full, chunk_size=args.chunk_rows)
+    counts = ", ".join(f"{count} {name}" for name, count in run["rows"].items())
+    print(f"✅ {run['mode'].capitalize()} snapshot {run['id']}: {counts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""Script to generate a synthetic, production-sized dataset for scale testing.
+
+Creates users with hair profiles, a community product catalog plus personal
+products, routines, years of routine logs with products_used, matching
+outcomes, and weather for each city and logged day (stored once per location
+and shared by its users, as the app does). Output is fully determined by
+--seed and --end-date (the last logged day, fixed by default rather than
+today), and rows are streamed into Postgres with COPY in chunks.
+
+The schema must already exist (run `alembic upgrade head` first).
+
+Usage:
+    python generate_dataset.py --users 1000 --years 3 --seed 42
+"""
+
+import argparse
+import csv
+import io
+import json
+import math
+import random
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Tuple
+
+from sqlalchemy import create_engine
+
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.services.partitions import PARTITIONED, create_partitions
+from app.services.scoring import calculate_overall_score
+from app.services.weather import location_key
+
+DEFAULT_PASSWORD = "synthetic-password"
+# Last day of generated history unless --end-date is given; fixed so a seed means the same data every day
+DEFAULT_END_DATE = date(2026, 1, 1)
+
+CURL_PATTERNS = ["2A", "2B", "2C", "3A", "3B", "3C", "4A", "4B", "4C"]
+CURL_WEIGHTS = [3, 5, 8, 10, 12, 10, 9, 7, 6]
+LEVELS = ["low", "medium", "high"]
+THICKNESS = ["fine", "medium", "coarse"]
+SCALP_TYPES = ["dry", "oily", "sensitive", "normal"]
+STYLING_METHODS = ["wash-and-go", "twist-out", "braid-out", "roller-set", "finger-coils"]
+DRYING_METHODS = ["air-dry", "diffuser", "hooded-dryer", "plopping"]
+STEP_TYPES = ["cleanse", "condition", "leave-in", "style", "seal"]
+PRODUCT_TYPES = {
+    "cleanse": "shampoo",
+    "condition": "conditioner",
+    "leave-in": "leave-in",
+    "style": "gel",
+    "seal": "oil",
+}
+BRANDS = [
+    "Curl Theory", "Coil Co", "Shea Moisture", "Briogeo", "Ouidad", "Camille Rose",
+    "Kinky-Curly", "Jessicurl", "Bounce Curl", "Innersense", "Pattern", "Mielle",
+]
+INGREDIENTS = [
+    "water", "glycerin", "aloe vera", "shea butter", "coconut oil", "argan oil",
+    "jojoba oil", "panthenol", "hydrolyzed protein", "flaxseed extract",
+    "cetearyl alcohol", "behentrimonium methosulfate", "polyquaternium-11",
+    "guar gum", "honey", "marshmallow root", "silicone", "fragrance", "citric acid",
+]
+
+# name, latitude, longitude, mean temperature (C), seasonal swing (C), mean humidity (%), southern hemisphere
+City = Tuple[str, float, float, float, float, float, bool]
+CITIES: List[City] = [
+    ("Houston, TX, US", 29.76, -95.37, 21.0, 8.0, 75.0, False),
+    ("Phoenix, AZ, US", 33.45, -112.07, 24.0, 10.0, 30.0, False),
+    ("Seattle, WA, US", 47.61, -122.33, 11.5, 7.0, 72.0, False),
+    ("New York, NY, US", 40.71, -74.01, 13.0, 12.0, 63.0, False),
+    ("Miami, FL, US", 25.76, -80.19, 25.5, 3.5, 78.0, False),
+    ("Denver, CO, US", 39.74, -104.99, 10.5, 11.0, 45.0, False),
+    ("London, UK", 51.51, -0.13, 11.0, 6.5, 77.0, False),
+    ("Lagos, NG", 6.52, 3.38, 27.0, 1.5, 82.0, False),
+    ("Sydney, AU", -33.87, 151.21, 18.5, 5.0, 65.0, True),
+    ("Sao Paulo, BR", -23.55, -46.63, 20.0, 3.5, 75.0, True),
+]
+
+# Tables in foreign-key order, with the columns loaded by COPY
+COLUMNS: Dict[str, List[str]] = {
+    "locations": ["id", "key", "name", "latitude", "longitude"],
+    "users": [
+        "id", "email", "password_hash", "created_at", "curl_pattern", "porosity",
+        "density", "thickness", "scalp_type", "location", "location_id",
+    ],
+    "products": [
+        "id", "user_id", "brand", "name", "type", "ingredients", "notes",
+        "usage_count", "success_rate", "is_starred", "created_at",
+    ],
+    "routines": [
+        "id", "user_id", "name", "is_template", "is_public", "steps",
+        "method_tags", "drying_method", "created_at",
+    ],
+    "routine_logs": [
+        "id", "user_id", "routine_id", "date", "time", "products_used", "wash_day",
+        "styling_method", "drying_method", "time_spent", "notes", "photo_urls", "created_at",
+    ],
+    "outcomes": [
+        "id", "routine_log_id", "routine_log_date", "frizz", "definition", "softness", "hold_hours",
+        "overall_score", "score_version", "notes", "rated_at",
+    ],
+    "weather_data": [
+        "id", "location_id", "date", "humidity", "dew_point",
+        "temperature", "wind_speed", "found", "created_at",
+    ],
+}
+
+
+def pg_array(values: List[str]) -> str:
+    """Render a text[] literal for COPY"""
+    return "{" + ",".join('"' + v.replace('"', '\\"') + '"' for v in values) + "}"
+
+
+def clamp(value: float, low: int = 1, high: int = 5) -> int:
+    return max(low, min(high, int(round(value))))
+
+
+class DatasetGenerator:
+    """Builds rows table by table and streams them into Postgres with COPY"""
+
+    def __init__(self, connection, seed: int, start_date: date, end_date: date, chunk_rows: int):
+        self.connection = connection
+        self.seed = seed
+        self.start_date = start_date
+        self.end_date = end_date
+        self.chunk_rows = chunk_rows
+        self.password_hash = get_password_hash(DEFAULT_PASSWORD)
+        self.buffers: Dict[str, list] = {table: [] for table in COLUMNS}
+        self.loaded: Dict[str, int] = {table: 0 for table in COLUMNS}
+        self.next_id = self._next_ids()
+        self.weather_cache: Dict[Tuple[str, date], Tuple[float, float, float, float]] = {}
+        self.location_ids: Dict[str, int] = {}
+        self.stored_weather = self._stored_weather()
+
+    def _next_ids(self) -> Dict[str, int]:
+        with self.connection.cursor() as cur:
+            ids = {}
+            for table in COLUMNS:
+                cur.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}")
+                ids[table] = cur.fetchone()[0] + 1
+            return ids
+
+    def _stored_weather(self) -> set:
+        """(location_id, date) pairs already loaded, so reruns don't violate the unique key"""
+        with self.connection.cursor() as cur:
+            cur.execute("SELECT key, id FROM locations WHERE key = ANY(%s)", (
+                [location_key(city[1], city[2]) for city in CITIES],
+            ))
+            self.location_ids.update(cur.fetchall())
+            cur.execute("SELECT location_id, date FROM weather_data WHERE location_id = ANY(%s)", (
+                list(self.location_ids.values()),
+            ))
+            return set(cur.fetchall())
+
+    def location_id(self, city: City) -> int:
+        key = location_key(city[1], city[2])
+        if key not in self.location_ids:
+            self.location_ids[key] = self._add("locations", [key, city[0], city[1], city[2]])
+        return self.location_ids[key]
+
+    def _add(self, table: str, row: list) -> int:
+        row_id = self.next_id[table]
+        self.next_id[table] += 1
+        self.buffers[table].append([row_id] + row)
+        return row_id
+
+    def flush(self, force: bool = False) -> None:
+        """COPY every buffered table in FK order once any buffer is full"""
+        if not force and max(len(rows) for rows in self.buffers.values()) < self.chunk_rows:
+            return
+        with self.connection.cursor() as cur:
+            for table, columns in COLUMNS.items():
+                rows = self.buffers[table]
+                if not rows:
+                    continue
+                buf = io.StringIO()
+                csv.writer(buf).writerows(rows)
+                buf.seek(0)
+                cur.copy_expert(
+                    f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buf
+                )
+                self.loaded[table] += len(rows)
+                self.buffers[table] = []
+        self.connection.commit()
+
+    def reset_sequences(self) -> None:
+        with self.connection.cursor() as cur:
+            for table in COLUMNS:
+                cur.execute(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                    f"GREATEST((SELECT MAX(id) FROM {table}), 1))"
+                )
+        self.connection.commit()
+
+    def weather_for(self, city: City, day: date) -> Tuple[float, float, float, float]:
+        """Deterministic seasonal weather for a city and day, stored once and shared by its users"""
+        key = (city[0], day)
+        if key not in self.weather_cache:
+            name, _, _, mean_temp, swing, mean_humidity, southern = city
+            # Independent of --seed, so datasets loaded side by side agree on the weather
+            rng = random.Random(f"weather:{name}:{day.toordinal()}")
+            phase = 2 * math.pi * (day.timetuple().tm_yday - 200) / 365.0
+            season = math.cos(phase) * (-1 if southern else 1)
+            temperature = mean_temp + swing * season + rng.gauss(0, 2.5)
+            humidity = min(100.0, max(5.0, mean_humidity + 8 * season + rng.gauss(0, 9)))
+            dew_point = temperature - (100 - humidity) / 5
+            wind_speed = abs(rng.gauss(3.5, 2.0))
+            self.weather_cache[key] = (
+                round(humidity, 1), round(dew_point, 1), round(temperature, 1), round(wind_speed, 1)
+            )
+            location_id = self.location_id(city)
+            if (location_id, day) not in self.stored_weather:
+                self.stored_weather.add((location_id, day))
+                self._add("weather_data", [
+                    location_id, day.isoformat(), *self.weather_cache[key], True,
+                    datetime(day.year, day.month, day.day, 12, tzinfo=timezone.utc).isoformat(),
+                ])
+        return self.weather_cache[key]
+
+    def generate_catalog(self, count: int) -> Dict[str, List[int]]:
+        """Community products (user_id NULL), grouped by step type"""
+        rng = random.Random(f"{self.seed}:catalog")
+        catalog: Dict[str, List[int]] = {step: [] for step in STEP_TYPES}
+        for i in range(count):
+            step = STEP_TYPES[i % len(STEP_TYPES)]
+            product_id = self._add("products", [
+                None, rng.choice(BRANDS), f"{PRODUCT_TYPES[step].title()} No. {i + 1}",
+                PRODUCT_TYPES[step], pg_array(rng.sample(INGREDIENTS, rng.randint(4, 10))),
+                None, 0, 0.0, False, self._timestamp(self.start_date, rng),
+            ])
+            catalog[step].append(product_id)
+        return catalog
+
+    def generate_user(self, index: int, catalog: Dict[str, List[int]]) -> None:
+        rng = random.Random(f"{self.seed}:user:{index}")
+        city = rng.choice(CITIES)
+        joined = self.start_date + timedelta(days=rng.randint(0, 60))
+        porosity = rng.choice(LEVELS)
+        user_id = self._add("users", [
+            f"synthetic-{self.seed}-{index}@example.com", self.password_hash,
+            self._timestamp(joined, rng), rng.choices(CURL_PATTERNS, CURL_WEIGHTS)[0],
+            porosity, rng.choice(LEVELS), rng.choice(THICKNESS), rng.choice(SCALP_TYPES), city[0],
+            self.location_id(city),
+        ])
+
+        # Personal products per step, and a per-product quality the outcomes depend on
+        owned: Dict[str, List[int]] = {}
+        quality: Dict[int, float] = {}
+        for step in STEP_TYPES:
+            owned[step] = []
+            for _ in range(rng.randint(1, 3)):
+                product_id = self._add("products", [
+                    user_id, rng.choice(BRANDS), f"My {PRODUCT_TYPES[step]} {rng.randint(1, 99)}",
+                    PRODUCT_TYPES[step], pg_array(rng.sample(INGREDIENTS, rng.randint(4, 10))),
+                    None, 0, 0.0, rng.random() < 0.2, self._timestamp(joined, rng),
+                ])
+                owned[step].append(product_id)
+            if catalog[step]:
+                owned[step].append(rng.choice(catalog[step]))
+            for product_id in owned[step]:
+                quality[product_id] = rng.gauss(0, 0.4)
+
+        routines = []
+        for r in range(rng.randint(1, 4)):
+            styling = rng.choice(STYLING_METHODS)
+            drying = rng.choice(DRYING_METHODS)
+            steps = [
+                {"step_type": step, "product_id": rng.choice(owned[step]), "order": order + 1, "notes": ""}
+                for order, step in enumerate(STEP_TYPES)
+                if step in ("cleanse", "condition", "style") or rng.random() < 0.5
+            ]
+            routine_id = self._add("routines", [
+                user_id, f"{styling.replace('-', ' ').title()} #{r + 1}", True, rng.random() < 0.15,
+                json.dumps(steps), json.dumps([styling]), drying, self._timestamp(joined, rng),
+            ])
+            routines.append((routine_id, styling, drying, steps))
+
+        frizz_sensitivity = {"low": 0.6, "medium": 1.0, "high": 1.5}[porosity]
+        wash_interval = rng.randint(2, 7)
+        day = joined + timedelta(days=rng.randint(0, wash_interval))
+        while day <= self.end_date:
+            routine_id, styling, drying, steps = rng.choice(routines)
+            if rng.random() < 0.2:
+                routine_id, styling, drying = None, rng.choice(STYLING_METHODS), rng.choice(DRYING_METHODS)
+            products_used: Dict[str, List[int]] = {}
+            for step in steps:
+                products_used.setdefault(step["step_type"], []).append(
+                    step["product_id"] if rng.random() < 0.8 else rng.choice(owned[step["step_type"]])
+                )
+            wash_day = rng.random() < 0.85
+            log_created = self._timestamp(day, rng)
+            log_id = self._add("routine_logs", [
+                user_id, routine_id, day.isoformat(), f"{rng.randint(6, 22):02d}:{rng.choice([0, 15, 30, 45]):02d}:00",
+                json.dumps(products_used), wash_day, styling, drying, rng.randint(10, 120),
+                None, None, log_created,
+            ])
+
+            humidity = self.weather_for(city, day)[0]
+
+            if rng.random() < 0.85:
+                product_effect = sum(quality[p] for ids in products_used.values() for p in ids)
+                frizz = clamp(2.2 + frizz_sensitivity * (humidity - 55) / 20 - 0.5 * product_effect + rng.gauss(0, 0.7))
+                definition = clamp(3.0 + (0.4 if drying == "diffuser" else 0) + product_effect + rng.gauss(0, 0.8))
+                softness = clamp(3.2 + 0.5 * product_effect + rng.gauss(0, 0.8))
+                hold_hours = round(max(2.0, rng.gauss(36 - humidity / 5, 12)), 1) if rng.random() < 0.7 else None
+                self._add("outcomes", [
+                    log_id, day.isoformat(), frizz, definition, softness, hold_hours,
+                    calculate_overall_score(frizz, definition, softness, hold_hours), settings.SCORING_VERSION,
+                    None, self._timestamp(day + timedelta(days=1), rng),
+                ])
+
+            day += timedelta(days=max(1, int(rng.gauss(wash_interval, 1))))
+            self.flush()
+
+    @staticmethod
+    def _timestamp(day: date, rng: random.Random) -> str:
+        return datetime(
+            day.year, day.month, day.day, rng.randint(0, 23), rng.randint(0, 59), tzinfo=timezone.utc
+        ).isoformat()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic CurlLabs dataset")
+    parser.add_argument("--users", type=int, default=100, help="Number of users to create")
+    parser.add_argument("--years", type=float, default=2.0, help="Years of history per user")
+    parser.add_argument("--community-products", type=int, default=500, help="Community catalog size")
+    parser.add_argument("--seed", type=int, default=42, help="Seed; the same seed yields the same data")
+    parser.add_argument(
+        "--end-date", type=date.fromisoformat, default=DEFAULT_END_DATE,
+        help=f"Last day of history, YYYY-MM-DD (default {DEFAULT_END_DATE})"
+    )
+    parser.add_argument("--chunk-rows", type=int, default=50000, help="Rows buffered per COPY batch")
+    parser.add_argument("--database-url", default=settings.DATABASE_URL, help="Target database")
+    args = parser.parse_args()
+
+    start_date = args.end_date - timedelta(days=int(args.years * 365))
+    engine = create_engine(args.database_url)
+    # Months outside what the migration created would otherwise all land in the default partitions
+    with engine.begin() as partition_connection:
+        for table in PARTITIONED:
+            create_partitions(partition_connection, table, start_date, args.end_date)
+    connection = engine.raw_connection()
+    started = time.perf_counter()
+    try:
+        generator = DatasetGenerator(connection, args.seed, start_date, args.end_date, args.chunk_rows)
+        catalog = generator.generate_catalog(args.community_products)
+        for index in range(args.users):
+            generator.generate_user(index, catalog)
+            if (index + 1) % 100 == 0:
+                print(f"  {index + 1}/{args.users} users generated")
+        generator.flush(force=True)
+        generator.reset_sequences()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+        engine.dispose()
+
+    elapsed = time.perf_counter() - started
+    total = sum(generator.loaded.values())
+    print(f"Loaded {total} rows in {elapsed:.1f}s ({total / elapsed:.0f} rows/s)")
+    for table, count in generator.loaded.items():
+        print(f"  {table:15} {count}")
+    print(f"All synthetic users share the password '{DEFAULT_PASSWORD}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,16 +3,45 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from app.core.config import settings
-from app.core.database import engine, Base
+from app.core.database import engine
+from app.core.migrations import check_schema_version
+from app.core.rate_limit import RateLimitMiddleware
+from app.services.account_deletion import account_deletion_job
+from app.services.cohorts import cohort_refresh_job
+from app.services.insights import insight_jobs
+from app.services.outcome_model import load_current_model
+from app.services.partitions import partition_maintenance_job
+from app.services.product_catalog import catalog_refresh_job
+from app.services.routine_feed import ranking_refresh_job
+from app.services.routine_similarity import similarity_refresh_job
+from app.services.sync import tombstone_purge_job
 from app.api.v1 import api_router
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup
-    Base.metadata.create_all(bind=engine)
+    # Startup: schema changes are applied by `alembic upgrade head`, not by workers
+    if settings.SCHEMA_VERSION_CHECK:
+        check_schema_version(engine)
+    load_current_model()
+    insight_jobs.start()
+    cohort_refresh_job.start()
+    catalog_refresh_job.start()
+    ranking_refresh_job.start()
+    similarity_refresh_job.start()
+    tombstone_purge_job.start()
+    account_deletion_job.start()
+    partition_maintenance_job.start()
     yield
-    # Shutdown
+    # Shutdown: flush pending insight refreshes
+    partition_maintenance_job.stop()
+    account_deletion_job.stop()
+    tombstone_purge_job.stop()
+    similarity_refresh_job.stop()
+    ranking_refresh_job.stop()
+    catalog_refresh_job.stop()
+    cohort_refresh_job.stop()
+    insight_jobs.stop()
 
 
 app = FastAPI(
@@ -22,6 +51,9 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Rate limiting and admission control (added first so CORS wraps its 429/503s)
+app.add_middleware(RateLimitMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
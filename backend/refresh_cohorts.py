@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+"""Script to refresh the cohort analytics materialized views now.
+
+Workers already refresh them every COHORT_REFRESH_MINUTES; use this from
+cron when that is set to 0, or after a bulk data load.
+"""
+
+from app.services.cohorts import refresh_cohort_views
+
+if __name__ == "__main__":
+    if refresh_cohort_views(force=True):
+        print("✅ Cohort views refreshed")
+    else:
+        print("⏳ Another process is refreshing the cohort views")
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""Script to recompute stored outcome scores after SCORING_VERSION changes.
+
+Updates every outcome whose score_version differs from the target version in
+short, id-ranged transactions, then refreshes the cohort views and routine
+rankings built from overall_score. Safe to interrupt and re-run.
+
+    python rescore_outcomes.py                 # rescore to SCORING_VERSION
+    python rescore_outcomes.py --version 2 --chunk-size 5000
+"""
+
+import argparse
+import logging
+
+from app.core.config import settings
+from app.services.cohorts import refresh_cohort_views
+from app.services.routine_feed import refresh_routine_rankings
+from app.services.scoring import SCORING_VERSIONS, rescore_outcomes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute outcomes.overall_score with a scoring version")
+    parser.add_argument("--version", type=int, default=settings.SCORING_VERSION,
+                        help=f"Scoring version to apply (default: SCORING_VERSION={settings.SCORING_VERSION})")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="Outcome ids per transaction")
+    args = parser.parse_args()
+
+    if args.version not in SCORING_VERSIONS:
+        parser.error(f"unknown scoring version {args.version}; known: {sorted(SCORING_VERSIONS)}")
+    if args.version != settings.SCORING_VERSION:
+        print(f"⚠️  Workers score new outcomes with version {settings.SCORING_VERSION}, not {args.version}")
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    updated = rescore_outcomes(args.version, args.chunk_size)
+    print(f"✅ Rescored {updated} outcomes with scoring version {args.version}")
+
+    if updated:
+        refresh_cohort_views(force=True)
+        refresh_routine_rankings(force=True)
+        print("✅ Cohort views and routine rankings refreshed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Script to train a new version of the outcome prediction model.
+
+Run it offline (e.g. weekly from cron); workers load the current version when
+they start, so restart them to serve a newly activated model.
+
+    python train_outcome_model.py                # train and make it current
+    python train_outcome_model.py --no-activate  # train, keep serving the old one
+    python train_outcome_model.py --snapshot snapshots/  # train on an export_snapshot.py directory
+    python train_outcome_model.py --activate 3   # roll back or forward to version 3
+    python train_outcome_model.py --list
+"""
+
+import argparse
+from pathlib import Path
+
+from app.core.database import SessionLocal
+from app.models.model_artifact import ModelArtifact
+from app.services.outcome_model import MODEL_NAME, activate_version, train_model
+from app.services.snapshots import read_snapshot
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train or activate outcome prediction models")
+    parser.add_argument("--no-activate", action="store_true", help="Store the new version without making it current")
+    parser.add_argument("--activate", type=int, metavar="VERSION", help="Make an existing version current")
+    parser.add_argument("--snapshot", type=Path, metavar="DIR", help="Train on an analytics snapshot instead of the database")
+    parser.add_argument("--list", action="store_true", help="List stored versions")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.list:
+            for row in db.query(ModelArtifact).filter(ModelArtifact.name == MODEL_NAME).order_by(ModelArtifact.version):
+                marker = "*" if row.is_current else " "
+                print(f"{marker} v{row.version}  {row.created_at:%Y-%m-%d %H:%M}  rows={row.training_rows}  {row.metrics}")
+        elif args.activate is not None:
+            activate_version(db, args.activate)
+            db.commit()
+            print(f"✅ {MODEL_NAME} v{args.activate} is now current; restart workers to load it")
+        else:
+            frame = None
+            if args.snapshot:
+                frame = read_snapshot(args.snapshot)
+                frame = frame[frame["outcome_id"].notna()] if not frame.empty else frame
+            artifact = train_model(db, activate=not args.no_activate, frame=frame)
+            print(f"✅ Trained {MODEL_NAME} v{artifact.version} on {artifact.training_rows} outcomes: {artifact.metrics}")
+    except ValueError as e:
+        print(f"❌ {e}")
+        raise SystemExit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()